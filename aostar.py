@@ -0,0 +1,184 @@
+"""AO* search over nested AND-OR curricula (andor/2 with cost/2 leaf costs).
+
+A node listed in andor/2 has OR-alternatives, each an AND-set of children;
+any other node is a leaf whose cost comes from cost/2 (default 1). Children
+may themselves be AND-OR nodes, to any depth, and subgoals may be shared.
+The cost of an AND-set is the sum of its children's costs.
+
+The search keeps a marked best partial solution graph, expands one unsolved
+tip of it at a time and revises costs bottom-up, labelling nodes solved once
+their marked AND-set is solved. Solved costs are memoised on the engine, so
+later runs on the same graph reuse them.
+"""
+import time
+
+from kb_loader import read_facts
+
+DEFAULT_LEAF_COST = 1
+
+
+class AndOrGraph:
+    def __init__(self, andor=(), costs=()):
+        self.alternatives = {}
+        for node, alts in andor:
+            if not alts:
+                # No alternative could ever be marked, so AO* would have nothing to follow
+                raise ValueError(f"andor({node}, []) has no alternatives")
+            self.alternatives[str(node)] = [tuple(str(c) for c in alt) for alt in alts]
+        self.costs = {str(n): c for n, c in costs}
+        self.parents = {}
+        for node, alts in self.alternatives.items():
+            for alt in alts:
+                for c in alt:
+                    self.parents.setdefault(c, set()).add(node)
+        self._check_acyclic()
+
+    @classmethod
+    def from_file(cls, path: str) -> "AndOrGraph":
+        with open(path, encoding="utf-8") as fh:
+            facts = read_facts(fh.read(), {"andor": 2, "cost": 2})
+        return cls(facts["andor"], facts["cost"])
+
+    def is_leaf(self, node: str) -> bool:
+        return node not in self.alternatives
+
+    def leaf_cost(self, node: str):
+        return self.costs.get(node, DEFAULT_LEAF_COST)
+
+    def leaf_bound(self, node: str):
+        """Admissible estimate: cheapest alternative counting only its direct leaves."""
+        return min(sum(self.leaf_cost(c) for c in alt if self.is_leaf(c))
+                   for alt in self.alternatives[node])
+
+    def _check_acyclic(self):
+        state = {}
+        for root in self.alternatives:
+            if root in state:
+                continue
+            stack = [(root, iter([c for alt in self.alternatives[root] for c in alt]))]
+            state[root] = 1
+            while stack:
+                node, it = stack[-1]
+                for c in it:
+                    if self.is_leaf(c):
+                        continue
+                    if state.get(c) == 1:
+                        raise ValueError(f"AND-OR cycle through {c}")
+                    if c not in state:
+                        state[c] = 1
+                        stack.append((c, iter([x for alt in self.alternatives[c] for x in alt])))
+                        break
+                else:
+                    state[node] = 2
+                    stack.pop()
+
+
+class AOStarResult:
+    __slots__ = ("root", "cost", "solved", "solution", "strategy",
+                 "expanded", "generated", "revisions", "memo_hits", "cutoff", "elapsed_ms")
+
+    def __init__(self, root):
+        self.root = root
+        self.cost = None
+        self.solved = False
+        self.solution = {}      # internal node -> chosen AND-set
+        self.strategy = []      # leaves of the solution graph, first-visit order
+        self.expanded = self.generated = self.revisions = self.memo_hits = 0
+        self.cutoff = False
+        self.elapsed_ms = 0.0
+
+
+class AOStar:
+    """AO* engine for one AndOrGraph; keeps solved costs between runs."""
+
+    def __init__(self, graph: AndOrGraph, heuristic=None):
+        self.graph = graph
+        self.h = heuristic or graph.leaf_bound
+        self.memo = {}          # solved internal node -> (cost, chosen AND-set)
+
+    def solve(self, root: str, bound: float = None) -> AOStarResult:
+        """Cheapest solution graph for `root`; gives up once its cost must exceed `bound`."""
+        t0 = time.perf_counter()
+        g, res = self.graph, AOStarResult(root)
+        f, best, solved, expanded = {}, {}, set(), set()
+
+        def init(node):
+            hit = self.memo.get(node)
+            if hit is not None:
+                res.memo_hits += 1
+                f[node], best[node] = hit
+                solved.add(node)
+            elif g.is_leaf(node):
+                f[node], best[node] = g.leaf_cost(node), None
+                solved.add(node)
+            else:
+                f[node] = self.h(node)
+            res.generated += 1
+
+        def revise(start):
+            stack = [start]
+            while stack:
+                node = stack.pop()
+                res.revisions += 1
+                choice, cost = None, float("inf")
+                for alt in g.alternatives[node]:
+                    c = sum(f[x] for x in alt)
+                    if c < cost:
+                        choice, cost = alt, c
+                was = (f[node], best.get(node), node in solved)
+                f[node], best[node] = cost, choice
+                if choice is not None and all(x in solved for x in choice):
+                    solved.add(node)
+                    self.memo[node] = (cost, choice)
+                if (f[node], best[node], node in solved) != was:
+                    stack.extend(p for p in g.parents.get(node, ()) if p in expanded)
+
+        def unsolved_tip():
+            seen, stack = set(), [root]
+            while stack:
+                node = stack.pop()
+                if node in solved or node in seen:
+                    continue
+                seen.add(node)
+                if node not in expanded:
+                    return node
+                stack.extend(reversed(best[node]))
+            return None
+
+        init(root)
+        while root not in solved:
+            if bound is not None and f[root] > bound:
+                break
+            tip = unsolved_tip()
+            if tip is None:
+                break
+            expanded.add(tip)
+            res.expanded += 1
+            for alt in g.alternatives[tip]:
+                for child in alt:
+                    if child not in f:
+                        init(child)
+            revise(tip)
+
+        res.cost = f[root]
+        res.cutoff = bound is not None and f[root] > bound
+        res.solved = root in solved and not res.cutoff
+        if res.solved:
+            self._extract(root, best, res)
+        res.elapsed_ms = (time.perf_counter() - t0) * 1000
+        return res
+
+    def _extract(self, root, best, res):
+        seen, stack = set(), [root]
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            if self.graph.is_leaf(node):
+                res.strategy.append(node)
+                continue
+            # Subgoals reached through a memoised node were never put in `best`.
+            choice = best[node] if node in best else self.memo[node][1]
+            res.solution[node] = list(choice)
+            stack.extend(reversed(choice))
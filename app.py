@@ -1,60 +1,208 @@
-from flask import Flask, render_template, request, url_for, redirect, flash
-from pyswip import Prolog
+from flask import Flask, render_template, request, url_for, redirect, flash, g, abort, Response, stream_with_context, session
+import cProfile
+import json
+import logging
 import os
-import matplotlib
-matplotlib.use('Agg')  # headless-safe
-import matplotlib.pyplot as plt
-import numpy as np
+import threading
+import time
+import uuid
 from collections import defaultdict
 from flask import render_template_string
+from prolog_pool import PrologPool, PrologSession, PrologExecutor, Overloaded, RESET_USER_FACTS
+from prolog_query import PreparedQuery
+from concurrent.futures import TimeoutError as FutureTimeout
+from topic_graph import TopicGraph
+from kb_versions import KBRegistry, KBVersion
+from result_cache import ResultCache
+from charts import ChartService, chart_specs, warm_up as warm_up_charts
+from planner import plan_goal, PlanError, CycleError, TIE_BREAKS
+import search
+from prereq_matrix import MODES as UNLEARNABLE_MODES
+from progress_store import ProgressStore
+from budget import fit_budget
+from schedule import schedule
+import metrics
 
 app = Flask(__name__)
 app.secret_key = "dev-secret" 
-
-# Ensure static dir exists
-os.makedirs("static", exist_ok=True)
-
-def new_prolog():
-    p = Prolog()
-    p.consult("learningpath.pl")
-    return p
-
-def reset_and_assert(p: Prolog, goal: str, skills: list, time_hours: int, user_level: str = "beginner", learning_style: str = "practical"):
-    list(p.query("reset_user_facts."))
-    p.assertz(f"student_goal({goal})")
-    p.assertz(f"time_available({time_hours})")
-    p.assertz(f"user_level({user_level})")
-    p.assertz(f"learning_style({learning_style})")
-    for s in skills:
-        s = s.strip()
-        if s:
-            p.assertz(f"known({s})")
-
-def prolog_list(query_str, var):
-    """Run query that returns list values one-by-one, collect `var`."""
-    p = new_prolog()
-    res = [r[var] for r in p.query(query_str)]
-    return [str(v) for v in res]
-
-def get_topic_info(p: Prolog, topic_atom: str) -> dict:
-    """Get comprehensive topic information including duration, difficulty, category, and description."""
+log = logging.getLogger(__name__)
+
+# PROFILING=1 lets a request carrying "X-Profile: 1" dump a cProfile file into PROFILE_DIR
+PROFILING = os.environ.get("PROFILING") == "1"
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+
+# Limits for /exhaustive-paths so one request cannot enumerate forever
+MAX_PATH_DEPTH = 10
+PATHS_SHOWN = 50
+PATH_TIME_BUDGET = 0.5  # seconds
+# Alternatives /astar may list
+MAX_ROUTES = 10
+
+# One SWI-Prolog engine per process; requests get isolated sessions.
+pool = PrologPool(None, qcompile=os.environ.get("KB_QCOMPILE") == "1",
+                  observer=metrics.observe_kb_query)
+# ASYNC_MODE=1: /recommend hands its Prolog work to one dedicated thread and
+# returns before the charts are drawn (in a process pool by default);
+# /charts/<name> waits for the render.
+ASYNC_MODE = os.environ.get("ASYNC_MODE") == "1"
+REQUEST_TIMEOUT = float(os.environ.get("REQUEST_TIMEOUT", "10"))  # seconds
+prolog_executor = PrologExecutor(pool) if ASYNC_MODE else None
+
+def preload_kb(version: KBVersion):
+    """Consult a new KB version before it goes live, if the engine is already running."""
+    if pool.prolog is None:
+        return  # the first session consults it
+    if prolog_executor is not None:
+        prolog_executor.call(lambda s: None, timeout=60, module=version.module)
+    else:
+        version.load_prolog()
+
+# The knowledge base as immutable versions: topic graph, AND-OR graph and a
+# Prolog module per version, built by start(). Each request works on the
+# version current when it started; edits to learningpath.pl are picked up every
+# KB_RELOAD_INTERVAL seconds (0 disables). KB_SNAPSHOT points at a prebuilt
+# graph snapshot (see kb_snapshot.py) for large catalogues. KB_STORE_DIR keeps
+# the frozen copy of each version; by default a temporary directory that is
+# removed again when the process exits.
+kb = None
+KB_RELOAD_INTERVAL = float(os.environ.get("KB_RELOAD_INTERVAL", "2"))
+_start_lock = threading.Lock()
+# Learning progress survives restarts; one row per update plus a latest-status index
+progress_store = ProgressStore(os.environ.get("PROGRESS_DB", "progress.db"))
+# Whole-page /recommend results, keyed by normalised profile and KB version;
+# a new version drops the old entries
+result_cache = ResultCache()
+# Content-addressed chart images; CHART_FAST=1 renders 72 dpi, CHART_FORMAT=svg skips rasterising.
+# CHART_DIR is shared by all workers so a chart URL stays valid after eviction or a restart.
+chart_service = ChartService(
+    fmt=os.environ.get("CHART_FORMAT", "png"),
+    fast=os.environ.get("CHART_FAST") == "1",
+    processes=int(os.environ.get("CHART_PROCESSES", os.cpu_count() if ASYNC_MODE else 0)),
+    observer=metrics.observe_chart,
+    directory=os.environ.get("CHART_DIR", "chart-cache"),
+)
+
+def start() -> KBRegistry:
+    """Build the first KB version and start watching for edits (once per process).
+
+    Call before serving, e.g. from gunicorn's post_worker_init hook; the first
+    request calls it otherwise. Importing app builds nothing.
+    """
+    global kb
+    with _start_lock:
+        if kb is None:
+            registry = KBRegistry("learningpath.pl", pool, snapshot=os.environ.get("KB_SNAPSHOT"),
+                                  store_dir=os.environ.get("KB_STORE_DIR"), preload=preload_kb)
+            result_cache.sync_version(registry.current.version)
+            registry.listeners.append(lambda old, new: result_cache.sync_version(new.version))
+            if KB_RELOAD_INTERVAL > 0:
+                registry.watch(KB_RELOAD_INTERVAL)
+            kb = registry
+    return kb
+
+def get_prolog() -> PrologSession:
+    """Session on the shared engine, released when the request ends."""
+    if "prolog" not in g:
+        g.prolog_cm = pool.session(module=g.kb.module)
+        g.prolog = g.prolog_cm.__enter__()
+    return g.prolog
+
+@app.teardown_appcontext
+def release_prolog(exc):
+    cm = g.pop("prolog_cm", None)
+    g.pop("prolog", None)
+    if cm is not None:
+        cm.__exit__(None, None, None)
+    version = g.pop("kb", None)
+    if version is not None:
+        kb.release(version)
+
+@app.before_request
+def start_request():
+    g.request_start = time.perf_counter()
+    # Everything this request reads comes from one KB version, even if a new one goes live meanwhile
+    g.kb = (kb or start()).acquire()
+    if PROFILING and request.headers.get("X-Profile") == "1":
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+@app.after_request
+def record_request(resp):
+    if "kb" in g:
+        resp.headers["X-KB-Version"] = g.kb.version
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    metrics.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - g.request_start,
+                                         route=route, method=request.method)
+    profiler = g.pop("profiler", None)
+    if profiler is not None:
+        profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{request.endpoint}-{time.time_ns()}.prof")
+        profiler.dump_stats(path)
+        log.info("Wrote profile for %s %s to %s", request.method, request.path, path)
+        resp.headers["X-Profile-File"] = path
+    return resp
+
+def _cache_stats():
+    out = {}
+    for cache, stats in (("recommend", result_cache.stats()), ("charts", chart_service.store.stats())):
+        for stat, value in stats.items():
+            out[(("cache", cache), ("stat", stat))] = value
+    return out
+
+metrics.REGISTRY.register(metrics.GaugeFunc("cache_stat", "Result and chart cache counters", _cache_stats))
+
+@app.route("/metrics")
+def metrics_view():
+    return Response(metrics.REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+def current_user() -> str:
+    """Anonymous per-browser user id, kept in the signed session cookie."""
+    if "user_id" not in session:
+        session["user_id"] = uuid.uuid4().hex
+    return session["user_id"]
+
+# Goals sent to Prolog, parsed once; form input is bound as atoms and integers, never spliced into goal text
+STUDENT_GOAL = PreparedQuery("student_goal(+atom)")
+TIME_AVAILABLE = PreparedQuery("time_available(+int)")
+USER_LEVEL = PreparedQuery("user_level(+atom)")
+LEARNING_STYLE = PreparedQuery("learning_style(+atom)")
+KNOWN = PreparedQuery("known(+atom)")
+STUDY_SUGGESTION = PreparedQuery("study_suggestion(+int, +int, -Suggestion)")
+FIRST_LEARNABLE_TOPIC = PreparedQuery("first_learnable_topic(-T)")
+SOME_TOPIC_AVAILABLE = PreparedQuery("some_topic_available_to_learn(-T)")
+ALL_PREREQUISITES_KNOWN = PreparedQuery("all_prerequisites_known(+atom)")
+
+def reset_and_assert(p: PrologSession, goal: str, skills: list, time_hours: int, user_level: str = "beginner", learning_style: str = "practical"):
+    p.run(RESET_USER_FACTS)
+    facts = [(STUDENT_GOAL, (goal,)), (TIME_AVAILABLE, (time_hours,)),
+             (USER_LEVEL, (user_level,)), (LEARNING_STYLE, (learning_style,))]
+    facts += [(KNOWN, (s.strip(),)) for s in skills if s.strip()]
+    p.assertz_many(facts)
+
+def resolve_skills(version: KBVersion, text: str) -> list:
+    """Topic names for a comma-separated skills field; flashes terms that matched nothing."""
+    res = version.skills.resolve(text)
+    corrected = [f"{term} → {topic}" for term, topic, via, d in res.matches if d]
+    if corrected:
+        flash(f"Read skills as: {', '.join(corrected)}", "info")
+    if res.unresolved:
+        flash(f"Unrecognised skills (ignored): {', '.join(res.unresolved)}", "warning")
+    return res.names
+
+@app.route("/api/skills/complete")
+def complete_skills():
+    """Autocomplete for the skills field: ?q=<partial skill>&limit=<n>."""
     try:
-        result = list(p.query(f"topic({topic_atom}, _, D, Diff, Cat, Desc)"))
-        if result:
-            return {
-                'duration': int(result[0]['D']),
-                'difficulty': str(result[0]['Diff']),
-                'category': str(result[0]['Cat']),
-                'description': str(result[0]['Desc'])
-            }
-        return {'duration': 0, 'difficulty': 'unknown', 'category': 'unknown', 'description': 'No description available'}
-    except Exception:
-        return {'duration': 0, 'difficulty': 'unknown', 'category': 'unknown', 'description': 'Error retrieving information'}
+        limit = min(25, max(1, int(request.args.get("limit", 8))))
+    except ValueError:
+        limit = 8
+    q = request.args.get("q", "")
+    return {"query": q, "suggestions": g.kb.skills.complete(q, limit)}
 
 @app.route("/", methods=["GET"])
 def home():
-    p = new_prolog()
-    goals = [str(r['Goal']) for r in p.query("goal_topics(Goal, _)")]
+    goals = list(g.kb.graph.goals)
     return render_template("index.html", goals=goals)
 
 @app.route("/recommend", methods=["POST"])
@@ -64,180 +212,207 @@ def recommend():
     time_str = request.form.get("time", "0").strip()
     user_level = request.form.get("user_level", "beginner")
     learning_style = request.form.get("learning_style", "practical")
+    order_by = request.form.get("order_by", "")
+    if order_by not in TIE_BREAKS:
+        order_by = ""
+    # "budget": drop goal topics until the path fits in the available hours
+    mode = "budget" if request.form.get("mode") == "budget" else "full"
+    try:
+        hours_per_week = max(1, int(request.form.get("hours_per_week") or 10))
+        tracks = min(8, max(1, int(request.form.get("tracks") or 1)))
+    except ValueError:
+        flash("Please enter whole numbers for weekly hours and parallel tracks.", "error")
+        return redirect(url_for("home"))
 
-    # Clean inputs
-    skills = [s.strip() for s in skills_raw.split(",") if s.strip()]
     try:
         time_hours = int(time_str)
     except ValueError:
         flash("Please enter a valid number for available time (hours).", "error")
         return redirect(url_for("home"))
 
-    p = new_prolog()
-    reset_and_assert(p, goal, skills, time_hours, user_level, learning_style)
-
-    # Build ordered path (topics)
-    try:
-        q = list(p.query(f"path_to_goal({goal}, Path)"))
-        if not q:
+    # Free-text skills -> canonical topic names ("JS" -> javascript); only these reach Prolog
+    version = g.kb
+    skills = resolve_skills(version, skills_raw)
+
+    # Same profile + same KB => same page; skill order and duplicates don't matter.
+    cache_key = (version.version, goal, tuple(sorted(set(skills))), time_hours, user_level, learning_style, order_by, mode,
+                 hours_per_week, tracks)
+    cached = result_cache.get(cache_key)
+    if cached is None:
+        args = (version.graph, goal, skills, time_hours, user_level, learning_style, order_by, mode,
+                hours_per_week, tracks)
+        try:
+            if prolog_executor is not None:
+                context = prolog_executor.call(build_recommendation, *args, timeout=REQUEST_TIMEOUT,
+                                               module=version.module)
+            else:
+                context = build_recommendation(get_prolog(), *args)
+        except Overloaded:
+            return Response("Server busy, try again shortly.", status=503, headers={"Retry-After": "1"})
+        except FutureTimeout:
+            flash("Building your learning path took too long. Please try again.", "error")
+            return redirect(url_for("home"))
+        except KeyError:
             flash("No eligible topics found for the given input.", "warning")
             return redirect(url_for("home"))
+        except CycleError as e:
+            flash(f"The knowledge base has a prerequisite cycle: {', '.join(e.cycle)}", "error")
+            return redirect(url_for("home"))
+        except PlanError as e:
+            log.warning("Error building path: %s", e)
+            flash("Error building learning path. Please try again.", "error")
+            return redirect(url_for("home"))
+
+        cached = (context, chart_specs(context['path_data'], goal, context['path_stats'],
+                                       context['schedule']))
+        result_cache.put(cache_key, cached)
+
+    context, specs = cached
+    # Enhanced visualization: rendered once per distinct input, then served from memory
+    charts = chart_service.ensure(specs, wait=not ASYNC_MODE)
+
+    # Progress is per user, so it is layered over the shared cached result
+    completed = progress_store.completed(current_user(), [item['topic'] for item in context['path_data']])
+    context = dict(context, path_data=[dict(item, complete=item['topic'] in completed)
+                                       for item in context['path_data']])
+
+    return render_template(
+        "result.html",
+        goal=goal,
+        skills=skills,
+        available=time_hours,
+        user_level=user_level,
+        learning_style=learning_style,
+        **context,
+
+        # Visualization URLs
+        img_url=url_for("chart", name=charts['path']),
+        chart1_url=url_for("chart", name=charts['difficulty']),
+        chart2_url=url_for("chart", name=charts['category']),
+        chart3_url=url_for("chart", name=charts['timeline']),
+    )
+
+@app.route("/charts/<name>")
+def chart(name):
+    """Serve a rendered chart; the name is a content hash, so it never changes."""
+    try:
+        found = chart_service.get(name, timeout=REQUEST_TIMEOUT)
+    except FutureTimeout:
+        abort(503)
+    if found is None:
+        abort(404)
+    data, mimetype = found
+    resp = Response(data, mimetype=mimetype)
+    resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    resp.headers["ETag"] = name.partition(".")[0]
+    return resp
+
+def build_recommendation(p: PrologSession, graph: TopicGraph, goal: str, skills: list, time_hours: int,
+                         user_level: str, learning_style: str, order_by: str = "",
+                         mode: str = "full", hours_per_week: int = 10, tracks: int = 1) -> dict:
+    """Compute everything result.html shows for a profile except the charts.
+
+    Raises KeyError for an unknown goal and PlanError if no path can be built.
+    """
+    reset_and_assert(p, goal, skills, time_hours, user_level, learning_style)
+    # Prolog calls are timed by the pool's observer; the native steps here by step name
+    timed = metrics.RECOMMEND_STEP_SECONDS.time
+
+    # Build ordered path (topics): topological sort over the goal's prerequisites
+    with timed(step="plan_path"):
+        known_mask = graph.mask(skills)
+        ordered_topics = plan_goal(graph, goal, known_mask, order_by)
+    budget_plan = budget_data = None
+    if mode == "budget":
+        # Best subset of goal topics (with their prerequisites) that fits the hours
+        with timed(step="fit_budget"):
+            budget_plan = fit_budget(graph, graph.goal_ids(goal), time_hours, known_mask, tie_break=order_by)
+            budget_data = budget_plan.as_dict(graph)
+        ordered_topics = budget_plan.topics
+    # Week-by-week calendar over the prerequisite DAG, topics split across parallel tracks
+    with timed(step="schedule"):
+        study_schedule = schedule(graph, ordered_topics, hours_per_week, tracks)
+        schedule_data = study_schedule.as_dict(graph)
 
-        ordered_topics = q[0]['Path']  # list of atoms
-    except Exception as e:
-        print(f"Error building path: {e}")
-        flash("Error building learning path. Please try again.", "error")
-        return redirect(url_for("home"))
-    
     # Enhanced path with comprehensive information
     path_data = []
     total_time = 0
-    for t in ordered_topics:
-        t_str = str(t)
-        info = get_topic_info(p, t_str)
-        # Check progress state using new Prolog predicate
-        try:
-            is_complete = bool(list(p.query(f'is_topic_complete({t_str})')))
-        except Exception:
-            is_complete = False
-        path_data.append({
-            'topic': t_str,
-            'duration': info['duration'],
-            'difficulty': info['difficulty'],
-            'category': info['category'],
-            'description': info['description'],
-            'complete': is_complete
-        })
-        total_time += info['duration']
+    with timed(step="path_records"):
+        for rec in graph.info_many(ordered_topics):
+            path_data.append(rec.as_dict())
+            total_time += rec.duration
 
     # Enhanced suggestion with arithmetic
     suggestion = ""
     try:
-        suggest_q = list(p.query(f"study_suggestion({total_time}, {time_hours}, Suggestion)"))
+        suggest_q = p.run(STUDY_SUGGESTION, total_time, time_hours, maxresult=1)
         suggestion = str(suggest_q[0]['Suggestion']) if suggest_q else ""
     except Exception as e:
-        print(f"Error getting suggestion: {e}")
+        log.warning("Error getting suggestion: %s", e)
         suggestion = "Time analysis completed successfully."
 
     # ---- Comprehensive Prolog Concepts Showcase ----
 
-    # 1. UNIFICATION: Same-duration topic pairs
-    same_dur_pairs = []
-    seen_pairs = set()
-    try:
-        for r in p.query(f"goal_path_same_duration_topics({goal}, T1, T2)"):
-            t1, t2 = str(r['T1']), str(r['T2'])
-            key = tuple(sorted((t1, t2)))
-            if key not in seen_pairs:
-                seen_pairs.add(key)
-                same_dur_pairs.append(key)
-                if len(same_dur_pairs) >= 15:
-                    break
-    except Exception as e:
-        print(f"Error getting same duration topics: {e}")
-        same_dur_pairs = []
+    # 1. UNIFICATION: Same-duration topic pairs on the path, from the duration groups
+    names = graph.names
+    with timed(step="same_value_pairs"):
+        same_dur_pairs = [(names[a], names[b])
+                          for a, b in graph.same_value_pairs("duration", ordered_topics, limit=15)]
 
-    # Update in the recommend() function where same_diff_pairs is handled
-
-    # 2. UNIFICATION: Same-difficulty topics
-    same_diff_pairs = []
-    seen_diff_pairs = set()
-    try:
-        for r in p.query("same_difficulty_topics(T1, T2)"):
-            t1, t2 = str(r['T1']), str(r['T2'])
-            key = tuple(sorted((t1, t2)))
-            if key not in seen_diff_pairs:
-                seen_diff_pairs.add(key)
-                same_diff_pairs.append((t1, t2))
-            if len(same_diff_pairs) >= 10:
-                break
-    except Exception as e:
-        print(f"Error getting same difficulty topics: {e}")
-        same_diff_pairs = []
+        # 2. UNIFICATION: Same-difficulty topics across the catalogue
+        same_diff_pairs = [(names[a], names[b])
+                           for a, b in graph.same_value_pairs("difficulty", limit=10)]
 
     # 5. CUT OPERATION: Only the first learnable topic
     first_topic = None
     try:
-        cut_q = list(p.query("first_learnable_topic(T)"))
+        cut_q = p.run(FIRST_LEARNABLE_TOPIC, maxresult=1)
         if cut_q:
             first_topic = str(cut_q[0]['T'])
     except Exception as e:
-        print(f"Error getting first learnable topic: {e}")
+        log.warning("Error getting first learnable topic: %s", e)
         first_topic = None
 
     # 6. NEGATION: Topics you cannot learn yet
-    cannot = []
-    try:
-            
-        cannot = [str(r['Topic']) for r in p.query("cannot_learn(Topic)")]
-    except Exception as e:
-        print(f"Error getting cannot learn topics: {e}")
-        cannot = []
+    with timed(step="missing_prereqs"):
+        cannot = [graph.names[t] for t in graph.missing_prereqs(known_mask)]
 
     # 7. ARITHMETIC + LIST OPERATIONS: Short topics and list operations
     short_threshold = 8
-    short_topics = []
-    long_topics = []
-    try:
-        short_topics = [str(r['Topic']) for r in p.query(f"short_topics({short_threshold}, Topic)")]
-        long_topics = [str(r['Topic']) for r in p.query(f"long_topics({short_threshold}, Topic)")]
-    except Exception as e:
-        print(f"Error getting short/long topics: {e}")
-        short_topics = []
-        long_topics = []
-    
-   # Modified intersection code
-    intersection = []
-    try:
-        # Get goal topics
-        goal_set = [str(x) for x in list(p.query(f"goal_topics({goal}, L)"))[0]['L']]
-        # Get short topics
-        short_topics = [str(r['Topic']) for r in p.query(f"short_topics({short_threshold}, Topic)")]
-        
-        # Use findall to get intersection
-        intersection_query = (
-            f"findall(X, ("
-            f"member(X, {goal_set}), "
-            f"member(X, {short_topics})), "
-            f"Intersection)"
-        )
-        result = list(p.query(intersection_query))
-        if result:
-            intersection = [str(x) for x in result[0]['Intersection']]
-    except Exception as e:
-        print(f"Error getting list intersection: {e}")
-        intersection = []
+    with timed(step="duration_range"):
+        short_mask = graph.duration_range(high=short_threshold)
+        short_topics = graph.names_of(short_mask)
+        long_topics = graph.names_of(graph.topic_mask & ~short_mask)
+        # Goal topics that are also short, in goal order
+        intersection = [names[t] for t in graph.goal_ids(goal) if short_mask >> t & 1]
+
     # 8. QUANTIFIERS: Existential and Universal
     some_topic = None
     try:
-        some_q = list(p.query("some_topic_available_to_learn(T)"))
+        some_q = p.run(SOME_TOPIC_AVAILABLE, maxresult=1)
         if some_q:
             some_topic = str(some_q[0]['T'])
     except Exception as e:
-        print(f"Error getting some topic: {e}")
+        log.warning("Error getting some topic: %s", e)
         some_topic = None
 
     # Universal: are all prereqs known for react?
     universal_demo_topic = "react"
     all_prereqs_known = False
     try:
-        all_known_q = list(p.query(f"all_prerequisites_known({universal_demo_topic})"))
+        all_known_q = p.run(ALL_PREREQUISITES_KNOWN, universal_demo_topic, maxresult=1)
         all_prereqs_known = bool(all_known_q)
     except Exception as e:
-        print(f"Error checking all prerequisites known: {e}")
+        log.warning("Error checking all prerequisites known: %s", e)
         all_prereqs_known = False
 
     # 9. RECURSION: All prerequisites recursively
-    all_prereqs_data = {}
-    for topic in goal_set[:5]:  # Limit to first 5 for performance
-        try:
-            prereq_q = list(p.query(f"all_prerequisites({topic}, Prereqs)"))
-            if prereq_q:
-                prereqs = [str(x) for x in prereq_q[0]['Prereqs']]
-                all_prereqs_data[topic] = prereqs
-        except Exception as e:
-            print(f"Error getting prerequisites for {topic}: {e}")
-            all_prereqs_data[topic] = []
+    # Answered from the precomputed closure, so every goal topic is covered.
+    with timed(step="ancestors"):
+        all_prereqs_data = {
+            graph.names[t]: graph.names_of(graph.ancestors(t))
+            for t in graph.goal_ids(goal)
+        }
 
     # 12. STATISTICS AND ANALYTICS
     path_stats = {
@@ -251,159 +426,66 @@ def recommend():
         path_stats['difficulty_distribution'][item['difficulty']] += 1
         path_stats['category_distribution'][item['category']] += 1
 
-    # Enhanced visualization: Multiple charts
-    try:
-        create_enhanced_visualizations(path_data, goal, path_stats)
-    except Exception as e:
-        print(f"Error creating visualizations: {e}")
-        # Create a simple fallback visualization
-        create_simple_visualization(path_data, goal)
+    return {
+        'path_data': path_data,
+        'total_time': total_time,
+        'suggestion': suggestion,
+        'budget_plan': budget_data,
+        'schedule': schedule_data,
 
-    return render_template(
-        "result.html",
-        goal=goal,
-        skills=skills,
-        available=time_hours,
-        user_level=user_level,
-        learning_style=learning_style,
-        path_data=path_data,
-        total_time=total_time,
-        suggestion=suggestion,
-        
         # Unification examples
-        same_dur_pairs=same_dur_pairs,
-        same_diff_pairs=same_diff_pairs,
-        
+        'same_dur_pairs': same_dur_pairs,
+        'same_diff_pairs': same_diff_pairs,
+
         # Cut
-        first_topic=first_topic,
-        
+        'first_topic': first_topic,
+
         # Negation
-        cannot=cannot,
-        
+        'cannot': cannot,
+
         # Arithmetic and List operations
-        short_threshold=short_threshold,
-        short_topics=short_topics,
-        long_topics=long_topics,
-        intersection=intersection,
-        
+        'short_threshold': short_threshold,
+        'short_topics': short_topics,
+        'long_topics': long_topics,
+        'intersection': intersection,
+
         # Quantifiers
-        some_topic=some_topic,
-        universal_demo_topic=universal_demo_topic,
-        all_prereqs_known=all_prereqs_known,
-        
+        'some_topic': some_topic,
+        'universal_demo_topic': universal_demo_topic,
+        'all_prereqs_known': all_prereqs_known,
+
         # Recursion
-        all_prereqs_data=all_prereqs_data,
-        
-        path_stats=path_stats,
-        
-        # Visualization URLs
-        img_url=url_for("static", filename="learning_path.png"),
-        chart1_url=url_for("static", filename="difficulty_chart.png"),
-        chart2_url=url_for("static", filename="category_chart.png"),
-        chart3_url=url_for("static", filename="timeline_chart.png"),
-    )
+        'all_prereqs_data': all_prereqs_data,
+
+        'path_stats': path_stats,
+    }
+
+@app.route("/api/recommend/batch", methods=["POST"])
+def recommend_batch():
+    """Paths for many profiles at once, streamed back as NDJSON (no charts).
+
+    Body is a JSON array of profiles, {"profiles": [...]}, or NDJSON with one
+    profile per line. Each profile has goal, skills, hours and optionally id
+    and order_by; results come back in input order with their index.
+    """
+    if request.mimetype == "application/x-ndjson":
+        def profiles():
+            for line in request.stream:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        yield None
+    else:
+        body = request.get_json(silent=True)
+        if isinstance(body, dict):
+            body = body.get("profiles")
+        if not isinstance(body, list):
+            return {"error": "expected a JSON array of profiles"}, 400
+        profiles = lambda: body
+    return Response(stream_with_context(g.kb.batch.ndjson(profiles())),
+                    mimetype="application/x-ndjson")
 
-def create_enhanced_visualizations(path_data, goal, path_stats):
-    """Create multiple enhanced visualizations showcasing Prolog concepts."""
-    
-    # 1. Enhanced Learning Path Timeline
-    img_path = os.path.join("static", "learning_path.png")
-    xs = list(range(1, len(path_data) + 1))
-    ys = [1] * len(path_data)
-    
-    plt.figure(figsize=(max(8, len(path_data) * 1.2), 3))
-    plt.plot(xs, ys, 'o-', linewidth=3, markersize=8, color='#3b82f6')
-    
-    for i, item in enumerate(path_data, start=1):
-        plt.text(i, 1.05, item['topic'], ha='center', va='bottom', fontsize=9, 
-                bbox=dict(boxstyle="round,pad=0.3", facecolor='#1e40af', alpha=0.8))
-        plt.text(i, 0.95, f"{item['duration']}h", ha='center', va='top', fontsize=8, color='#6b7280')
-    
-    plt.title(f"Learning Path: {goal}", fontsize=14, fontweight='bold', color='#1f2937')
-    plt.yticks([])
-    plt.xticks([])
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(img_path, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-
-    # 2. Difficulty Distribution Chart
-    chart1_path = os.path.join("static", "difficulty_chart.png")
-    difficulties = list(path_stats['difficulty_distribution'].keys())
-    counts = list(path_stats['difficulty_distribution'].values())
-    colors = ['#10b981', '#f59e0b', '#ef4444']
-    
-    plt.figure(figsize=(8, 6))
-    bars = plt.bar(difficulties, counts, color=colors[:len(difficulties)], alpha=0.8, edgecolor='white', linewidth=2)
-    plt.title(f"Difficulty Distribution for {goal}", fontsize=14, fontweight='bold', color='#1f2937')
-    plt.xlabel('Difficulty Level', fontsize=12, color='#374151')
-    plt.ylabel('Number of Topics', fontsize=12, color='#374151')
-    
-    # Add value labels on bars
-    for bar, count in zip(bars, counts):
-        plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.1, 
-                str(count), ha='center', va='bottom', fontweight='bold')
-    
-    plt.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(chart1_path, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-
-    # 3. Category Distribution Chart
-    chart2_path = os.path.join("static", "category_chart.png")
-    categories = list(path_stats['category_distribution'].keys())
-    cat_counts = list(path_stats['category_distribution'].values())
-    
-    plt.figure(figsize=(10, 6))
-    colors = plt.cm.Set3(np.linspace(0, 1, len(categories)))
-    wedges, texts, autotexts = plt.pie(cat_counts, labels=categories, autopct='%1.1f%%', 
-                                       colors=colors, startangle=90, shadow=True)
-    
-    plt.title(f"Category Distribution for {goal}", fontsize=14, fontweight='bold', color='#1f2937')
-    plt.axis('equal')
-    plt.tight_layout()
-    plt.savefig(chart2_path, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-
-    # 4. Timeline with Duration Chart
-    chart3_path = os.path.join("static", "timeline_chart.png")
-    topics = [item['topic'] for item in path_data]
-    durations = [item['duration'] for item in path_data]
-    colors = [item['difficulty'] for item in path_data]
-    
-    # Map difficulty to colors
-    color_map = {'beginner': '#10b981', 'intermediate': '#f59e0b', 'advanced': '#ef4444'}
-    color_values = [color_map.get(c, '#6b7280') for c in colors]
-    
-    plt.figure(figsize=(12, 6))
-    bars = plt.barh(topics, durations, color=color_values, alpha=0.8, edgecolor='white', linewidth=1)
-    
-    plt.title(f"Learning Timeline for {goal}", fontsize=14, fontweight='bold', color='#1f2937')
-    plt.xlabel('Duration (hours)', fontsize=12, color='#374151')
-    plt.ylabel('Topics', fontsize=12, color='#374151')
-    
-    # Add duration labels on bars
-    for bar, duration in zip(bars, durations):
-        plt.text(bar.get_width() + 0.2, bar.get_y() + bar.get_height()/2, 
-                f"{duration}h", ha='left', va='center', fontweight='bold')
-    
-    plt.grid(True, alpha=0.3, axis='x')
-    plt.tight_layout()
-    plt.savefig(chart3_path, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-
-def create_simple_visualization(path_data, goal):
-    """Create a simple fallback visualization."""
-    img_path = os.path.join("static", "learning_path.png")
-    plt.figure(figsize=(8, 4))
-    plt.text(0.5, 0.5, "Visualization unavailable", 
-             horizontalalignment='center', 
-             verticalalignment='center',
-             transform=plt.gca().transAxes)
-    plt.axis('off')
-    plt.savefig(img_path)
-    plt.close()
-    
 @app.route("/backtrack-demo", methods=["GET"])
 def backtrack_demo():
     return render_template("backtrack.html")
@@ -415,56 +497,73 @@ def remove_skill():
         flash("No skill specified to remove.", "error")
         return redirect(url_for("home"))
         
-    p = new_prolog()
+    def retract(p: PrologSession):
+        return p.retract(KNOWN, skill)
+
     try:
-        # Try to remove the skill using Prolog retract
-        list(p.query(f"retract(known({skill}))"))
+        # Try to remove the skill using Prolog retract, on the Prolog thread in ASYNC_MODE
+        if prolog_executor is not None:
+            prolog_executor.call(retract, timeout=REQUEST_TIMEOUT, module=g.kb.module)
+        else:
+            retract(get_prolog())
         flash(f"Successfully removed skill: {skill}", "success")
+    except Overloaded:
+        return Response("Server busy, try again shortly.", status=503, headers={"Retry-After": "1"})
     except Exception as e:
-        print(f"Error removing skill: {e}")
+        log.warning("Error removing skill: %s", e)
         flash("Error removing skill. Please try again.", "error")
     
     # Redirect back to previous page or home
     return redirect(request.referrer or url_for("home"))
 
+@app.route("/learning-progress", methods=["GET", "POST"])
+def learning_progress():
+    """Record and show the current user's progress per topic."""
+    user = current_user()
+    graph = g.kb.graph
+    if request.method == "POST":
+        topic = request.form.get("topic", "").strip()
+        status = request.form.get("status", "").strip()
+        if topic not in graph.index or not status:
+            flash("Please choose a known topic and a status.", "error")
+        else:
+            progress_store.record(user, topic, status)
+            flash(f"Progress recorded for {topic}.", "success")
+        return redirect(url_for("learning_progress"))
+
+    progress_data = {
+        topic: [f"{status}, {time.strftime('%Y-%m-%d %H:%M', time.localtime(ts))}" for status, ts in entries]
+        for topic, entries in progress_store.history(user).items()
+    }
+    return render_template("learning_progress.html", progress_data=progress_data,
+                           topics=[rec.name for rec in graph.records])
+
 @app.route("/unlearnable-topics")
 def unlearnable_topics():
     """Show topics that can't be learned yet due to missing prerequisites."""
-    p = new_prolog()
-    
-    # Clear any existing known skills
-    list(p.query("retractall(known(_))"))
-    
     # Get skills from query parameter if provided
     skills_param = request.args.get('skills', '')
-    if skills_param:
-        skills = [s.strip().lower() for s in skills_param.split(',') if s.strip()]
-        for skill in skills:
-            p.assertz(f"known({skill})")
-    
-    # Get all topics
+    skills = resolve_skills(g.kb, skills_param)
+
+    # direct: immediate prerequisites only; transitive: the whole prerequisite chain
+    mode = request.args.get('mode', 'direct')
+    if mode not in UNLEARNABLE_MODES:
+        mode = 'direct'
+
     try:
-        topics = list({str(r['Topic']) for r in p.query("topic(Topic, _, _, _, _, _)")})
-        unlearnable = []
-        
-        for topic in topics:
-            # Check if topic is unlearnable
-            if list(p.query(f"cannot_learn({topic})")):
-                # Get missing prerequisites
-                missing = list(p.query(f"topic({topic}, Prereqs, _, _, _, _), member(P, Prereqs), \\+ known(P)"))
-                if missing:
-                    missing_prereqs = list({str(m['P']) for m in missing})
-                    unlearnable.append({
-                        'topic': topic,
-                        'missing_prereqs': missing_prereqs
-                    })
-        
+        # One vectorised AND-NOT over every topic's prerequisite row
+        unlearnable = [
+            {'topic': topic, 'missing_prereqs': missing}
+            for topic, missing in g.kb.prereq_matrix.unlearnable(g.kb.graph.mask(skills), mode)
+        ]
+
         return render_template("unlearnable_topics.html", 
                              unlearnable_topics=unlearnable,
-                             skills_entered=bool(skills_param))
+                             skills_entered=bool(skills_param),
+                             mode=mode)
     
     except Exception as e:
-        print(f"Error getting unlearnable topics: {e}")
+        log.warning("Error getting unlearnable topics: %s", e)
         flash("Error retrieving unlearnable topics", "error")
         return redirect(url_for("home"))
 
@@ -473,27 +572,34 @@ def exhaustive_paths():
     """Find all possible learning paths with exhaustive backtracking."""
     start_topic = request.form.get("start_topic", "html").strip()
     goal_topic = request.form.get("goal_topic", "react").strip()
-    max_depth = int(request.form.get("max_depth", "5"))
-
-    p = new_prolog()
     try:
-        paths = list(p.query(f"find_all_paths({start_topic}, {goal_topic}, {max_depth}, Path)"))
-        all_paths = []
-        for result in paths:
-            path = [str(t) for t in result["Path"]]
-            all_paths.append(path)
-
-        return render_template(
-            "exhaustive_paths.html",
-            start_topic=start_topic,
-            goal_topic=goal_topic,
-            max_depth=max_depth,
-            paths=all_paths
-        )
-    except Exception as e:
-        flash(f"Error finding paths: {str(e)}", "error")
+        max_depth = int(request.form.get("max_depth", "5"))
+    except ValueError:
+        max_depth = 5
+    max_depth = max(0, min(max_depth, MAX_PATH_DEPTH))
+
+    graph = g.kb.graph
+    if start_topic not in graph.index or goal_topic not in graph.index:
+        flash(f"Unknown topic: {start_topic if start_topic not in graph.index else goal_topic}", "error")
         return redirect(url_for("home"))
 
+    start, goal = graph.id(start_topic), graph.id(goal_topic)
+    # Reachability table is shared by the pruned enumeration and the DP count.
+    dist = search.hops_to_goal(graph, goal)
+    paths = search.PathEnumeration(graph, start, goal, max_depth,
+                                   limit=PATHS_SHOWN, time_budget=PATH_TIME_BUDGET, dist=dist)
+    shown = [[graph.names[t] for t in path] for path in paths]
+
+    return render_template(
+        "exhaustive_paths.html",
+        start_topic=start_topic,
+        goal_topic=goal_topic,
+        max_depth=max_depth,
+        paths=shown,
+        total_paths=search.count_paths(graph, start, goal, max_depth, dist=dist),
+        timed_out=paths.timed_out,
+    )
+
 # -----------------------------
 # New routes: A* and AO*
 # -----------------------------
@@ -509,56 +615,72 @@ def astar_view():
             <form method="post" class="space-y-2">
                 <label>Start node <input name="start" placeholder="html" required></label>
                 <label>Goal node <input name="goal" placeholder="react" required></label>
+                <label>Alternative routes <input name="k" type="number" min="1" max="{{ max_routes }}" value="3"></label>
                 <button type="submit">Run A*</button>
             </form>
-            <p class="mt-4 text-sm text-gray-600">Graph uses prerequisite edges and goal list adjacency. Heuristic = topic duration.</p>
+            <p class="mt-4 text-sm text-gray-600">Graph uses the edge/3 arcs weighted by hours. Heuristic = landmark (ALT) lower bounds, compared with the h/2 table.</p>
             {% endblock %}
-            """
+            """,
+            max_routes=MAX_ROUTES
         )
 
     start = request.form.get("start", "html").strip().lower()
     goal = request.form.get("goal", "react").strip().lower()
-
-    p = new_prolog()
     try:
-        # A*
-        ares = list(p.query(f"astar({start}, {goal}, Path, Cost)"))
-        if ares:
-            apath = [str(t) for t in ares[0]['Path']]
-            acost = int(ares[0]['Cost']) if 'Cost' in ares[0] else 0
-        else:
-            apath, acost = [], 0
-
-        # Uninformed DFS for comparison
-        ures = list(p.query(f"uninformed_dfs({start}, {goal}, UPath, UCost, _)"))
-        if ures:
-            upath = [str(t) for t in ures[0]['UPath']]
-            ucost = int(ures[0]['UCost']) if 'UCost' in ures[0] else 0
-        else:
-            upath, ucost = [], 0
-
-        return render_template_string(
-            """
-            {% extends 'base.html' %}
-            {% block content %}
-            <h2>A* Result</h2>
-            <p><b>Start</b>: {{start}} &nbsp; <b>Goal</b>: {{goal}}</p>
-            <h3 class="mt-3">A*</h3>
-            <p><b>Path</b>: {{apath|join(' → ')}}</p>
-            <p><b>Cost</b>: {{acost}} &nbsp; <b>Expanded</b>: {{aexp}}</p>
-            <h3 class="mt-3">Uninformed DFS</h3>
-            <p><b>Path</b>: {{upath|join(' → ')}}</p>
-            <p><b>Cost</b>: {{ucost}} &nbsp; <b>Expanded</b>: {{uexp}}</p>
-            <a class="mt-4 inline-block" href="{{ url_for('astar_view') }}">Run again</a>
-            {% endblock %}
-            """,
-            start=start, goal=goal,
-            apath=apath, acost=acost,
-            upath=upath, ucost=ucost
-        )
-    except Exception as e:
-        flash(f"A* error: {e}", "error")
-        return redirect(url_for("home"))
+        k = max(1, min(int(request.form.get("k") or 3), MAX_ROUTES))
+    except ValueError:
+        k = 3
+
+    graph = g.kb.graph
+    if start not in graph.index or goal not in graph.index:
+        flash(f"Unknown node: {start if start not in graph.index else goal}", "error")
+        return redirect(url_for("astar_view"))
+
+    # A* over the edge graph with landmark bounds; h/2 and uninformed DFS for comparison
+    s, t = graph.id(start), graph.id(goal)
+    h = g.kb.landmarks.heuristic(t)
+    ares = search.astar(graph, s, t, h)
+    hres = search.astar(graph, s, t)
+    ures = search.uninformed_dfs(graph, s, t)
+    # Top-k loopless alternatives ranked by total hours (Yen), reusing the same heuristic
+    routes = search.k_shortest_paths(graph, s, t, k, h, time_budget=PATH_TIME_BUDGET)
+
+    return render_template_string(
+        """
+        {% extends 'base.html' %}
+        {% block content %}
+        <h2>A* Result</h2>
+        <p><b>Start</b>: {{start}} &nbsp; <b>Goal</b>: {{goal}}</p>
+        {% for title, r in [('A* (landmarks)', a), ('A* (h/2 table)', ah), ('Uninformed DFS', u)] %}
+        <h3 class="mt-3">{{ title }}</h3>
+        {% if r.path %}
+        <p><b>Path</b>: {{r.path|join(' → ')}}</p>
+        <p><b>Cost</b>: {{r.cost}}</p>
+        {% else %}
+        <p>No path found.</p>
+        {% endif %}
+        <p><b>Expanded</b>: {{r.expanded}} &nbsp; <b>Generated</b>: {{r.generated}}
+           &nbsp; <b>Max frontier</b>: {{r.max_frontier}} &nbsp; <b>Time</b>: {{r.elapsed_ms}} ms</p>
+        {% endfor %}
+        <h3 class="mt-3">Top {{ k }} routes by total hours</h3>
+        {% if routes.routes %}
+        <ol>
+        {% for route in routes.routes %}
+            <li><b>{{ route.cost }}h</b>: {{ route.path|join(' → ') }}</li>
+        {% endfor %}
+        </ol>
+        {% else %}
+        <p>No path found.</p>
+        {% endif %}
+        <p><b>A* runs</b>: {{routes.searches}} &nbsp; <b>Expanded</b>: {{routes.expanded}}
+           &nbsp; <b>Time</b>: {{routes.elapsed_ms}} ms
+           {% if routes.timed_out %}&nbsp; (stopped at the time limit){% endif %}</p>
+        <a class="mt-4 inline-block" href="{{ url_for('astar_view') }}">Run again</a>
+        {% endblock %}
+        """,
+        start=start, goal=goal, k=k,
+        a=ares.as_dict(graph), ah=hres.as_dict(graph), u=ures.as_dict(graph), routes=routes.as_dict(graph)
+    )
 
 @app.route("/aostar", methods=["GET", "POST"])
 def aostar_view():
@@ -570,40 +692,81 @@ def aostar_view():
             <h2>AO* Search (AND-OR Graph)</h2>
             <form method="post" class="space-y-2">
                 <label>Root node <input name="root" placeholder="frontend_stack" required></label>
+                <label>Cost bound (optional) <input name="bound" type="number" min="0"></label>
                 <button type="submit">Run AO*</button>
             </form>
-            <p class="mt-4 text-sm text-gray-600">AND-OR alternatives are defined in the knowledge base.</p>
+            <p class="mt-4 text-sm text-gray-600">AND-OR alternatives are defined in the knowledge base: {{ roots|join(', ') }}.</p>
             {% endblock %}
-            """
+            """,
+            roots=sorted(g.kb.andor.alternatives)
         )
 
     root = request.form.get("root", "frontend_stack").strip().lower()
+    bound = request.form.get("bound", "").strip()
 
-    p = new_prolog()
+    if root not in g.kb.andor.alternatives:
+        flash(f"Unknown AND-OR node: {root}", "error")
+        return redirect(url_for("aostar_view"))
     try:
-        res = list(p.query(f"aostar({root}, Strategy, Cost)"))
-        if res:
-            strategy = [str(t) for t in res[0]['Strategy']]
-            cost = int(res[0]['Cost']) if 'Cost' in res[0] else 0
-        else:
-            strategy, cost = [], 0
-
-        return render_template_string(
-            """
-            {% extends 'base.html' %}
-            {% block content %}
-            <h2>AO* Result</h2>
-            <p><b>Root</b>: {{root}}</p>
-            <p><b>Chosen strategy (AND-set)</b>: {{strategy|join(' + ')}}</p>
-            <p><b>Total cost</b>: {{cost}}</p>
-            <a class="mt-4 inline-block" href="{{ url_for('aostar_view') }}">Run again</a>
-            {% endblock %}
-            """,
-            root=root, strategy=strategy, cost=cost
-        )
-    except Exception as e:
+        res = g.kb.ao_engine.solve(root, bound=float(bound) if bound else None)
+    except ValueError as e:
         flash(f"AO* error: {e}", "error")
-        return redirect(url_for("home"))
-    
+        return redirect(url_for("aostar_view"))
+
+    return render_template_string(
+        """
+        {% extends 'base.html' %}
+        {% block content %}
+        <h2>AO* Result</h2>
+        <p><b>Root</b>: {{r.root}}</p>
+        {% if r.solved %}
+        <p><b>Chosen strategy (leaves)</b>: {{r.strategy|join(' + ')}}</p>
+        <p><b>Total cost</b>: {{r.cost}}</p>
+        <h3 class="mt-3">Solution graph</h3>
+        <ul>
+        {% for node, children in r.solution.items() %}
+            <li><b>{{node}}</b> → {{children|join(' AND ')}}</li>
+        {% endfor %}
+        </ul>
+        {% elif r.cutoff %}
+        <p>No solution within the cost bound (needs at least {{r.cost}}).</p>
+        {% else %}
+        <p>No solution found.</p>
+        {% endif %}
+        <p><b>Expanded</b>: {{r.expanded}} &nbsp; <b>Generated</b>: {{r.generated}}
+           &nbsp; <b>Revisions</b>: {{r.revisions}} &nbsp; <b>Memo hits</b>: {{r.memo_hits}}
+           &nbsp; <b>Time</b>: {{'%.3f'|format(r.elapsed_ms)}} ms</p>
+        <a class="mt-4 inline-block" href="{{ url_for('aostar_view') }}">Run again</a>
+        {% endblock %}
+        """,
+        r=res
+    )
+
+def start_warmup():
+    """Load the Prolog KB and matplotlib's font cache on a background thread.
+
+    Call once the server is accepting connections (e.g. from gunicorn's
+    post_worker_init hook) so the first real request doesn't pay for it.
+    """
+    def run():
+        try:
+            version = start().current
+            if prolog_executor is not None:
+                # Create the engine on the thread that will run every query
+                prolog_executor.call(lambda s: None, module=version.module)
+            else:
+                version.load_prolog()
+            warm_up_charts()
+        except Exception as e:
+            log.exception("Warm-up failed")
+    t = threading.Thread(target=run, name="warmup", daemon=True)
+    t.start()
+    return t
+
 if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    start()
+    if os.environ.get("WARMUP", "1") != "0":
+        start_warmup()
     app.run(debug=True)
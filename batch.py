@@ -0,0 +1,133 @@
+"""Bulk recommendations for whole cohorts.
+
+`recommend_many` answers thousands of profiles against one TopicGraph. Only
+the known skills inside a goal's prerequisite closure can change its path, so
+profiles are grouped on (goal, relevant-known bitset, order) and each distinct
+group is planned once; everything else is a dictionary hit.
+"""
+import json
+
+from planner import plan_goal, study_suggestion, PlanError, TIE_BREAKS
+from topic_graph import TopicGraph
+
+# Entries kept per cache (skill sets, plans) before new keys stop being stored
+MAX_CACHED = 100_000
+
+
+def _split_skills(skills) -> list:
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    return [s.strip() for s in skills if s and s.strip()]
+
+
+def _valid_skills(skills) -> bool:
+    """A comma-separated string or a list of strings."""
+    return isinstance(skills, str) or (isinstance(skills, list) and all(isinstance(s, str) for s in skills))
+
+
+class BatchRecommender:
+    """Reusable planner state for one TopicGraph; safe to share between requests.
+
+    With a SkillIndex, free-text skills are resolved through it ("JS" ->
+    javascript) and results list the terms that matched nothing.
+    """
+
+    def __init__(self, graph: TopicGraph, skills=None):
+        self.graph = graph
+        self.skills = skills
+        # Goal -> bitset of every topic its path could contain
+        self.relevant = {}
+        for goal, ids in graph.goals.items():
+            m = 0
+            for t in ids:
+                m |= (1 << t) | graph.ancestors(t)
+            self.relevant[goal] = m
+        self._plans = {}
+        self._masks = {}
+
+    def known_mask(self, skills) -> int:
+        return self._known(skills)[0]
+
+    def _known(self, skills) -> tuple:
+        """(bitset of known topics, unresolved terms)."""
+        key = skills if isinstance(skills, str) else tuple(skills)
+        hit = self._masks.get(key)
+        if hit is None:
+            if self.skills is not None:
+                res = self.skills.resolve(_split_skills(skills))
+                m = 0
+                for tid in res.ids:
+                    m |= 1 << tid
+                hit = (m, res.unresolved)
+            else:
+                hit = (self.graph.mask(_split_skills(skills)), [])
+            if len(self._masks) < MAX_CACHED:
+                self._masks[key] = hit
+        return hit
+
+    def plan(self, goal: str, known: int, order_by: str = ""):
+        """(topic names, total hours) for a goal; cached per relevant skill set."""
+        key = (goal, known & self.relevant[goal], order_by)
+        hit = self._plans.get(key)
+        if hit is None:
+            ids = plan_goal(self.graph, goal, key[1], order_by)
+            hit = ([self.graph.names[t] for t in ids],
+                   sum(self.graph.records[t].duration for t in ids))
+            if len(self._plans) < MAX_CACHED:
+                self._plans[key] = hit
+        return hit
+
+    def recommend(self, profile: dict) -> dict:
+        goal = str(profile.get("goal", "")).strip()
+        if goal not in self.relevant:
+            return {"error": f"unknown goal: {goal}"}
+        order_by = profile.get("order_by") or ""
+        if not isinstance(order_by, str):
+            return {"error": "order_by must be a string"}
+        if order_by not in TIE_BREAKS:
+            order_by = ""
+        try:
+            hours = int(profile.get("hours", profile.get("time", 0)))
+        except (TypeError, ValueError):
+            return {"error": "hours must be an integer"}
+        skills = profile.get("skills", "")
+        if not _valid_skills(skills):
+            return {"error": "skills must be a string or a list of strings"}
+        known, unresolved = self._known(skills)
+        try:
+            path, total = self.plan(goal, known, order_by)
+        except PlanError as e:
+            return {"error": str(e)}
+        out = {
+            "goal": goal,
+            "path": path,
+            "total_time": total,
+            "available": hours,
+            "fits": total <= hours,
+            "suggestion": study_suggestion(total, hours),
+        }
+        if unresolved:
+            out["unresolved_skills"] = unresolved
+        return out
+
+    def recommend_many(self, profiles):
+        """Yield one result per profile, in input order, tagged with its index (and id if given)."""
+        for i, profile in enumerate(profiles):
+            if not isinstance(profile, dict):
+                out = {"error": "profile must be an object"}
+            else:
+                out = self.recommend(profile)
+                if "id" in profile:
+                    out["id"] = profile["id"]
+            out["index"] = i
+            yield out
+
+    def ndjson(self, profiles):
+        """recommend_many as newline-delimited JSON lines."""
+        dumps = json.dumps
+        for out in self.recommend_many(profiles):
+            yield dumps(out, separators=(",", ":")) + "\n"
+
+
+def recommend_many(graph: TopicGraph, profiles):
+    return BatchRecommender(graph).recommend_many(profiles)
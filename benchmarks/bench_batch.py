@@ -0,0 +1,45 @@
+"""Throughput of batch.recommend_many on synthetic cohorts.
+
+    python benchmarks/bench_batch.py --profiles 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import BatchRecommender  # noqa: E402
+from topic_graph import TopicGraph  # noqa: E402
+
+
+def make_profiles(graph, n, seed=0):
+    rng = random.Random(seed)
+    goals = list(graph.goals)
+    skills = graph.names[:graph.n_topics]
+    return [{
+        "goal": rng.choice(goals),
+        "skills": ", ".join(rng.sample(skills, rng.randint(0, 5))),
+        "hours": rng.randint(10, 120),
+    } for _ in range(n)]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--profiles", type=int, default=50_000)
+    ap.add_argument("--kb", default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "learningpath.pl"))
+    args = ap.parse_args()
+
+    graph = TopicGraph.from_file(args.kb)
+    profiles = make_profiles(graph, args.profiles)
+    rec = BatchRecommender(graph)
+    start = time.perf_counter()
+    lines = sum(1 for _ in rec.ndjson(profiles))
+    elapsed = time.perf_counter() - start
+    print(f"{lines} profiles in {elapsed:.3f}s: {lines / elapsed:,.0f} profiles/s "
+          f"({len(rec._plans)} distinct plans)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Per-call overhead of text goals against prepared ones (needs SWI-Prolog).
+
+    python benchmarks/bench_prepared.py --repeat 2000
+
+Each case runs the same work three ways:
+
+- "text": f-string goals through PrologSession.query. SWI parses every one.
+- "prepared": PrologSession.run with the arguments bound as terms.
+- "batched": one run_many / assertz_many call for the whole loop.
+
+All three go through one session on the repo's knowledge base, with the
+metrics observer attached as in app.py.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import metrics  # noqa: E402
+from prolog_pool import PrologPool  # noqa: E402
+from prolog_query import PreparedQuery  # noqa: E402
+from topic_graph import TopicGraph  # noqa: E402
+
+STUDY_SUGGESTION = PreparedQuery("study_suggestion(+int, +int, -Suggestion)")
+ALL_PREREQUISITES_KNOWN = PreparedQuery("all_prerequisites_known(+atom)")
+KNOWN = PreparedQuery("known(+atom)")
+
+
+def per_call_us(fn, calls: int, repeat: int) -> float:
+    """Median microseconds per call over `repeat` runs of fn (which makes `calls` calls)."""
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - t0) / calls * 1e6)
+    return statistics.median(runs)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--kb", default=os.path.join(ROOT, "learningpath.pl"))
+    ap.add_argument("--repeat", type=int, default=200)
+    args = ap.parse_args()
+
+    topics = TopicGraph.from_file(args.kb).names
+    pool = PrologPool(args.kb, observer=metrics.observe_kb_query)
+    try:
+        pool.load()
+    except Exception as e:      # no SWI-Prolog, or pyswip missing
+        print(f"skipped: {type(e).__name__}: {e}")
+        return 0
+
+    with pool.session() as s:
+        def assert_text():
+            s.reset()
+            for t in topics:
+                s.assertz(f"known({t})")
+
+        def assert_batched():
+            s.reset()
+            s.assertz_many((KNOWN, (t,)) for t in topics)
+
+        cases = [
+            ("study_suggestion", 1, {
+                "text": lambda: s.query("study_suggestion(42, 40, Suggestion)"),
+                "prepared": lambda: s.run(STUDY_SUGGESTION, 42, 40),
+            }),
+            ("all_prerequisites_known", len(topics), {
+                "text": lambda: [s.query(f"all_prerequisites_known({t})") for t in topics],
+                "prepared": lambda: [s.run(ALL_PREREQUISITES_KNOWN, t) for t in topics],
+                "batched": lambda: s.run_many(ALL_PREREQUISITES_KNOWN, [(t,) for t in topics]),
+            }),
+            ("assert known/1", len(topics), {
+                "text": assert_text,
+                "batched": assert_batched,
+            }),
+        ]
+        print(f"{'case':<26} {'calls':>6} {'text':>12} {'prepared':>12} {'batched':>12}   (us per call)")
+        for name, calls, ways in cases:
+            cells = []
+            for way in ("text", "prepared", "batched"):
+                fn = ways.get(way)
+                cells.append(f"{per_call_us(fn, calls, args.repeat):12.1f}" if fn else f"{'-':>12}")
+            print(f"{name:<26} {calls:>6} " + " ".join(cells))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
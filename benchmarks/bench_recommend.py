@@ -0,0 +1,78 @@
+"""Requests-per-second for /recommend: shared engine pool vs. consult-per-request.
+
+Run from the repository root:
+
+    python benchmarks/bench_recommend.py --requests 200
+"""
+import argparse
+import os
+import sys
+import itertools
+import time
+from contextlib import contextmanager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app as webapp  # noqa: E402
+from kb_versions import KBRegistry  # noqa: E402
+from prolog_pool import PrologPool, PrologSession, _atom  # noqa: E402
+
+KB_PATH = os.path.join(ROOT, "learningpath.pl")
+
+
+class ConsultPerRequestPool(PrologPool):
+    """Old behaviour: re-consult the knowledge base for every request."""
+
+    @contextmanager
+    def session(self, deadline: float = None, module: str = None):
+        from pyswip import Prolog
+        p = Prolog()
+        if module:
+            list(p.query(f"load_files({module}:{_atom(self._sources[module])}, [])"))
+        else:
+            p.consult(self.kb_path)
+        self.prolog = p
+        s = PrologSession(self, deadline, module)
+        s.reset()
+        yield s
+
+
+FORM = {
+    "goal": "frontend_dev",
+    "skills": "html, css",
+    "time": "60",
+    "user_level": "beginner",
+    "learning_style": "practical",
+}
+
+
+def run(pool, n):
+    # Requests use the versioned KB, so the registry registers its module on this pool
+    webapp.pool = pool
+    webapp.kb = KBRegistry(KB_PATH, pool)
+    if not os.path.isdir(os.path.join(ROOT, "templates")):
+        webapp.app.template_folder = ROOT       # templates kept next to app.py
+    client = webapp.app.test_client()
+    # A fresh available-hours value each request so the result cache never answers
+    hours = itertools.count(1000)
+    client.post("/recommend", data=dict(FORM, time=str(next(hours))))  # warm-up
+    start = time.perf_counter()
+    for _ in range(n):
+        client.post("/recommend", data=dict(FORM, time=str(next(hours))))
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--requests", type=int, default=100)
+    args = ap.parse_args()
+
+    before = run(ConsultPerRequestPool(None), args.requests)
+    after = run(PrologPool(None), args.requests)
+    print(f"consult per request: {before:8.1f} req/s")
+    print(f"shared pool:         {after:8.1f} req/s  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Compare two suite.py result files and flag slowdowns.
+
+    python benchmarks/compare.py baseline.json current.json --threshold 1.25
+
+Prints each (case, size) with its baseline and current median and their
+ratio. It then prints the empirical scaling exponent of each case: the
+slope of log(time) against log(topics) between consecutive sizes, so 1.0
+is linear. Exits 1 if any case is slower than `threshold` times its
+baseline, ignoring timings below --min-ms, which are mostly noise.
+"""
+import argparse
+import json
+import math
+import sys
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    return {(r["case"], r["n"]): r for r in data["results"] if "median_ms" in r}
+
+
+def scaling(rows: dict) -> dict:
+    """case -> [(n1, n2, exponent), ...] between consecutive measured sizes."""
+    by_case = {}
+    for (case, n), r in rows.items():
+        by_case.setdefault(case, []).append((n, r["median_ms"]))
+    out = {}
+    for case, points in by_case.items():
+        points.sort()
+        out[case] = [(n1, n2, math.log(t2 / t1) / math.log(n2 / n1))
+                     for (n1, t1), (n2, t2) in zip(points, points[1:]) if t1 > 0 and t2 > 0]
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("baseline")
+    ap.add_argument("current")
+    ap.add_argument("--threshold", type=float, default=1.25)
+    ap.add_argument("--min-ms", type=float, default=0.05)
+    args = ap.parse_args(argv)
+
+    base, cur = load(args.baseline), load(args.current)
+    regressions = []
+    print(f"{'case':<20} {'topics':>8} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for key in sorted(cur, key=lambda k: (k[0], k[1])):
+        now = cur[key]["median_ms"]
+        if key not in base:
+            print(f"{key[0]:<20} {key[1]:>8} {'-':>12} {now:>10.3f}ms {'new':>7}")
+            continue
+        before = base[key]["median_ms"]
+        ratio = now / before if before else float("inf")
+        slow = ratio > args.threshold and max(now, before) >= args.min_ms
+        if slow:
+            regressions.append(key)
+        print(f"{key[0]:<20} {key[1]:>8} {before:>10.3f}ms {now:>10.3f}ms {ratio:>6.2f}x"
+              + ("  SLOWER" if slow else ""))
+
+    print("\nscaling exponent (time ~ topics^k):")
+    for case, steps in sorted(scaling(cur).items()):
+        print(f"  {case:<20} " + "  ".join(f"{n1}->{n2}: {k:.2f}" for n1, n2, k in steps))
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.2f}x", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""p50/p99 latency of /recommend under concurrent clients, sync vs. async mode.
+
+Starts the app once per mode (ASYNC_MODE=0 and 1) on a local port, then
+has `--clients` threads POST varied profiles for `--seconds`. The default
+is 50 clients. Run from the repository root:
+
+    python benchmarks/loadtest.py --clients 50 --seconds 20
+
+Pass --url to load-test a server that is already running instead.
+"""
+import argparse
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+GOALS = ["frontend_dev", "backend_dev", "fullstack_dev", "devops_engineer", "security_specialist"]
+SKILLS = ["html", "css", "javascript", "git", "python", "sql", "linux", "docker"]
+
+
+def profile(rng) -> bytes:
+    form = {
+        "goal": rng.choice(GOALS),
+        "skills": ", ".join(rng.sample(SKILLS, rng.randint(0, 4))),
+        "time": str(rng.choice([20, 40, 60, 100])),
+        "tracks": str(rng.randint(1, 3)),
+    }
+    return urllib.parse.urlencode(form).encode()
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run_load(url, clients, seconds, fetch_charts=False):
+    latencies, errors = [], []
+    lock = threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def client(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url + "/recommend", data=profile(rng), timeout=60) as resp:
+                    body = resp.read().decode()
+                if fetch_charts:
+                    for part in body.split('src="/charts/')[1:]:
+                        urllib.request.urlopen(url + "/charts/" + part.split('"', 1)[0], timeout=60).read()
+            except (urllib.error.URLError, OSError) as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    latencies.sort()
+    return latencies, errors
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(async_mode: bool):
+    port = free_port()
+    db = os.path.join(tempfile.mkdtemp(), "progress.db")
+    env = dict(os.environ, ASYNC_MODE="1" if async_mode else "0", PROGRESS_DB=db)
+    proc = subprocess.Popen(
+        [sys.executable, "-c", f"import app; app.start(); app.app.run(port={port}, threaded=True)"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(200):
+        try:
+            urllib.request.urlopen(url + "/", timeout=1).read()
+            return proc, url
+        except urllib.error.HTTPError:
+            return proc, url
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start")
+
+
+def report(label, latencies, errors, seconds):
+    ms = [x * 1000 for x in latencies]
+    print(f"{label:<6} {len(ms) / seconds:8.1f} req/s  p50 {percentile(ms, 0.50):8.1f} ms"
+          f"  p99 {percentile(ms, 0.99):8.1f} ms  errors {len(errors)}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--clients", type=int, default=50)
+    ap.add_argument("--seconds", type=float, default=20)
+    ap.add_argument("--fetch-charts", action="store_true", help="also download each page's charts")
+    ap.add_argument("--url", help="load-test this server instead of starting one per mode")
+    args = ap.parse_args()
+
+    if args.url:
+        report("server", *run_load(args.url.rstrip("/"), args.clients, args.seconds, args.fetch_charts),
+               args.seconds)
+        return
+    for label, async_mode in (("sync", False), ("async", True)):
+        proc, url = start_server(async_mode)
+        try:
+            run_load(url, 4, 2)  # warm-up: KB load, font cache
+            report(label, *run_load(url, args.clients, args.seconds, args.fetch_charts), args.seconds)
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
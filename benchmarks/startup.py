@@ -0,0 +1,83 @@
+"""Cold-start cost of the web app: import time and time to first response.
+
+    python benchmarks/startup.py                 # report
+    python benchmarks/startup.py --max-import-ms 300 --max-first-ms 1500
+
+Import time comes from ``python -X importtime -c "import app"``; the largest
+cumulative entries are listed. Time-to-first-response is measured in a fresh
+interpreter from process start to the first ``/`` and ``/recommend`` answers.
+Exits non-zero if a threshold is exceeded, so it can gate CI.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_RESPONSE = r"""
+import json, time
+t0 = time.perf_counter()
+import app as webapp
+t_import = time.perf_counter()
+client = webapp.app.test_client()
+client.get("/")
+t_home = time.perf_counter()
+client.post("/recommend", data={"goal": "frontend_dev", "skills": "html", "time": "40",
+                                "user_level": "beginner", "learning_style": "practical"})
+t_rec = time.perf_counter()
+print(json.dumps({"import_ms": (t_import - t0) * 1000, "home_ms": (t_home - t0) * 1000,
+                  "recommend_ms": (t_rec - t0) * 1000}))
+"""
+
+
+def import_breakdown(top: int):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"],
+                          cwd=ROOT, capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:  <self us> | <cumulative us> | <indented module name>"
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    total = next((c for c, _, n in rows if n.strip() == "app"), 0)
+    rows.sort(reverse=True)
+    return total / 1000, rows[:top]
+
+
+def first_response():
+    proc = subprocess.run([sys.executable, "-c", FIRST_RESPONSE], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--top", type=int, default=15, help="import entries to list")
+    ap.add_argument("--max-import-ms", type=float)
+    ap.add_argument("--max-first-ms", type=float, help="limit for time to first /recommend")
+    args = ap.parse_args()
+
+    total_ms, rows = import_breakdown(args.top)
+    print(f"import app: {total_ms:.1f} ms cumulative")
+    for cumulative, own, name in rows:
+        print(f"  {cumulative / 1000:8.1f} ms  (self {own / 1000:6.1f})  {name}")
+
+    timings = first_response()
+    print(f"first /          : {timings['home_ms']:.1f} ms after start")
+    print(f"first /recommend : {timings['recommend_ms']:.1f} ms after start")
+
+    failed = False
+    if args.max_import_ms is not None and total_ms > args.max_import_ms:
+        print(f"FAIL: import {total_ms:.1f} ms > {args.max_import_ms} ms")
+        failed = True
+    if args.max_first_ms is not None and timings['recommend_ms'] > args.max_first_ms:
+        print(f"FAIL: first /recommend {timings['recommend_ms']:.1f} ms > {args.max_first_ms} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
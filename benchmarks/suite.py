@@ -0,0 +1,257 @@
+"""Planner and search benchmarks on synthetic KBs of increasing size.
+
+    python benchmarks/suite.py                              # 10^2 .. 10^5 topics
+    python benchmarks/suite.py --sizes 100 1000 -o now.json
+    python benchmarks/compare.py baseline.json now.json     # flag slowdowns
+
+Each case is timed on KBs from synthetic_kb.generate (same seed, so runs are
+comparable). After one untimed warm-up call, the reported time is the
+median over repeats, up to --min-time seconds per case. Cases whose working
+set grows quadratically are skipped above their `max_n`, with the reason
+recorded. Cases are named after the Python code they time, not
+the Prolog predicates it replaces. /recommend needs SWI-Prolog and is
+skipped, with the reason recorded, when pyswip cannot start. Its charts are
+rendered before timing starts, and render_charts times them on their own.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import search  # noqa: E402
+from aostar import AndOrGraph, AOStar  # noqa: E402
+from charts import ChartService, chart_specs  # noqa: E402
+from landmarks import LandmarkIndex  # noqa: E402
+from planner import plan_goal  # noqa: E402
+from prereq_matrix import PrereqMatrix  # noqa: E402
+from synthetic_kb import generate  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000)
+
+
+def timeit(fn, min_time: float, max_runs: int = 50) -> dict:
+    fn()        # warm-up: first-call costs (imports, caches, lazy indexes) aren't timed
+    runs = []
+    deadline = time.perf_counter() + min_time
+    while len(runs) < max_runs and (not runs or time.perf_counter() < deadline):
+        t0 = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - t0) * 1000)
+    return {"median_ms": statistics.median(runs), "min_ms": min(runs), "runs": len(runs)}
+
+
+class Context:
+    """One synthetic KB plus the query inputs every case draws from."""
+
+    def __init__(self, n: int, seed: int):
+        # Grow the AND-OR curriculum with the catalogue: about 6^depth nodes
+        self.kb = generate(n, andor_depth=max(2, round(math.log10(n))), seed=seed)
+        self.graph = self.kb.graph()
+        self.andor = AndOrGraph(self.kb.andor, self.kb.costs)
+        rng = random.Random(seed)
+        g = self.graph
+        self.goal = self.kb.goals[0][0]
+        bottom = [t for t in range(g.n_topics) if not len(g.prereqs(t))]
+        self.known = g.mask(g.names[t] for t in rng.sample(bottom, min(5, len(bottom))))
+        # A reachable (start, goal) pair: walk prerequisites down from a top-layer goal topic
+        self.target = max(g.goal_ids(self.goal), key=lambda t: len(g.prereqs(t)))
+        start = self.target
+        while len(g.prereqs(start)):
+            # Prefer prerequisites that have their own, so the walk reaches the bottom layer
+            deeper = [p for p in g.prereqs(start) if len(g.prereqs(p))]
+            start = rng.choice(deeper or list(g.prereqs(start)))
+        self.start = start
+        self._kb_path = None
+        self._landmarks = None
+
+    def landmarks(self) -> LandmarkIndex:
+        if self._landmarks is None:
+            self._landmarks = LandmarkIndex(self.graph)
+        return self._landmarks
+
+    def kb_path(self) -> str:
+        if self._kb_path is None:
+            fd, self._kb_path = tempfile.mkstemp(suffix=".pl")
+            with os.fdopen(fd, "w", encoding="utf-8") as out:
+                self.kb.write(out)
+        return self._kb_path
+
+
+# -- cases ---------------------------------------------------------------------
+# Each returns a zero-argument callable to time, or a string saying why it was skipped.
+
+def case_plan_goal(ctx):
+    return lambda: plan_goal(ctx.graph, ctx.goal, ctx.known)
+
+
+def case_ancestors(ctx):
+    g = ctx.graph
+
+    def run():
+        g.__dict__.pop("_ancestors", None)     # include building the closure
+        return [g.names_of(g.ancestors(t)) for t in g.goal_ids(ctx.goal)]
+    return run
+
+
+def case_astar(ctx):
+    return lambda: search.astar(ctx.graph, ctx.start, ctx.target)
+
+
+def case_astar_landmarks(ctx):
+    h = ctx.landmarks().heuristic(ctx.target)
+    return lambda: search.astar(ctx.graph, ctx.start, ctx.target, h)
+
+
+def case_k_shortest_paths(ctx):
+    h = ctx.landmarks().heuristic(ctx.target)
+    return lambda: search.k_shortest_paths(ctx.graph, ctx.start, ctx.target, 5, h, time_budget=2.0)
+
+
+def case_landmark_index(ctx):
+    return lambda: LandmarkIndex(ctx.graph)
+
+
+def case_dfs(ctx):
+    return lambda: search.uninformed_dfs(ctx.graph, ctx.start, ctx.target)
+
+
+def case_path_enumeration(ctx):
+    def run():
+        paths = search.PathEnumeration(ctx.graph, ctx.start, ctx.target, 10, limit=50, time_budget=0.5)
+        return list(paths), search.count_paths(ctx.graph, ctx.start, ctx.target, 10)
+    return run
+
+
+def case_aostar(ctx):
+    return lambda: AOStar(ctx.andor).solve("curriculum")
+
+
+def case_missing_prereqs(ctx):
+    return lambda: ctx.graph.missing_prereqs(ctx.known)
+
+
+def case_unlearnable_matrix(ctx):
+    matrix = PrereqMatrix(ctx.graph)
+    return lambda: matrix.unlearnable(ctx.known, "transitive")
+
+
+def case_recommend(ctx):
+    os.chdir(ROOT)      # app.py opens learningpath.pl and its templates relative to the repo
+    try:
+        import app as webapp
+        from prolog_pool import PrologPool
+        PrologPool(ctx.kb_path()).load()
+    except Exception as e:      # no SWI-Prolog, or pyswip missing
+        return f"skipped: {type(e).__name__}: {e}"
+    from kb_versions import KBRegistry
+    webapp.kb = KBRegistry(ctx.kb_path(), webapp.pool)
+    if not os.path.isdir(os.path.join(ROOT, "templates")):
+        webapp.app.template_folder = ROOT       # templates kept next to app.py
+    client = webapp.app.test_client()
+    names = [ctx.graph.names[t] for t in ctx.graph.bits(ctx.known)]
+    counter = iter(range(10 ** 9))
+
+    def run():
+        # A fresh available-hours value each call so the result cache never answers
+        resp = client.post("/recommend", data={"goal": ctx.goal, "skills": ", ".join(names),
+                                               "time": str(next(counter))})
+        assert resp.status_code == 200, resp.status_code
+    # Charts don't depend on the hours, so timeit's warm-up call renders them
+    # once and the timed calls find them cached (see render_charts)
+    return run
+
+
+def case_render_charts(ctx):
+    path_data = [rec.as_dict() for rec in ctx.graph.info_many(plan_goal(ctx.graph, ctx.goal, ctx.known))]
+    stats = {"difficulty_distribution": {}, "category_distribution": {}}
+    for item in path_data:
+        for key, field in (("difficulty_distribution", "difficulty"), ("category_distribution", "category")):
+            stats[key][item[field]] = stats[key].get(item[field], 0) + 1
+    specs = chart_specs(path_data, ctx.goal, stats)
+    return lambda: ChartService().ensure(specs)
+
+
+# (name, case, None or (max_n, why the case stops there))
+CASES = [
+    ("plan_goal", case_plan_goal, None),
+    ("ancestors", case_ancestors, (30_000, "ancestor closure is n^2/8 bytes")),
+    ("astar", case_astar, None),
+    ("astar_landmarks", case_astar_landmarks, None),
+    ("k_shortest_paths", case_k_shortest_paths, None),
+    ("landmark_index", case_landmark_index, None),
+    ("dfs", case_dfs, None),
+    ("path_enumeration", case_path_enumeration, None),
+    ("aostar", case_aostar, None),
+    ("missing_prereqs", case_missing_prereqs, None),
+    ("unlearnable_matrix", case_unlearnable_matrix, (20_000, "two n x n bit matrices, n^2/4 bytes")),
+    ("recommend", case_recommend, None),
+    ("render_charts", case_render_charts, None),
+]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    ap.add_argument("--cases", nargs="+", choices=[c[0] for c in CASES])
+    ap.add_argument("--min-time", type=float, default=0.5, help="seconds of repeats per case")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("-o", "--output", default="bench-results.json")
+    args = ap.parse_args()
+    output = os.path.abspath(args.output)
+
+    results = []
+    for n in args.sizes:
+        t0 = time.perf_counter()
+        ctx = Context(n, args.seed)
+        print(f"-- {n} topics (generated in {time.perf_counter() - t0:.1f}s)")
+        for name, make, limit in CASES:
+            if args.cases and name not in args.cases:
+                continue
+            row = {"case": name, "n": n}
+            if limit is not None and n > limit[0]:
+                row["skipped"] = f"above max_n={limit[0]}: {limit[1]}"
+            else:
+                fn = make(ctx)
+                if isinstance(fn, str):
+                    row["skipped"] = fn
+                else:
+                    row.update(timeit(fn, args.min_time))
+            results.append(row)
+            if "skipped" in row:
+                print(f"   {name:<20} {row['skipped']}")
+            else:
+                print(f"   {name:<20} {row['median_ms']:10.3f} ms  (min {row['min_ms']:.3f}, {row['runs']} runs)")
+        if ctx._kb_path:
+            os.unlink(ctx._kb_path)
+
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump({
+            "meta": {"commit": git_commit(), "python": platform.python_version(),
+                     "platform": platform.platform(), "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                     "seed": args.seed, "min_time": args.min_time},
+            "results": results,
+        }, fh, indent=1)
+    print(f"wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
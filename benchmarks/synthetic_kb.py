@@ -0,0 +1,165 @@
+"""Synthetic knowledge bases for benchmarking.
+
+Topics are spread over `depth` layers. Each topic outside the first layer
+has up to `branching` prerequisites drawn from the layer below, each kept
+with probability `density`. Prerequisites are mirrored as edge/3 arcs
+weighted by the target topic's duration. h/2 is the number of layers left,
+which is admissible for goals in the top layer because every arc climbs
+exactly one layer and weighs at least 1. The AND-OR curriculum is
+`andor_depth` levels deep with `andor_fanout` alternatives per node, and
+some subgoals are shared between branches.
+
+    python benchmarks/synthetic_kb.py --topics 10000 -o /tmp/kb10k.pl
+
+The written file carries the rules from learningpath.pl, so it can be
+consulted in place of it.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kb_loader import split_clauses  # noqa: E402
+from topic_graph import TopicGraph  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_PREDICATES = {"topic", "edge", "h", "goal_topics", "andor", "cost", "synonym"}
+DIFFICULTIES = ("beginner", "intermediate", "advanced")
+CATEGORIES = ("frontend", "backend", "tools", "design", "security", "data")
+
+
+class SyntheticKB:
+    def __init__(self, topics, edges, heuristics, goals, andor, costs, params):
+        self.topics = topics            # (name, prereqs, duration, difficulty, category, description)
+        self.edges = edges              # (from, to, weight)
+        self.heuristics = heuristics    # (name, h)
+        self.goals = goals              # (goal, [topics])
+        self.andor = andor              # (node, [[child, ...], ...])
+        self.costs = costs              # (leaf, cost)
+        self.params = params
+        self.layers = params["layers"]
+
+    def graph(self) -> TopicGraph:
+        return TopicGraph(self.topics, self.edges, self.heuristics, self.goals,
+                          version=f"synthetic-{self.params['topics']}-{self.params['seed']}")
+
+    def write(self, out, rules_from: str = os.path.join(ROOT, "learningpath.pl")):
+        """Write the facts, plus the rules of `rules_from` (pass None for facts only)."""
+        if rules_from:
+            out.write(f"% Rules from {os.path.basename(rules_from)}\n")
+            for clause in rules(rules_from):
+                out.write(clause + ".\n")
+        out.write("\n% Synthetic facts\n")
+        for name, prereqs, duration, difficulty, category, description in self.topics:
+            out.write(f"topic({name}, [{', '.join(prereqs)}], {duration}, {difficulty}, {category}, "
+                      f"'{description}').\n")
+        for a, b, w in self.edges:
+            out.write(f"edge({a}, {b}, {w}).\n")
+        for name, h in self.heuristics:
+            out.write(f"h({name}, {h}).\n")
+        for goal, topics in self.goals:
+            out.write(f"goal_topics({goal}, [{', '.join(topics)}]).\n")
+        for node, alts in self.andor:
+            out.write(f"andor({node}, [{', '.join('[' + ', '.join(a) + ']' for a in alts)}]).\n")
+        for leaf, c in self.costs:
+            out.write(f"cost({leaf}, {c}).\n")
+
+
+def rules(path: str):
+    """Clauses of a KB file other than the facts a synthetic KB replaces."""
+    with open(path, encoding="utf-8") as fh:
+        text = fh.read()
+    for clause in split_clauses(text):
+        m = re.match(r"([a-z]\w*)", clause)
+        if m and m.group(1) in DATA_PREDICATES and ":-" not in clause:
+            continue
+        yield clause
+
+
+def generate(topics: int = 1000, depth: int = 10, branching: int = 3, density: float = 0.6,
+             goals: int = 5, goal_size: int = 8, andor_depth: int = 4, andor_fanout: int = 3,
+             seed: int = 0) -> SyntheticKB:
+    rng = random.Random(seed)
+    depth = max(1, min(depth, topics))
+    layers = [[] for _ in range(depth)]
+    for i in range(topics):
+        layers[i * depth // topics].append(f"t{i}")
+    layer_of = {name: d for d, names in enumerate(layers) for name in names}
+
+    facts, edges, durations = [], [], {}
+    for d, names in enumerate(layers):
+        for name in names:
+            prereqs = []
+            if d:
+                below = layers[d - 1]
+                for _ in range(branching):
+                    if rng.random() < density:
+                        p = below[rng.randrange(len(below))]
+                        if p not in prereqs:
+                            prereqs.append(p)
+            duration = rng.randint(1, 12)
+            durations[name] = duration
+            facts.append((name, prereqs, duration, DIFFICULTIES[min(2, d * 3 // depth)],
+                          rng.choice(CATEGORIES), f"Synthetic topic {name}"))
+            edges.extend((p, name, duration) for p in prereqs)
+    heuristics = [(name, depth - 1 - layer_of[name]) for name in layer_of]
+
+    top = layers[-1]
+    goal_facts = [(f"goal{g}", rng.sample(top, min(goal_size, len(top)))) for g in range(goals)]
+
+    andor, costs = [], []
+    leaves = [name for name, *_ in facts]
+    levels = [["curriculum"]]
+    for level in range(andor_depth):
+        nxt, pool = [], []
+        for node in levels[-1]:
+            alts = []
+            for a in range(andor_fanout):
+                children = []
+                for c in range(rng.randint(2, 3)):
+                    if level == andor_depth - 1:
+                        children.append(rng.choice(leaves))
+                    elif pool and rng.random() < 0.2:
+                        children.append(rng.choice(pool))      # shared subgoal
+                    else:
+                        child = f"{node}_{a}_{c}"
+                        pool.append(child)
+                        nxt.append(child)
+                        children.append(child)
+                alts.append(children)
+            andor.append((node, alts))
+        levels.append(nxt)
+    used = {c for _, alts in andor for alt in alts for c in alt}
+    costs = [(leaf, durations[leaf]) for leaf in leaves if leaf in used]
+
+    params = dict(topics=topics, depth=depth, branching=branching, density=density, goals=goals,
+                  goal_size=goal_size, andor_depth=andor_depth, andor_fanout=andor_fanout, seed=seed,
+                  layers=[len(x) for x in layers])
+    return SyntheticKB(facts, edges, heuristics, goal_facts, andor, costs, params)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--topics", type=int, default=1000)
+    ap.add_argument("--depth", type=int, default=10)
+    ap.add_argument("--branching", type=int, default=3)
+    ap.add_argument("--density", type=float, default=0.6)
+    ap.add_argument("--andor-depth", type=int, default=4)
+    ap.add_argument("--andor-fanout", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--facts-only", action="store_true", help="omit the rules from learningpath.pl")
+    ap.add_argument("-o", "--output", required=True)
+    args = ap.parse_args()
+
+    kb = generate(args.topics, args.depth, args.branching, args.density,
+                  andor_depth=args.andor_depth, andor_fanout=args.andor_fanout, seed=args.seed)
+    with open(args.output, "w", encoding="utf-8") as out:
+        kb.write(out, rules_from=None if args.facts_only else os.path.join(ROOT, "learningpath.pl"))
+    print(f"wrote {args.output}: {len(kb.topics)} topics, {len(kb.edges)} edges, {len(kb.andor)} AND-OR nodes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Fit a learning path into an hour budget.
+
+Studying a goal topic means studying its whole unmet prerequisite closure, so
+choosing which goal topics to cover is a precedence-constrained knapsack:
+maximise the value of the goal topics covered while the union of their
+closures fits in the budget. `fit_budget` solves it by branch-and-bound over
+the goal topics. A greedy pass supplies the first answer, and the search only
+ever replaces it with something better, so hitting `time_limit` still returns
+the best plan found so far (with `optimal` False).
+"""
+import time
+
+from planner import plan_path, _closure_postorder
+from topic_graph import TopicGraph
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+class BudgetPlan:
+    __slots__ = ("topics", "hours", "budget", "value", "max_value", "covered", "missed",
+                 "optimal", "nodes", "elapsed_ms")
+
+    def as_dict(self, graph: TopicGraph) -> dict:
+        return {
+            "topics": [graph.names[t] for t in self.topics],
+            "hours": self.hours,
+            "budget": self.budget,
+            "value": self.value,
+            "max_value": self.max_value,
+            "covered": [graph.names[t] for t in self.covered],
+            "missed": [graph.names[t] for t in self.missed],
+            "optimal": self.optimal,
+            "nodes": self.nodes,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+        }
+
+
+def fit_budget(graph: TopicGraph, goal_ids, budget: int, known: int = 0, weights=None,
+               time_limit: float = 0.2, tie_break=()) -> BudgetPlan:
+    """Most valuable prerequisite-closed set of topics that fits in `budget` hours.
+
+    `weights` maps goal topic IDs to their value (1 each by default); ties in
+    value go to the plan needing fewer hours. The chosen topics come back in
+    plan_path order.
+    """
+    t0 = time.perf_counter()
+    deadline = t0 + time_limit
+    records = graph.records
+
+    def hours(mask):
+        return sum(records[t].duration for t in graph.bits(mask))
+
+    goals = [t for t in dict.fromkeys(goal_ids) if not known >> t & 1]
+    weight = {t: (weights or {}).get(t, 1) for t in goals}
+    need = {}
+    for t in goals:
+        m = 0
+        for p in _closure_postorder(graph, [t], known):
+            m |= 1 << p
+        need[t] = m
+
+    # Hours only this goal topic needs: a lower bound on what adding it costs
+    # whatever else is chosen, which keeps the fractional bound admissible.
+    exclusive = {}
+    for t in goals:
+        others = 0
+        for u in goals:
+            if u != t:
+                others |= need[u]
+        exclusive[t] = hours(need[t] & ~others)
+
+    order = sorted((t for t in goals if hours(need[t]) <= budget),
+                   key=lambda t: -weight[t] / exclusive[t] if exclusive[t] else float("-inf"))
+    goal_mask = 0
+    for t in goals:
+        goal_mask |= 1 << t
+
+    def gain(added):
+        return sum(weight[t] for t in graph.bits(added & goal_mask))
+
+    # Greedy incumbent: cheapest marginal hours per unit of value first
+    chosen, spent, value = 0, 0, 0
+    pending = list(order)
+    while pending:
+        best = None
+        for t in pending:
+            if chosen >> t & 1:
+                continue
+            extra = hours(need[t] & ~chosen)
+            if spent + extra <= budget:
+                ratio = gain(need[t] & ~chosen) / extra if extra else float("inf")
+                if best is None or ratio > best[0]:
+                    best = (ratio, t, extra)
+        if best is None:
+            break
+        _, t, extra = best
+        value += gain(need[t] & ~chosen)
+        chosen |= need[t]
+        spent += extra
+        pending.remove(t)
+    incumbent = [value, -spent, chosen, spent]
+    nodes = 0
+
+    def upper_bound(i, covered, forbidden, room):
+        ub = 0.0
+        for t in order[i:]:
+            if covered >> t & 1 or need[t] & forbidden:
+                continue
+            c = exclusive[t]
+            if c <= room:
+                ub += weight[t]
+                room -= c
+            else:
+                ub += weight[t] * room / c
+                break
+        return ub
+
+    def search(i, covered, spent, value, forbidden):
+        nonlocal nodes
+        nodes += 1
+        if (value, -spent) > (incumbent[0], incumbent[1]):
+            incumbent[:] = [value, -spent, covered, spent]
+        if i == len(order):
+            return
+        if nodes & 255 == 0 and time.perf_counter() > deadline:
+            raise _OutOfTime
+        ub = value + upper_bound(i, covered, forbidden, budget - spent)
+        if ub < incumbent[0] or (ub == incumbent[0] and spent >= -incumbent[1]):
+            return
+        t = order[i]
+        if covered >> t & 1 or need[t] & forbidden:
+            search(i + 1, covered, spent, value, forbidden)
+            return
+        added = need[t] & ~covered
+        extra = hours(added)
+        if spent + extra <= budget:
+            search(i + 1, covered | added, spent + extra, value + gain(added), forbidden)
+        search(i + 1, covered, spent, value, forbidden | 1 << t)
+
+    optimal = True
+    try:
+        search(0, 0, 0, 0, 0)
+    except _OutOfTime:
+        optimal = False
+
+    value, _, covered, spent = incumbent
+    plan = BudgetPlan()
+    plan.topics = plan_path(graph, [t for t in goals if covered >> t & 1], known, tie_break)
+    plan.hours = spent
+    plan.budget = budget
+    plan.value = value
+    plan.max_value = sum(weight.values())
+    plan.covered = [t for t in goals if covered >> t & 1]
+    plan.missed = [t for t in goals if not covered >> t & 1]
+    plan.optimal = optimal
+    plan.nodes = nodes
+    plan.elapsed_ms = (time.perf_counter() - t0) * 1000
+    return plan
@@ -0,0 +1,326 @@
+"""Chart rendering for /recommend.
+
+Charts are drawn with matplotlib's object-oriented Figure API (no pyplot
+global state, so rendering is thread-safe) into in-memory buffers. Each chart
+is described by a small JSON-able spec; the SHA-1 of that spec is the chart's
+address, so identical inputs are rendered once and served with long-lived
+cache headers. Rendered files are also written to a shared directory under
+that address, so any worker, including one started after a restart, can
+serve a URL a page has already handed out, even once the chart has left
+this process's memory. The spec is written there too when a render is
+queued, so a worker asked for a chart another worker is still drawing can
+draw it itself instead of answering 404.
+
+matplotlib is imported on first render, not at module import, so processes
+that never draw a chart never pay for it.
+"""
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from result_cache import ResultCache
+
+MIMETYPES = {'png': 'image/png', 'svg': 'image/svg+xml'}
+DIFFICULTY_COLORS = {'beginner': '#10b981', 'intermediate': '#f59e0b', 'advanced': '#ef4444'}
+TITLE_STYLE = dict(fontsize=14, fontweight='bold', color='#1f2937')
+LABEL_STYLE = dict(fontsize=12, color='#374151')
+
+
+def chart_specs(path_data, goal, path_stats, schedule=None) -> dict:
+    """Inputs for each chart on the result page, keyed by template role.
+
+    `schedule` is Schedule.as_dict(); with it the timeline is a Gantt chart of
+    the tracks, otherwise the topics run back to back on one track.
+    """
+    topics = [item['topic'] for item in path_data]
+    durations = [item['duration'] for item in path_data]
+    if schedule:
+        slots = [schedule['topics'][t] for t in topics]
+        starts, tracks = [s['start'] for s in slots], [s['track'] for s in slots]
+        hours_per_week = schedule['track_hours_per_week']
+    else:
+        starts = [sum(durations[:i]) for i in range(len(durations))]
+        tracks, hours_per_week = [1] * len(topics), None
+    return {
+        'path': {'kind': 'path', 'goal': goal, 'topics': topics, 'durations': durations},
+        'difficulty': {'kind': 'difficulty', 'goal': goal,
+                       'counts': dict(path_stats['difficulty_distribution'])},
+        'category': {'kind': 'category', 'goal': goal,
+                     'counts': dict(path_stats['category_distribution'])},
+        'timeline': {'kind': 'timeline', 'goal': goal, 'topics': topics, 'durations': durations,
+                     'starts': starts, 'tracks': tracks, 'hours_per_week': hours_per_week,
+                     'difficulties': [item['difficulty'] for item in path_data]},
+    }
+
+
+def spec_digest(spec: dict, fmt: str, dpi: int) -> str:
+    blob = json.dumps([spec, fmt, dpi], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
+# -- renderers -------------------------------------------------------------
+
+def _draw_path(fig, spec):
+    topics, durations = spec['topics'], spec['durations']
+    fig.set_size_inches(max(8, len(topics) * 1.2), 3)
+    ax = fig.add_subplot()
+    xs = list(range(1, len(topics) + 1))
+    ax.plot(xs, [1] * len(xs), 'o-', linewidth=3, markersize=8, color='#3b82f6')
+    for i, (topic, duration) in enumerate(zip(topics, durations), start=1):
+        ax.text(i, 1.05, topic, ha='center', va='bottom', fontsize=9,
+                bbox=dict(boxstyle="round,pad=0.3", facecolor='#1e40af', alpha=0.8))
+        ax.text(i, 0.95, f"{duration}h", ha='center', va='top', fontsize=8, color='#6b7280')
+    ax.set_title(f"Learning Path: {spec['goal']}", **TITLE_STYLE)
+    ax.set_yticks([])
+    ax.set_xticks([])
+    ax.grid(True, alpha=0.3)
+
+
+def _draw_difficulty(fig, spec):
+    fig.set_size_inches(8, 6)
+    ax = fig.add_subplot()
+    difficulties = list(spec['counts'])
+    counts = list(spec['counts'].values())
+    colors = ['#10b981', '#f59e0b', '#ef4444']
+    bars = ax.bar(difficulties, counts, color=colors[:len(difficulties)], alpha=0.8,
+                  edgecolor='white', linewidth=2)
+    ax.set_title(f"Difficulty Distribution for {spec['goal']}", **TITLE_STYLE)
+    ax.set_xlabel('Difficulty Level', **LABEL_STYLE)
+    ax.set_ylabel('Number of Topics', **LABEL_STYLE)
+    for bar, count in zip(bars, counts):
+        ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.1,
+                str(count), ha='center', va='bottom', fontweight='bold')
+    ax.grid(True, alpha=0.3)
+
+
+def _draw_category(fig, spec):
+    fig.set_size_inches(10, 6)
+    ax = fig.add_subplot()
+    categories = list(spec['counts'])
+    n = len(categories)
+    from matplotlib import colormaps
+    cmap = colormaps['Set3']
+    colors = [cmap(i / (n - 1) if n > 1 else 0.0) for i in range(n)]
+    ax.pie(list(spec['counts'].values()), labels=categories, autopct='%1.1f%%',
+           colors=colors, startangle=90, shadow=True)
+    ax.set_title(f"Category Distribution for {spec['goal']}", **TITLE_STYLE)
+    ax.axis('equal')
+
+
+def _draw_timeline(fig, spec):
+    fig.set_size_inches(12, max(4, len(spec['topics']) * 0.4))
+    ax = fig.add_subplot()
+    colors = [DIFFICULTY_COLORS.get(d, '#6b7280') for d in spec['difficulties']]
+    bars = ax.barh(spec['topics'], spec['durations'], left=spec['starts'], color=colors,
+                   alpha=0.8, edgecolor='white', linewidth=1)
+    ax.invert_yaxis()
+    ax.set_title(f"Study Schedule for {spec['goal']}", **TITLE_STYLE)
+    ax.set_xlabel('Study hours on each track', **LABEL_STYLE)
+    ax.set_ylabel('Topics', **LABEL_STYLE)
+    for bar, duration, track in zip(bars, spec['durations'], spec['tracks']):
+        ax.text(bar.get_x() + bar.get_width() + 0.2, bar.get_y() + bar.get_height() / 2,
+                f"{duration}h · track {track}", ha='left', va='center', fontweight='bold')
+    per_week = spec.get('hours_per_week')
+    if per_week:
+        end = max((s + d for s, d in zip(spec['starts'], spec['durations'])), default=0)
+        # One marker per week of track time (each track's share of the weekly hours)
+        week = 0
+        while week * per_week <= end:
+            x = week * per_week
+            ax.axvline(x, color='#9ca3af', linestyle='--', linewidth=0.8)
+            ax.text(x, -0.6, f"W{week + 1}", ha='left', va='bottom', fontsize=8, color='#6b7280')
+            week += 1
+    ax.grid(True, alpha=0.3, axis='x')
+
+
+def _draw_placeholder(fig, spec):
+    fig.set_size_inches(8, 4)
+    ax = fig.add_subplot()
+    ax.text(0.5, 0.5, "Visualization unavailable", ha='center', va='center',
+            transform=ax.transAxes)
+    ax.axis('off')
+
+
+RENDERERS = {
+    'path': _draw_path,
+    'difficulty': _draw_difficulty,
+    'category': _draw_category,
+    'timeline': _draw_timeline,
+    'placeholder': _draw_placeholder,
+}
+
+
+def warm_up():
+    """Import matplotlib and build its font cache by drawing a throwaway chart."""
+    render_chart({'kind': 'placeholder'}, "png", 30)
+
+
+def render_chart(spec: dict, fmt: str = "png", dpi: int = 150) -> bytes:
+    """Render one chart spec to image bytes. Module-level so a process pool can run it."""
+    from matplotlib.figure import Figure
+    fig = Figure(layout='tight')
+    try:
+        RENDERERS[spec['kind']](fig, spec)
+    except Exception:
+        fig = Figure(layout='tight')
+        _draw_placeholder(fig, spec)
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, dpi=dpi, bbox_inches='tight', facecolor='white')
+    return buf.getvalue()
+
+
+class ChartService:
+    """Renders chart specs on demand and keeps the results content-addressed.
+
+    `fast=True` drops to 72 dpi and `fmt="svg"` skips rasterising altogether;
+    `processes > 0` renders in a process pool instead of the calling thread.
+    `ensure(specs, wait=False)` only queues the renders, and `get` waits for a
+    chart that is still being drawn, so pages can be sent before their images.
+    With `directory` set, every render is also written there as
+    ``<digest>.<fmt>`` and `get` falls back to it; specs queued with
+    `wait=False` are written as ``<digest>.json`` so `get` can re-render
+    charts queued by another worker.
+    """
+
+    def __init__(self, fmt: str = "png", dpi: int = 150, fast: bool = False,
+                 processes: int = 0, max_bytes: int = 128 * 1024 * 1024, observer=None,
+                 directory: str = None):
+        if fast:
+            dpi = 72
+        self.fmt = fmt
+        self.dpi = dpi
+        self.directory = directory      # created by the first write to it
+        # observer(kind, seconds) per render; pooled renders include time spent queued
+        self.observer = observer
+        self.store = ResultCache(max_bytes=max_bytes, ttl=float("inf"))
+        self._pool = ProcessPoolExecutor(processes) if processes > 0 else None
+        self._background = None
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def _submit(self, digest, spec):
+        with self._lock:
+            fut = self._pending.get(digest)
+            if fut is not None:
+                return fut
+            if self._pool is None and self._background is None:
+                self._background = ThreadPoolExecutor(2, thread_name_prefix="charts")
+            fut = (self._pool or self._background).submit(render_chart, spec, self.fmt, self.dpi)
+            self._pending[digest] = fut
+
+        t0 = time.perf_counter()
+
+        def done(f):
+            if not f.cancelled() and f.exception() is None:
+                self._keep(digest, f.result())
+                self._observe(spec, t0)
+            with self._lock:
+                self._pending.pop(digest, None)
+
+        fut.add_done_callback(done)
+        return fut
+
+    def ensure(self, specs: dict, wait: bool = True) -> dict:
+        """Make sure every spec is rendered (or queued); returns role -> file name (digest.ext)."""
+        names, todo = {}, []
+        for role, spec in specs.items():
+            digest = spec_digest(spec, self.fmt, self.dpi)
+            names[role] = f"{digest}.{self.fmt}"
+            if self.store.get(digest) is None and not self._on_disk(names[role]):
+                todo.append((digest, spec))
+        if not wait:
+            for digest, spec in todo:
+                self._write(f"{digest}.json", json.dumps(spec).encode())
+                self._submit(digest, spec)
+        elif self._pool is not None and len(todo) > 1:
+            t0 = time.perf_counter()
+            futures = [(d, spec, self._pool.submit(render_chart, spec, self.fmt, self.dpi)) for d, spec in todo]
+            for digest, spec, fut in futures:
+                self._keep(digest, fut.result())
+                self._observe(spec, t0)
+        else:
+            for digest, spec in todo:
+                t0 = time.perf_counter()
+                self._keep(digest, render_chart(spec, self.fmt, self.dpi))
+                self._observe(spec, t0)
+        return names
+
+    def _keep(self, digest: str, data: bytes):
+        self.store.put(digest, data)
+        self._write(f"{digest}.{self.fmt}", data)
+
+    def _write(self, name: str, data: bytes):
+        if not self.directory:
+            return
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            # Write then rename, so another worker never reads a half-written file
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+
+    def _on_disk(self, name: str) -> bool:
+        return bool(self.directory) and os.path.exists(os.path.join(self.directory, name))
+
+    def _read(self, name: str):
+        if not self.directory:
+            return None
+        try:
+            with open(os.path.join(self.directory, name), "rb") as fh:
+                return fh.read()
+        except FileNotFoundError:
+            return None
+
+    def _queued_elsewhere(self, digest: str):
+        """Spec another worker queued for `digest`, if it renders to the same address here."""
+        blob = self._read(f"{digest}.json")
+        if blob is None:
+            return None
+        spec = json.loads(blob)
+        return spec if spec_digest(spec, self.fmt, self.dpi) == digest else None
+
+    def _observe(self, spec, t0):
+        if self.observer is not None:
+            self.observer(spec['kind'], time.perf_counter() - t0)
+
+    def get(self, name: str, timeout: float = None):
+        """(bytes, mimetype) for a chart file name, or None if unknown.
+
+        A chart still rendering is waited for (up to `timeout` seconds, which
+        raises TimeoutError). The extension must be the format the chart was
+        rendered in. Memory only holds this service's format; other names can
+        only come from the shared directory. A chart another worker queued but
+        has not written yet is rendered here from its spec.
+        """
+        digest, _, ext = name.partition(".")
+        if ext not in MIMETYPES or not digest.isalnum():
+            return None
+        if ext != self.fmt:
+            data = self._read(f"{digest}.{ext}")
+            return (data, MIMETYPES[ext]) if data is not None else None
+        data = self.store.get(digest)
+        if data is None:
+            with self._lock:
+                fut = self._pending.get(digest)
+            if fut is None:
+                # It may have finished between the two lookups, or been drawn by another worker
+                data = self.store.get(digest)
+                if data is None:
+                    data = self._read(f"{digest}.{ext}")
+                    if data is None:
+                        spec = self._queued_elsewhere(digest)
+                        if spec is None:
+                            return None
+                        data = self._submit(digest, spec).result(timeout)
+                    else:
+                        self.store.put(digest, data)
+            else:
+                data = fut.result(timeout)
+        return data, MIMETYPES[ext]
@@ -0,0 +1,133 @@
+"""Reads ground facts out of a Prolog source file without starting SWI-Prolog.
+
+Only the subset of syntax the knowledge base uses for data is understood:
+atoms, quoted atoms, numbers and lists, nested in compound terms. Rules,
+directives and anything unparsable are skipped, mirroring how consult/1
+carries on past a bad clause.
+"""
+import re
+
+_TOKEN = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<quoted>'(?:[^'\\]|\\.|'')*')
+  | (?P<number>-?\d+(?:\.\d+)?)
+  | (?P<name>[a-z][A-Za-z0-9_]*)
+  | (?P<var>[A-Z_][A-Za-z0-9_]*)
+  | (?P<punct>[()\[\],|])
+  | (?P<other>.)
+""", re.VERBOSE | re.DOTALL)
+
+
+# Clause splitting works on runs of text rather than single characters; only
+# quotes, comments and full stops matter to it.
+_CHUNK = re.compile(r"""
+    (?P<quoted>'(?:[^'\\]|\\.)*'?|"(?:[^"\\]|\\.)*"?)
+  | (?P<comment>%[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<end>\.(?=\s|%|\Z))
+  | (?P<text>[^'"%/.]+|[/.])
+""", re.VERBOSE | re.DOTALL)
+
+
+class ParseError(ValueError):
+    pass
+
+
+def split_clauses(text: str):
+    """Yield clause texts (without the terminating full stop)."""
+    buf = []
+    for m in _CHUNK.finditer(text):
+        kind = m.lastgroup
+        if kind == "end":
+            clause = "".join(buf).strip()
+            if clause:
+                yield clause
+            buf = []
+        elif kind != "comment":
+            buf.append(m.group())
+    tail = "".join(buf).strip()
+    if tail:
+        yield tail
+
+
+def _tokens(text: str):
+    for m in _TOKEN.finditer(text):
+        kind = m.lastgroup
+        if kind != "ws":
+            yield kind, m.group()
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.toks = list(_tokens(text))
+        self.pos = 0
+
+    def peek(self):
+        return self.toks[self.pos] if self.pos < len(self.toks) else (None, None)
+
+    def take(self, value=None):
+        kind, tok = self.peek()
+        if kind is None or (value is not None and tok != value):
+            raise ParseError(f"expected {value or 'term'}, got {tok!r}")
+        self.pos += 1
+        return kind, tok
+
+    def term(self):
+        kind, tok = self.take()
+        if kind == "number":
+            return float(tok) if "." in tok else int(tok)
+        if kind == "quoted":
+            return tok[1:-1].replace("''", "'").replace("\\'", "'")
+        if kind == "punct" and tok == "[":
+            return self.list_tail()
+        if kind == "name":
+            if self.peek() == ("punct", "("):
+                self.take("(")
+                args = [self.term()]
+                while self.peek() == ("punct", ","):
+                    self.take(",")
+                    args.append(self.term())
+                self.take(")")
+                return (tok, tuple(args))
+            return tok
+        raise ParseError(f"unexpected {tok!r}")
+
+    def list_tail(self):
+        items = []
+        if self.peek() == ("punct", "]"):
+            self.take("]")
+            return items
+        items.append(self.term())
+        while self.peek() == ("punct", ","):
+            self.take(",")
+            items.append(self.term())
+        self.take("]")
+        return items
+
+
+def parse_fact(clause: str):
+    """Parse a ground fact into ``(name, args)``; raises ParseError otherwise."""
+    p = _Parser(clause)
+    t = p.term()
+    if p.pos != len(p.toks):
+        raise ParseError(f"trailing input in {clause!r}")
+    if isinstance(t, str):
+        return t, ()
+    if not isinstance(t, tuple):
+        raise ParseError(f"not a fact: {clause!r}")
+    return t
+
+
+def read_facts(text: str, wanted: dict) -> dict:
+    """Collect facts whose name/arity is in `wanted` (name -> arity)."""
+    out = {name: [] for name in wanted}
+    for clause in split_clauses(text):
+        head = clause.split("(", 1)[0].strip()
+        if head not in wanted or ":-" in clause:
+            continue
+        try:
+            name, args = parse_fact(clause)
+        except ParseError:
+            continue
+        if len(args) == wanted[name]:
+            out[name].append(args)
+    return out
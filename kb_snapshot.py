@@ -0,0 +1,437 @@
+"""Catalogue importer and binary knowledge-base snapshots.
+
+Large catalogues come from the CMS as CSV or JSONL. `KBBuilder` consumes them
+record by record (only interned IDs and flat int arrays are kept), validates
+the result and writes a snapshot: a small section table followed by int32
+arrays and two string tables. `load_graph` memory-maps a snapshot read-only,
+so worker processes share its pages, and wraps the arrays in a TopicGraph
+without parsing anything; strings and masks are decoded on first use.
+
+    python kb_snapshot.py import topics.csv --edges edges.csv -o kb.snap
+    python kb_snapshot.py import catalog.jsonl -o kb.snap --prolog catalog.pl
+    python kb_snapshot.py from-prolog learningpath.pl -o kb.snap
+
+CSV topics have the columns name, prereqs (separated by ';'), duration,
+difficulty, category, description; CSV edges have from, to, weight. JSONL
+lines carry a "type" of topic, edge, h or goal.
+
+A snapshot made from Prolog (from-prolog, or import with --prolog) records
+the SHA-1 of that .pl file. KBRegistry only pairs a snapshot with the exact
+source it was made from, since Prolog, andor/2 and synonym/2 still come from
+the .pl.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import mmap
+import struct
+import sys
+from array import array
+from functools import cached_property
+
+from topic_graph import TopicGraph, TopicRecord, KB_FACTS
+
+MAGIC = b"LPKB"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sII")           # magic, format version, section count
+_SECTION = struct.Struct("<16sQQc7x")      # name, offset, byte length, typecode
+
+
+class ValidationError(ValueError):
+    """The catalogue is inconsistent; `problems` lists every issue found."""
+
+    def __init__(self, problems):
+        self.problems = problems
+        super().__init__(f"{len(problems)} problem(s): " + "; ".join(problems[:5]))
+
+
+class _StringTable:
+    def __init__(self):
+        self.index = {}
+        self.items = []
+
+    def intern(self, s) -> int:
+        s = str(s)
+        i = self.index.get(s)
+        if i is None:
+            i = self.index[s] = len(self.items)
+            self.items.append(s)
+        return i
+
+    def pack(self, order=None):
+        items = self.items if order is None else [self.items[i] for i in order]
+        offsets = array('i', [0])
+        blob = bytearray()
+        for s in items:
+            blob += s.encode("utf-8")
+            offsets.append(len(blob))
+        return offsets, bytes(blob)
+
+
+def _csr(n: int, rows: array, targets: array):
+    counts = array('i', bytes(4 * (n + 1)))
+    for r in rows:
+        counts[r + 1] += 1
+    for i in range(n):
+        counts[i + 1] += counts[i]
+    out = array('i', bytes(4 * len(rows)))
+    fill = array('i', counts[:n])
+    for r, t in zip(rows, targets):
+        out[fill[r]] = t
+        fill[r] += 1
+    return counts, out
+
+
+class KBBuilder:
+    """Accumulates catalogue records in flat arrays and turns them into snapshot sections."""
+
+    def __init__(self):
+        self.nodes = _StringTable()
+        self.text = _StringTable()
+        self.topic_nodes = array('i')      # node id per topic, in definition order
+        self.fields = {k: array('i') for k in ("duration", "difficulty", "category", "description")}
+        self.pre_rows, self.pre_to = array('i'), array('i')
+        self.edge_from, self.edge_to, self.edge_w = array('i'), array('i'), array('i')
+        self.heur = {}
+        self.goals = []                    # (text id, [node ids])
+        self.problems = []
+        self.source_digest = None          # SHA-1 hex of the .pl file these records match
+        self._defined = set()
+
+    # -- input -------------------------------------------------------------
+
+    def add_topic(self, name, prereqs, duration, difficulty, category, description):
+        nid = self.nodes.intern(name)
+        if nid in self._defined:
+            self.problems.append(f"duplicate topic {name}")
+            return
+        self._defined.add(nid)
+        row = len(self.topic_nodes)
+        self.topic_nodes.append(nid)
+        try:
+            self.fields["duration"].append(int(duration))
+        except (TypeError, ValueError):
+            self.problems.append(f"topic {name}: bad duration {duration!r}")
+            self.fields["duration"].append(0)
+        self.fields["difficulty"].append(self.text.intern(difficulty))
+        self.fields["category"].append(self.text.intern(category))
+        self.fields["description"].append(self.text.intern(description))
+        for p in prereqs:
+            self.pre_rows.append(row)
+            self.pre_to.append(self.nodes.intern(p))
+
+    def add_edge(self, a, b, weight):
+        self.edge_from.append(self.nodes.intern(a))
+        self.edge_to.append(self.nodes.intern(b))
+        self.edge_w.append(int(weight))
+
+    def add_heuristic(self, node, value):
+        self.heur[self.nodes.intern(node)] = int(value)
+
+    def add_goal(self, name, topics):
+        self.goals.append((self.text.intern(name), [self.nodes.intern(t) for t in topics]))
+
+    def add_records(self, records):
+        """Feed (kind, fields) pairs from one of the readers below."""
+        for kind, rec in records:
+            if kind == "topic":
+                self.add_topic(*rec)
+            elif kind == "edge":
+                self.add_edge(*rec)
+            elif kind == "h":
+                self.add_heuristic(*rec)
+            elif kind == "goal":
+                self.add_goal(*rec)
+        return self
+
+    # -- output ------------------------------------------------------------
+
+    def sections(self) -> dict:
+        """Validate and renumber (topics first, as TopicGraph expects); raises ValidationError."""
+        n_topics = len(self.topic_nodes)
+        n = len(self.nodes.items)
+        order = list(self.topic_nodes) + [i for i in range(n) if i not in self._defined]
+        final = array('i', bytes(4 * n))
+        for new, old in enumerate(order):
+            final[old] = new
+
+        problems = list(self.problems)
+        for row, p in zip(self.pre_rows, self.pre_to):
+            if p not in self._defined:
+                problems.append(f"{self.nodes.items[self.topic_nodes[row]]} requires unknown topic {self.nodes.items[p]}")
+        for gname, members in self.goals:
+            for t in members:
+                if t not in self._defined:
+                    problems.append(f"goal {self.text.items[gname]} lists unknown topic {self.nodes.items[t]}")
+
+        pre_off, pre_idx = _csr(n, self.pre_rows, array('i', (final[p] for p in self.pre_to)))
+        dep_off, dep_idx = _csr(n, array('i', (final[p] for p in self.pre_to)), self.pre_rows)
+
+        # Kahn's algorithm over prerequisites to reject cycles
+        indeg = array('i', (pre_off[i + 1] - pre_off[i] for i in range(n)))
+        queue = [i for i in range(n) if indeg[i] == 0]
+        for v in queue:
+            for j in range(dep_off[v], dep_off[v + 1]):
+                d = dep_idx[j]
+                indeg[d] -= 1
+                if indeg[d] == 0:
+                    queue.append(d)
+        if len(queue) < n:
+            on_cycle = [self.nodes.items[order[i]] for i in range(n) if indeg[i] > 0]
+            problems.append("prerequisite cycle involving " + ", ".join(on_cycle[:20]))
+        if problems:
+            raise ValidationError(problems)
+
+        adj_off, adj_to = _csr(n, array('i', (final[a] for a in self.edge_from)),
+                               array('i', (final[b] for b in self.edge_to)))
+        _, adj_w = _csr(n, array('i', (final[a] for a in self.edge_from)), self.edge_w)
+        heur = array('i', bytes(4 * n))
+        for node, value in self.heur.items():
+            heur[final[node]] = value
+        goal_name, goal_off, goal_idx = array('i'), array('i', [0]), array('i')
+        for gname, members in self.goals:
+            goal_name.append(gname)
+            goal_idx.extend(final[t] for t in members)
+            goal_off.append(len(goal_idx))
+
+        name_off, name_blob = self.nodes.pack(order)
+        text_off, text_blob = self.text.pack()
+        extra = {"source_sha1": self.source_digest.encode()} if self.source_digest else {}
+        return {
+            "meta": array('i', [n, n_topics]),
+            "name_off": name_off, "name_blob": name_blob,
+            "text_off": text_off, "text_blob": text_blob,
+            "t_duration": self.fields["duration"], "t_difficulty": self.fields["difficulty"],
+            "t_category": self.fields["category"], "t_description": self.fields["description"],
+            "pre_off": pre_off, "pre_idx": pre_idx, "dep_off": dep_off, "dep_idx": dep_idx,
+            "adj_off": adj_off, "adj_to": adj_to, "adj_w": adj_w, "heur": heur,
+            "goal_name": goal_name, "goal_off": goal_off, "goal_idx": goal_idx,
+            **extra,
+        }
+
+    def write(self, path: str):
+        write_snapshot(path, self.sections())
+
+
+def write_snapshot(path: str, sections: dict):
+    names = list(sections)
+    table_size = _HEADER.size + _SECTION.size * len(names)
+    offset = (table_size + 7) & ~7
+    entries, payloads = [], []
+    for name in names:
+        data = sections[name]
+        raw = data.tobytes() if isinstance(data, array) else bytes(data)
+        code = data.typecode.encode() if isinstance(data, array) else b"B"
+        entries.append(_SECTION.pack(name.encode(), offset, len(raw), code))
+        payloads.append((offset, raw))
+        offset = (offset + len(raw) + 7) & ~7
+    with open(path, "wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(names)))
+        for e in entries:
+            fh.write(e)
+        for off, raw in payloads:
+            fh.seek(off)
+            fh.write(raw)
+        fh.truncate(offset)
+
+
+def open_snapshot(path: str) -> dict:
+    """Memory-map a snapshot; returns section name -> read-only memoryview."""
+    if sys.byteorder != "little":
+        raise ValueError("snapshots are little-endian")
+    with open(path, "rb") as fh:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, count = _HEADER.unpack_from(mm, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a version {FORMAT_VERSION} knowledge-base snapshot")
+    view = memoryview(mm)
+    out = {"_digest": hashlib.sha1(view).hexdigest()[:12]}
+    for i in range(count):
+        name, off, length, code = _SECTION.unpack_from(mm, _HEADER.size + i * _SECTION.size)
+        section = view[off:off + length]
+        out[name.rstrip(b"\0").decode()] = section if code == b"B" else section.cast(code.decode())
+    return out
+
+
+def _string(offsets, blob, i: int) -> str:
+    return bytes(blob[offsets[i]:offsets[i + 1]]).decode("utf-8")
+
+
+def _strings(offsets, blob) -> list:
+    raw = bytes(blob)
+    return [raw[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+
+class SnapshotGraph(TopicGraph):
+    """TopicGraph over a memory-mapped snapshot.
+
+    The CSR arrays are the mapped sections themselves. Names, topic records
+    and prerequisite masks are only built the first time something reads
+    them. Opening a snapshot therefore costs the same whatever the catalogue
+    size, and the closure and group indexes stay lazy as usual.
+    """
+
+    def __init__(self, sections: dict):
+        s = self._sections = sections
+        self.version = s["_digest"]
+        self.n, self.n_topics = s["meta"][0], s["meta"][1]
+        for key in ("pre_off", "pre_idx", "dep_off", "dep_idx", "adj_off", "adj_to", "adj_w", "heur"):
+            setattr(self, key, s[key])
+        goff, gidx = s["goal_off"], s["goal_idx"]
+        text = s["text_off"], s["text_blob"]
+        self.goals = {_string(*text, gname): gidx[goff[i]:goff[i + 1]] for i, gname in enumerate(s["goal_name"])}
+        self.topic_mask = (1 << self.n_topics) - 1
+        # SHA-1 hex of the .pl file the snapshot was made from, if any
+        self.source_digest = bytes(s["source_sha1"]).decode() if "source_sha1" in s else None
+
+    @cached_property
+    def names(self) -> list:
+        return _strings(self._sections["name_off"], self._sections["name_blob"])
+
+    @cached_property
+    def index(self) -> dict:
+        return {name: i for i, name in enumerate(self.names)}
+
+    @cached_property
+    def records(self) -> list:
+        s = self._sections
+        text = _strings(s["text_off"], s["text_blob"])
+        names = self.names
+        dur, diff, cat, desc = s["t_duration"], s["t_difficulty"], s["t_category"], s["t_description"]
+        return [TopicRecord(t, names[t], dur[t], text[diff[t]], text[cat[t]], text[desc[t]])
+                for t in range(self.n_topics)]
+
+    @cached_property
+    def prereq_mask(self) -> list:
+        pre_off, pre_idx = self.pre_off, self.pre_idx
+        masks = [0] * self.n
+        for t in range(self.n):
+            m = 0
+            for j in range(pre_off[t], pre_off[t + 1]):
+                m |= 1 << pre_idx[j]
+            masks[t] = m
+        return masks
+
+
+def load_graph(path: str) -> TopicGraph:
+    """TopicGraph backed by a memory-mapped snapshot; nothing is decoded until it is used."""
+    return SnapshotGraph(open_snapshot(path))
+
+
+# -- readers -----------------------------------------------------------------
+
+def read_csv_topics(path: str):
+    with open(path, newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            prereqs = [p.strip() for p in (row.get("prereqs") or "").split(";") if p.strip()]
+            yield "topic", (row["name"].strip(), prereqs, row.get("duration") or 0,
+                            row.get("difficulty", ""), row.get("category", ""), row.get("description", ""))
+
+
+def read_csv_edges(path: str):
+    with open(path, newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            yield "edge", (row["from"].strip(), row["to"].strip(), row.get("weight") or 1)
+
+
+def read_jsonl(path: str):
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            r = json.loads(line)
+            kind = r.get("type", "topic")
+            if kind == "topic":
+                yield kind, (r["name"], r.get("prereqs", []), r.get("duration", 0),
+                             r.get("difficulty", ""), r.get("category", ""), r.get("description", ""))
+            elif kind == "edge":
+                yield kind, (r["from"], r["to"], r.get("weight", 1))
+            elif kind == "h":
+                yield kind, (r["node"], r["h"])
+            elif kind == "goal":
+                yield kind, (r["name"], r.get("topics", []))
+
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as fh:
+        return hashlib.sha1(fh.read()).hexdigest()
+
+
+def read_prolog(path: str):
+    from kb_loader import read_facts
+    with open(path, encoding="utf-8") as fh:
+        facts = read_facts(fh.read(), KB_FACTS)
+    kinds = {"topic": "topic", "edge": "edge", "h": "h", "goal_topics": "goal"}
+    for fact, kind in kinds.items():
+        for args in facts[fact]:
+            yield kind, args
+
+
+def _atom(s) -> str:
+    s = str(s)
+    if s and s[0].islower() and s.replace("_", "").isalnum() and s.isascii():
+        return s
+    return "'" + s.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def prolog_writer(records, out):
+    """Pass records through while echoing them as Prolog facts to `out` (for qcompile/1)."""
+    for kind, rec in records:
+        if kind == "topic":
+            name, prereqs, duration, difficulty, category, description = rec
+            out.write(f"topic({_atom(name)}, [{', '.join(map(_atom, prereqs))}], {int(duration)}, "
+                      f"{_atom(difficulty)}, {_atom(category)}, {_atom(description)}).\n")
+        elif kind == "edge":
+            out.write(f"edge({_atom(rec[0])}, {_atom(rec[1])}, {int(rec[2])}).\n")
+        elif kind == "h":
+            out.write(f"h({_atom(rec[0])}, {int(rec[1])}).\n")
+        elif kind == "goal":
+            out.write(f"goal_topics({_atom(rec[0])}, [{', '.join(map(_atom, rec[1]))}]).\n")
+        yield kind, rec
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    imp = sub.add_parser("import", help="CSV or JSONL catalogue -> snapshot")
+    imp.add_argument("source")
+    imp.add_argument("--edges", help="CSV of from,to,weight")
+    imp.add_argument("--prolog", help="also write the catalogue as Prolog facts")
+    imp.add_argument("-o", "--output", required=True)
+    frm = sub.add_parser("from-prolog", help="learningpath.pl -> snapshot")
+    frm.add_argument("source")
+    frm.add_argument("-o", "--output", required=True)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "from-prolog":
+        streams = [read_prolog(args.source)]
+    else:
+        streams = [read_jsonl(args.source) if args.source.endswith(".jsonl") else read_csv_topics(args.source)]
+        if args.edges:
+            streams.append(read_csv_edges(args.edges))
+
+    builder = KBBuilder()
+    pl = open(args.prolog, "w", encoding="utf-8") if getattr(args, "prolog", None) else None
+    try:
+        for stream in streams:
+            builder.add_records(prolog_writer(stream, pl) if pl else stream)
+    finally:
+        if pl:
+            pl.close()
+    if args.cmd == "from-prolog":
+        builder.source_digest = file_digest(args.source)
+    elif pl:
+        builder.source_digest = file_digest(args.prolog)
+    try:
+        builder.write(args.output)
+    except ValidationError as e:
+        for problem in e.problems:
+            print(f"error: {problem}", file=sys.stderr)
+        return 1
+    print(f"wrote {args.output}: {len(builder.topic_nodes)} topics, {len(builder.edge_to)} edges")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+"""Versioned, hot-reloadable knowledge base.
+
+Each version is built from one read of learningpath.pl. The bytes are
+hashed, frozen into a file of their own and validated, and the TopicGraph
+indexes and closures are precomputed (with a snapshot they are built on first
+use instead, so startup does not grow with the catalogue). Only then is the version swapped in
+with a single reference assignment. A request acquires the current version
+once and uses it to the end, so requests already running finish on the old
+version. The old version is unloaded when its last request releases it.
+
+In Prolog every version is consulted into its own module (``kb_<hash>``),
+so two versions can be loaded while the old one drains.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from functools import cached_property
+
+from aostar import AndOrGraph, AOStar
+from batch import BatchRecommender
+from kb_loader import read_facts
+from kb_snapshot import load_graph
+from landmarks import LandmarkIndex
+from prereq_matrix import PrereqMatrix
+from skill_index import SkillIndex
+from topic_graph import TopicGraph
+
+log = logging.getLogger(__name__)
+
+
+class KBValidationError(ValueError):
+    """A changed knowledge base was rejected; the previous version stays current."""
+
+
+def _complete(text: str) -> bool:
+    """True if the source ends with a finished clause (not cut off mid-write)."""
+    lines = text.rstrip().splitlines()
+    while lines and (not lines[-1].strip() or lines[-1].lstrip().startswith("%")):
+        lines.pop()
+    return bool(lines) and lines[-1].rstrip().endswith(".")
+
+
+class KBVersion:
+    """One immutable build of the knowledge base and everything derived from it."""
+
+    def __init__(self, version: str, source: str, graph: TopicGraph, andor: AndOrGraph,
+                 skills: SkillIndex = None, pool=None, synonyms=()):
+        self.version = version
+        self.source = source            # frozen copy that Prolog consults
+        self.module = f"kb_{version}"
+        self.graph = graph
+        self.andor = andor
+        if skills is not None:
+            self.skills = skills
+        self._synonyms = synonyms
+        # AO* memoises solved subgoals, which are only valid for this version
+        self.ao_engine = AOStar(andor)
+        self.created = time.time()
+        self.retired = False
+        self._pool = pool
+        self._refs = 0
+        if pool is not None:
+            pool.add_source(self.module, source)
+
+    @cached_property
+    def skills(self) -> SkillIndex:
+        return SkillIndex(self.graph, self._synonyms)
+
+    @cached_property
+    def batch(self) -> BatchRecommender:
+        return BatchRecommender(self.graph, self.skills)
+
+    @cached_property
+    def prereq_matrix(self) -> PrereqMatrix:
+        return PrereqMatrix(self.graph)
+
+    @cached_property
+    def landmarks(self) -> LandmarkIndex:
+        return LandmarkIndex(self.graph)
+
+    def load_prolog(self):
+        """Consult this version into its Prolog module (once)."""
+        self._pool.ensure_loaded(self.module)
+
+    def dispose(self):
+        if self._pool is not None:
+            try:
+                self._pool.drop_source(self.module)
+            except Exception:
+                log.exception("Unloading KB version %s failed", self.version)
+        for path in (self.source, os.path.splitext(self.source)[0] + ".qlf"):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        log.info("KB version %s unloaded", self.version)
+
+
+class KBRegistry:
+    """Holds the current KBVersion and swaps in new ones as the source changes.
+
+    `snapshot`, if given, is a kb_snapshot file the graph is loaded from
+    instead of parsing the source; it is watched as well, and must have
+    been made from the current source (see kb_snapshot). Its closures,
+    landmarks and skill index are left to first use. `preload(version)`
+    runs on each new version before it goes live (e.g. to consult it on the
+    Prolog thread); by default versions are consulted on first use.
+    `listeners` are called as ``fn(old, new)`` after every swap.
+    `store_dir` holds the frozen source of each version; without one, a
+    temporary directory is used and removed along with the registry.
+    """
+
+    def __init__(self, path: str, pool=None, snapshot: str = None, store_dir: str = None, preload=None):
+        self.path = path
+        self.pool = pool
+        self.snapshot = snapshot
+        if store_dir:
+            os.makedirs(store_dir, exist_ok=True)
+            self.store_dir = store_dir
+        else:
+            self.store_dir = tempfile.mkdtemp(prefix="kb-versions-")
+            weakref.finalize(self, shutil.rmtree, self.store_dir, ignore_errors=True)
+        self.preload = preload
+        self.listeners = []
+        self.reloads = self.rejections = 0
+        self.last_error = None
+        self._current = None
+        self._lock = threading.Lock()           # guards _current and reference counts
+        self._reload_lock = threading.Lock()    # one build at a time
+        self._signature = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.reload()
+
+    @property
+    def current(self) -> KBVersion:
+        return self._current
+
+    # -- per-request snapshots ---------------------------------------------
+
+    def acquire(self) -> KBVersion:
+        """The current version, kept loaded until the matching release()."""
+        with self._lock:
+            v = self._current
+            v._refs += 1
+            return v
+
+    def release(self, v: KBVersion):
+        with self._lock:
+            v._refs -= 1
+            drained = v.retired and v._refs == 0
+        if drained:
+            v.dispose()
+
+    # -- building ----------------------------------------------------------
+
+    def _stat(self) -> tuple:
+        sig = []
+        for path in (self.path, self.snapshot):
+            if path:
+                st = os.stat(path)
+                sig.append((st.st_mtime_ns, st.st_size))
+        return tuple(sig)
+
+    def fingerprint(self, raw: bytes) -> str:
+        """Version id: hash of the source bytes (and of the snapshot, if one is used)."""
+        digest = hashlib.sha1(raw)
+        if self.snapshot:
+            with open(self.snapshot, "rb") as fh:
+                digest.update(fh.read())
+        return digest.hexdigest()[:12]
+
+    def build(self, raw: bytes, version: str) -> KBVersion:
+        """Validate `raw` source and build a version from it; raises KBValidationError."""
+        try:
+            text = raw.decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise KBValidationError(f"not UTF-8: {e}") from None
+        if not _complete(text):
+            raise KBValidationError("source ends mid-clause (still being written?)")
+
+        stem = os.path.splitext(os.path.basename(self.path))[0]
+        source = os.path.join(self.store_dir, f"{stem}-{version}.pl")
+        with open(source, "wb") as fh:
+            fh.write(raw)
+        try:
+            graph = load_graph(self.snapshot) if self.snapshot else TopicGraph.from_file(source)
+            if self.snapshot and graph.source_digest != hashlib.sha1(raw).hexdigest():
+                # Prolog, andor/2 and synonym/2 would come from a different catalogue than the graph
+                raise KBValidationError(
+                    f"snapshot {self.snapshot} was not made from this {os.path.basename(self.path)}; "
+                    "rebuild it with kb_snapshot.py from-prolog (or import --prolog)")
+            if not graph.n_topics:
+                raise KBValidationError("no topic/6 facts")
+            if not self.snapshot:
+                graph.warm()
+            facts = read_facts(text, {"andor": 2, "cost": 2, "synonym": 2})
+            andor = AndOrGraph(facts["andor"], facts["cost"])
+            synonyms = facts["synonym"]
+            for _, topic in synonyms:
+                tid = graph.index.get(str(topic))
+                if tid is None or tid >= graph.n_topics:
+                    raise KeyError(f"synonym refers to unknown topic {topic!r}")
+        except Exception as e:
+            os.unlink(source)
+            if isinstance(e, KBValidationError):
+                raise
+            # Goal or synonym naming an unknown topic, AND-OR cycle, unreadable snapshot, ...
+            raise KBValidationError(f"{type(e).__name__}: {e}") from e
+        new = KBVersion(version, source, graph, andor, pool=self.pool, synonyms=synonyms)
+        if not self.snapshot:
+            # Built before the version goes live. A snapshot is meant to start in
+            # time independent of catalogue size, so there they wait for first use.
+            new.skills
+            new.landmarks   # A* heuristics for /astar
+        return new
+
+    def reload(self) -> bool:
+        """Build from the files on disk and swap the result in; False if nothing changed."""
+        with self._reload_lock:
+            signature = self._stat()
+            with open(self.path, "rb") as fh:
+                raw = fh.read()
+            version = self.fingerprint(raw)
+            old = self._current
+            if old is not None and version == old.version:
+                self._signature = signature
+                return False
+            try:
+                new = self.build(raw, version)
+                if self.preload is not None:
+                    try:
+                        self.preload(new)
+                    except Exception as e:
+                        new.dispose()
+                        raise KBValidationError(f"preload failed: {type(e).__name__}: {e}") from e
+            except KBValidationError as e:
+                # Remember the signature so a bad file is not retried until it changes again
+                self._signature = signature
+                self.rejections += 1
+                self.last_error = str(e)
+                raise
+
+            with self._lock:
+                self._current = new
+                if old is not None:
+                    old.retired = True
+                drained = old is not None and old._refs == 0
+            self._signature = signature
+            self.reloads += 1
+            self.last_error = None
+        log.info("KB version %s live (%d topics)", new.version, new.graph.n_topics)
+        for fn in self.listeners:
+            fn(old, new)
+        if drained:
+            old.dispose()
+        return True
+
+    # -- watching ----------------------------------------------------------
+
+    def watch(self, interval: float = 2.0, settle: float = 0.5):
+        """Poll for changes on a daemon thread.
+
+        A change is only picked up once the files have kept the same mtime
+        and size for `settle` seconds, so an editor's partial writes are
+        skipped rather than rejected.
+        """
+        def run():
+            pending, since = None, 0.0
+            while not self._stop.wait(interval if pending is None else settle):
+                try:
+                    sig = self._stat()
+                except OSError:
+                    continue        # mid-rename; try again next tick
+                if sig == self._signature:
+                    pending = None
+                    continue
+                if sig != pending:
+                    pending, since = sig, time.monotonic()
+                    continue
+                if time.monotonic() - since < settle:
+                    continue
+                pending = None
+                try:
+                    self.reload()
+                except KBValidationError as e:
+                    log.warning("Rejected change to %s: %s", self.path, e)
+                except Exception:
+                    log.exception("Reloading %s failed", self.path)
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=run, name="kb-watch", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
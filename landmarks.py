@@ -0,0 +1,119 @@
+"""Landmark (ALT) lower bounds for A* over the edge/3 graph.
+
+A few landmark nodes are chosen far apart from each other. Exact
+shortest-path distances from and to every landmark are stored. By the
+triangle inequality, for any landmark L:
+
+    d(v, t) >= d(L, t) - d(L, v)      and      d(v, t) >= d(v, L) - d(t, L)
+
+The largest of these bounds is a consistent heuristic for any goal `t`, and
+needs no hand-maintained h/2 entries. If `t` reaches a landmark that `v`
+cannot reach, then `v` cannot reach `t` either, and the heuristic returns
+infinity so A* drops `v` at once.
+"""
+import heapq
+from array import array
+from collections import deque
+
+from topic_graph import TopicGraph, _csr
+
+INF = float("inf")
+DEFAULT_LANDMARKS = 8
+
+
+def _dijkstra(off, to, w, source: int, n: int) -> array:
+    dist = array('d', [INF]) * n
+    dist[source] = 0.0
+    heap = [(0, source)]
+    while heap:
+        d, v = heapq.heappop(heap)
+        if d > dist[v]:
+            continue
+        for j in range(off[v], off[v + 1]):
+            u = to[j]
+            nd = d + w[j]
+            if nd < dist[u]:
+                dist[u] = nd
+                heapq.heappush(heap, (nd, u))
+    return dist
+
+
+class LandmarkIndex:
+    """Distances from and to `count` landmarks; build once per KB version."""
+
+    def __init__(self, graph: TopicGraph, count: int = DEFAULT_LANDMARKS):
+        self.graph = graph
+        n = graph.n
+        edges = [(a, graph.adj_to[j], graph.adj_w[j])
+                 for a in range(n) for j in range(graph.adj_off[a], graph.adj_off[a + 1])]
+        # Reversed edge/3 arcs, for distances *to* a landmark
+        self.rev_off, self.rev_to = _csr(n, [(b, a) for a, b, _ in edges])
+        _, self.rev_w = _csr(n, [(b, w) for _, b, w in edges])
+        self.landmarks = self._select(count)
+        # from_lm[i][v] = d(L_i, v); to_lm[i][v] = d(v, L_i)
+        self.from_lm = [_dijkstra(graph.adj_off, graph.adj_to, graph.adj_w, lm, n) for lm in self.landmarks]
+        self.to_lm = [_dijkstra(self.rev_off, self.rev_to, self.rev_w, lm, n) for lm in self.landmarks]
+
+    def _select(self, count: int) -> list:
+        """Farthest-first on undirected hop distance, alternating between sources and sinks.
+
+        Sources (no incoming arcs) give useful d(L, t) bounds and sinks give
+        d(v, L) bounds, so a DAG needs landmarks at both ends. A node not yet
+        reached from any landmark (another component) counts as farthest.
+        """
+        g = self.graph
+        n = g.n
+        out_deg = [g.adj_off[v + 1] - g.adj_off[v] for v in range(n)]
+        in_deg = [self.rev_off[v + 1] - self.rev_off[v] for v in range(n)]
+        nodes = [v for v in range(n) if out_deg[v] or in_deg[v]]
+        pools = [p for p in ([v for v in nodes if not in_deg[v]], [v for v in nodes if not out_deg[v]]) if p]
+        pools = pools or [nodes]
+        hops = [INF] * n
+
+        def bfs(source):
+            hops[source] = 0
+            queue = deque([source])
+            while queue:
+                v = queue.popleft()
+                nd = hops[v] + 1
+                for off, to in ((g.adj_off, g.adj_to), (self.rev_off, self.rev_to)):
+                    for j in range(off[v], off[v + 1]):
+                        u = to[j]
+                        if nd < hops[u]:
+                            hops[u] = nd
+                            queue.append(u)
+
+        chosen = []
+        if not nodes:
+            return chosen
+        # Seed with the node farthest from an arbitrary one, so the first landmark is peripheral too
+        bfs(pools[0][0])
+        seed = max(pools[0], key=lambda v: (hops[v] != INF, hops[v]))
+        hops = [INF] * n
+        taken = set()
+        while len(chosen) < min(count, len(nodes)):
+            pool = pools[len(chosen) % len(pools)]
+            left = [v for v in pool if v not in taken] or [v for v in nodes if v not in taken]
+            if not left:
+                break
+            nxt = seed if not chosen else max(left, key=lambda v: hops[v])
+            chosen.append(nxt)
+            taken.add(nxt)
+            bfs(nxt)
+        return chosen
+
+    def heuristic(self, goal: int):
+        """h(v): admissible, consistent lower bound on d(v, goal)."""
+        fwd = [(d, d[goal]) for d in self.from_lm if d[goal] != INF]
+        bwd = [(d, d[goal]) for d in self.to_lm if d[goal] != INF]
+
+        def h(v: int) -> float:
+            best = 0.0
+            for d, lt in fwd:
+                if lt - d[v] > best:
+                    best = lt - d[v]
+            for d, tl in bwd:
+                if d[v] - tl > best:
+                    best = d[v] - tl
+            return best
+        return h
@@ -1,5 +1,6 @@
 % Core dynamic predicates
-:- dynamic student_goal/1, known/1, time_available/1, user_level/1, learning_style/1.
+% User facts are per-engine so concurrent requests never see each other's profile
+:- thread_local student_goal/1, known/1, time_available/1, user_level/1, learning_style/1.
 :- dynamic learning_progress/3.
 
 % Base topic knowledge base
@@ -46,6 +47,40 @@ goal_topics(backend_dev, [python, django, flask, database_design, sql, mongodb,
 goal_topics(devops_engineer, [git, docker, kubernetes, aws, ci_cd, monitoring, python]).
 goal_topics(security_specialist, [web_security, authentication, encryption, python, javascript, git]).
 
+% Alternative names users type for topics (resolved by skill_index.py)
+synonym(js, javascript).
+synonym(ecmascript, javascript).
+synonym(ts, typescript).
+synonym(html5, html).
+synonym(css3, css).
+synonym(reactjs, react).
+synonym(vuejs, vue).
+synonym(angularjs, angular).
+synonym(node, nodejs).
+synonym(expressjs, express).
+synonym(py, python).
+synonym(k8s, kubernetes).
+synonym(containers, docker).
+synonym(ui, uiux).
+synonym(ux, uiux).
+synonym(a11y, accessibility).
+synonym(responsive, responsive_design).
+synonym(data_structures, dsa).
+synonym(system_architecture, system_design).
+synonym(appsec, web_security).
+synonym(auth, authentication).
+synonym(cryptography, encryption).
+synonym(postgresql, sql).
+synonym(mysql, sql).
+synonym(mongo, mongodb).
+synonym(amazon_web_services, aws).
+synonym(continuous_integration, ci_cd).
+synonym(observability, monitoring).
+synonym(logging, monitoring).
+
+canonical_topic(Term, Term) :- topic(Term, _, _, _, _, _), !.
+canonical_topic(Term, Topic) :- synonym(Term, Topic).
+
 % Core utility predicates
 reset_user_facts :-
     retractall(student_goal(_)),
@@ -55,35 +90,26 @@ reset_user_facts :-
     retractall(learning_style(_)).
 
 % Learning path generation
+% Depth-first, prerequisites first; visited/known topics live in an AVL tree
+% and the path is built as a difference list, so this is O((V+E) log V).
 path_to_goal(Goal, OrderedPath) :-
     goal_topics(Goal, Topics),
-    findall(K, known(K), KnownSkills),
-    build_path(Topics, RawPath0, KnownSkills),
-    remove_dups(RawPath0, RawPath),
-    filter_known(RawPath, Filtered, KnownSkills),
-    OrderedPath = Filtered.
-
-% Core helper predicates
-build_path([], [], _).
-build_path([T|Rest], Path, Visited) :-
-    \+ member(T, Visited),
+    findall(K-known, known(K), KnownPairs0),
+    sort(KnownPairs0, KnownPairs),
+    list_to_assoc(KnownPairs, Known),
+    visit_topics(Topics, Known, _, OrderedPath, []).
+
+visit_topics([], Seen, Seen, Path, Path).
+visit_topics([T|Rest], Seen0, Seen, Path, Tail) :-
+    visit_topic(T, Seen0, Seen1, Path, Mid),
+    visit_topics(Rest, Seen1, Seen, Mid, Tail).
+
+visit_topic(T, Seen, Seen, Path, Path) :-
+    get_assoc(T, Seen, _), !.
+visit_topic(T, Seen0, Seen, Path, Tail) :-
     topic(T, Prereqs, _, _, _, _),
-    build_path(Prereqs, PPath, [T|Visited]),
-    build_path(Rest, RPath, [T|Visited]),
-    append(PPath, [T|RPath], Path).
-build_path([T|Rest], Path, Visited) :-
-    member(T, Visited),
-    build_path(Rest, Path, Visited).
-
-remove_dups([], []).
-remove_dups([H|T], R) :- member(H, T), !, remove_dups(T, R).
-remove_dups([H|T], [H|R]) :- \+ member(H, T), remove_dups(T, R).
-
-filter_known([], [], _).
-filter_known([H|T], R, Known) :-
-    member(H, Known), !, filter_known(T, R, Known).
-filter_known([H|T], [H|R], Known) :-
-    \+ member(H, Known), filter_known(T, R, Known).
+    put_assoc(T, Seen0, visited, Seen1),
+    visit_topics(Prereqs, Seen1, Seen, Path, [T|Tail]).
 
 % Topic status and prerequisites
 is_topic_complete(Topic) :-
@@ -103,6 +129,15 @@ all_prerequisites_known(Topic) :-
     topic(Topic, Prereqs, _, _, _, _),
     forall(member(P, Prereqs), known(P)).
 
+% Time budget advice for a path of Total hours given Available hours
+study_suggestion(Total, Available, Suggestion) :-
+    Total =< Available, !,
+    Spare is Available - Total,
+    format(atom(Suggestion), 'Fits your schedule with ~w hours to spare', [Spare]).
+study_suggestion(Total, Available, Suggestion) :-
+    Short is Total - Available,
+    format(atom(Suggestion), 'Needs ~w more hours than you have available', [Short]).
+
 % Duration-based predicates
 short_topics(Threshold, Topic) :-
     topic(Topic, _, D, _, _, _),
@@ -133,9 +168,17 @@ get_latest_progress(Topic, LatestStatus) :-
 
 % Prerequisite analysis
 all_prerequisites(Topic, Prereqs) :-
+    topic(Topic, _, _, _, _, _),
+    findall(P, prerequisite_of(P, Topic), All),
+    list_to_set(All, Prereqs).
+
+% P is a direct or indirect prerequisite of Topic
+prerequisite_of(P, Topic) :-
     topic(Topic, DirectPrereqs, _, _, _, _),
-    findall(P, (member(P, DirectPrereqs), all_prerequisites(P, _)), IndirectPrereqs),
-    append(DirectPrereqs, IndirectPrereqs, Prereqs).
+    member(D, DirectPrereqs),
+    (   P = D
+    ;   prerequisite_of(P, D)
+    ).
 
 % Same duration topics in goal path
 goal_path_same_duration_topics(Goal, T1, T2) :-
@@ -163,9 +206,8 @@ can_learn(Topic) :-
 exhaustive_path_find(Start, Goal, MaxDepth, Path) :-
     exhaustive_search(Start, Goal, [Start], Path, MaxDepth, 1).
 
-exhaustive_search(Goal, Goal, CurrentPath, ReversedPath, _, Attempt) :-
-    reverse(CurrentPath, ReversedPath),
-    format('Success: Found path attempt #~w~n', [Attempt]).
+exhaustive_search(Goal, Goal, CurrentPath, ReversedPath, _, _Attempt) :-
+    reverse(CurrentPath, ReversedPath).
 
 exhaustive_search(Current, Goal, Visited, Path, MaxDepth, Attempt) :-
     MaxDepth > 0,
@@ -174,12 +216,8 @@ exhaustive_search(Current, Goal, Visited, Path, MaxDepth, Attempt) :-
     (topic(Next, Prerequisites, _, _, _, _),
      member(Current, Prerequisites)),  % Find topics that require current
     \+ member(Next, Visited),
-    format('Attempt #~w: Trying ~w -> ~w~n', [Attempt, Current, Next]),
     NextAttempt is Attempt + 1,
-    (exhaustive_search(Next, Goal, [Next|Visited], Path, NextDepth, NextAttempt)
-    ;  % Backtrack even on success
-     format('Backtracking from ~w~n', [Next]),
-     fail).
+    exhaustive_search(Next, Goal, [Next|Visited], Path, NextDepth, NextAttempt).
 
 % Helper predicate to find all possible paths
 find_all_paths(Start, Goal, MaxDepth, AllPaths) :-
@@ -215,17 +253,33 @@ list_intersection([X|Rest], List2, [X|Result]) :-
 list_intersection([_|Rest], List2, Result) :-
     list_intersection(Rest, List2, Result).
 
-generate_learning_path(Topic,[Topic],[Topic],Time,Time):-
-	can_learn(Topic),
-	topic(Topic,[],_,_,_,_).
-    
-generate_learning_path(Topic,Path,Visited,TimeSpend,MaxTime):-
-	can_learn(Topic),
-	topic(Topic,Prereqs,Duration,_,_,_).
-	NewTime is TimeSpent+Duration.
-	NewTime=<MaxTime,
-	generate_prereq_paths(Prereqs,[],PrereqPaths,[Topic|Visited],NewTime,MaxTime),
-	append(PrereqPaths,[Topic],Path).
+% Greedy budget fit: keeps each goal topic (with its unmet prerequisites) in
+% goal order if the running total stays within MaxTime, and lists the goal
+% topics left out in Skipped. budget.py searches for the best subset instead.
+generate_learning_path(Goal, MaxTime, Path, Skipped, TimeSpent) :-
+    goal_topics(Goal, Topics),
+    findall(K-known, known(K), KnownPairs0),
+    sort(KnownPairs0, KnownPairs),
+    list_to_assoc(KnownPairs, Known),
+    fit_topics(Topics, Known, 0, MaxTime, Path, Skipped, TimeSpent).
+
+fit_topics([], _, Time, _, [], [], Time).
+fit_topics([T|Rest], Seen0, Time0, MaxTime, Path, Skipped, Time) :-
+    visit_topic(T, Seen0, Seen1, New, []),
+    path_hours(New, 0, Hours),
+    Time1 is Time0 + Hours,
+    (   Time1 =< MaxTime
+    ->  append(New, Path1, Path),
+        fit_topics(Rest, Seen1, Time1, MaxTime, Path1, Skipped, Time)
+    ;   Skipped = [T|Skipped1],
+        fit_topics(Rest, Seen0, Time0, MaxTime, Path, Skipped1, Time)
+    ).
+
+path_hours([], Hours, Hours).
+path_hours([T|Ts], Hours0, Hours) :-
+    topic(T, _, D, _, _, _),
+    Hours1 is Hours0 + D,
+    path_hours(Ts, Hours1, Hours).
 
 
 
@@ -356,7 +410,7 @@ astar_search([node(N, RevPath, G, _)|Rest], Goal, Path, Cost) :-
               F1 is G1 + H),
             Children),
     append(Rest, Children, Open),
-    sort(3, @=<, Open, OpenSorted),   % sort by F = G+H
+    sort(4, @=<, Open, OpenSorted),   % sort by F = G+H
     astar_search(OpenSorted, Goal, Path, Cost).
 
 % AND-OR graph
@@ -373,20 +427,48 @@ cost(vue, 2).
 cost(ts, 2).
 cost(angular, 3).
 
+% Nested AND-OR curricula: a child with its own andor/2 entry is a subgoal
+andor(frontend_stack, [[frontend, tooling]]).
+andor(fullstack, [[frontend_stack, backend, deployment]]).
+andor(tooling, [[git, webpack], [git, vite]]).
+andor(backend, [[js_backend], [python_backend]]).
+andor(js_backend, [[js, node, express]]).
+andor(python_backend, [[python, flask], [python, django]]).
+andor(deployment, [[docker, aws], [heroku]]).
+
+cost(git, 1).
+cost(webpack, 2).
+cost(vite, 1).
+cost(node, 2).
+cost(express, 2).
+cost(python, 2).
+cost(flask, 2).
+cost(django, 3).
+cost(docker, 2).
+cost(aws, 3).
+cost(heroku, 2).
+
 
 leaf_cost(N, C) :- cost(N,C), !.
 leaf_cost(_,1).
 
-% AO* evaluation
-aostar(Node, BestAlt, Cost) :-
+% AO* evaluation (exhaustive reference; app.py uses aostar.py).
+% Strategy lists the leaves of the cheapest solution graph.
+aostar(Node, Strategy, Cost) :-
     andor(Node, Alts), !,
-    findall(C-A,
+    findall(C-S,
             ( member(A, Alts),
-              maplist(leaf_cost, A, Costs),
-              sum_list(Costs, C)),
+              aostar_all(A, S, C)),
             Pairs),
-    sort(Pairs, [Cost-BestAlt|_]).
+    keysort(Pairs, [Cost-Strategy|_]).
 
 aostar(Node, [Node], C) :-
     leaf_cost(Node, C).
 
+aostar_all([], [], 0).
+aostar_all([N|Ns], Strategy, Cost) :-
+    aostar(N, S1, C1),
+    aostar_all(Ns, S2, C2),
+    append(S1, S2, Strategy),
+    Cost is C1 + C2.
+
@@ -0,0 +1,157 @@
+"""Counters and histograms rendered in the Prometheus text format.
+
+A minimal in-process registry, so /metrics needs no client library. Every
+metric takes labels as keyword arguments; each distinct label set gets its
+own series.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _num(v) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, key, value
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}       # labels -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(key)
+            if s is None:
+                s = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            s[i] += 1
+            s[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of a ``with`` block, even if it raises."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def samples(self):
+        with self._lock:
+            items = [(k, list(s)) for k, s in self._series.items()]
+        for key, s in items:
+            running = 0
+            for bound, n in zip(self.buckets + (float("inf"),), s):
+                running += n
+                yield self.name + "_bucket", key + (("le", _num(bound)),), running
+            yield self.name + "_sum", key, s[-1]
+            yield self.name + "_count", key, running
+
+
+class GaugeFunc:
+    """Gauge read from `fn()` at scrape time; `fn` returns a number or {labels-dict-items: value}."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn):
+        self.name = name
+        self.help = help
+        self.fn = fn
+
+    def samples(self):
+        value = self.fn()
+        if isinstance(value, dict):
+            for key, v in value.items():
+                yield self.name, key, v
+        else:
+            yield self.name, (), value
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help):
+        return self._metrics.get(name) or self.register(Counter(name, help))
+
+    def histogram(self, name, help, buckets=DEFAULT_BUCKETS):
+        return self._metrics.get(name) or self.register(Histogram(name, help, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, key, value in metric.samples():
+                lines.append(f"{name}{_labels(key)} {_num(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+KB_QUERY_SECONDS = REGISTRY.histogram("kb_query_seconds", "Time spent in Prolog queries, by predicate")
+KB_QUERY_RESULTS = REGISTRY.counter("kb_query_results_total", "Solutions returned by Prolog queries")
+KB_QUERY_INFERENCES = REGISTRY.counter("kb_query_inferences_total", "Prolog inferences used by queries")
+KB_QUERY_ERRORS = REGISTRY.counter("kb_query_errors_total", "Prolog queries that raised")
+CHART_RENDER_SECONDS = REGISTRY.histogram("chart_render_seconds", "Chart render time, by chart kind")
+RECOMMEND_STEP_SECONDS = REGISTRY.histogram(
+    "recommend_step_seconds", "Time in the native (non-Prolog) steps of a recommendation, by step")
+HTTP_REQUEST_SECONDS = REGISTRY.histogram("http_request_seconds", "Request latency, by route")
+
+
+def observe_kb_query(name: str, seconds: float, results: int, inferences, error: bool = False):
+    KB_QUERY_SECONDS.observe(seconds, query=name)
+    KB_QUERY_RESULTS.inc(results, query=name)
+    if inferences is not None:
+        KB_QUERY_INFERENCES.inc(inferences, query=name)
+    if error:
+        KB_QUERY_ERRORS.inc(query=name)
+
+
+def observe_chart(kind: str, seconds: float):
+    CHART_RENDER_SECONDS.observe(seconds, kind=kind)
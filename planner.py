@@ -0,0 +1,119 @@
+"""Learning-path planning over a TopicGraph.
+
+`plan_path` is the native counterpart of path_to_goal/2: it walks the goal's
+prerequisite closure (without expanding topics the learner already knows) and
+orders it with Kahn's algorithm, so the cost is O(V + E) in the size of that
+closure rather than quadratic list scans.
+"""
+import heapq
+
+from topic_graph import TopicGraph
+
+DIFFICULTY_RANK = {'beginner': 0, 'intermediate': 1, 'advanced': 2}
+
+# Secondary orderings for topics that become available at the same time.
+TIE_BREAKS = {
+    'duration': lambda rec: rec.duration,
+    'difficulty': lambda rec: DIFFICULTY_RANK.get(rec.difficulty, len(DIFFICULTY_RANK)),
+    'category': lambda rec: rec.category,
+}
+
+
+class PlanError(ValueError):
+    pass
+
+
+class CycleError(PlanError):
+    """The prerequisite closure is not a DAG; `cycle` lists the topics involved."""
+
+    def __init__(self, cycle):
+        self.cycle = cycle
+        super().__init__("prerequisite cycle between: " + ", ".join(cycle))
+
+
+def _closure_postorder(graph: TopicGraph, roots, known: int) -> list:
+    """Prerequisites-first DFS order of everything reachable from `roots`, skipping known topics."""
+    seen = known
+    order = []
+    for root in roots:
+        if seen >> root & 1:
+            continue
+        seen |= 1 << root
+        stack = [(root, iter(graph.prereqs(root)))]
+        while stack:
+            node, it = stack[-1]
+            for p in it:
+                if not seen >> p & 1:
+                    if not graph.is_topic(p):
+                        raise PlanError(f"{graph.names[node]} requires unknown topic {graph.names[p]}")
+                    seen |= 1 << p
+                    stack.append((p, iter(graph.prereqs(p))))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+    return order
+
+
+def plan_path(graph: TopicGraph, roots, known: int = 0, tie_break=()) -> list:
+    """Topic IDs to study, every prerequisite before the topics that need it.
+
+    With no `tie_break` the order is a depth-first postorder: goal topics in
+    the order the goal lists them, each preceded by its unmet prerequisites.
+    That is a valid topological order, and the one path_to_goal/2 now gives.
+    The original path_to_goal/2 was not: its remove_dups kept the last copy
+    of a repeated topic, so a topic could come before its own prerequisite
+    (devops_engineer listed monitoring before python).
+    `tie_break` names keys from TIE_BREAKS (e.g. ``('duration',)``) that decide
+    between topics that are ready at the same time; KB order settles the rest.
+    """
+    if isinstance(tie_break, str):
+        tie_break = [k.strip() for k in tie_break.split(",") if k.strip()]
+    keys = [TIE_BREAKS[k] for k in tie_break]
+
+    for r in roots:
+        if not graph.is_topic(r):
+            raise PlanError(f"unknown topic {graph.names[r]}")
+    base = _closure_postorder(graph, roots, known)
+    rank = {t: i for i, t in enumerate(base)}
+
+    indeg = {}
+    for t in base:
+        indeg[t] = sum(1 for p in graph.prereqs(t) if p in rank)
+
+    records = graph.records
+
+    def priority(t):
+        rec = records[t]
+        return tuple(k(rec) for k in keys) + (rank[t],)
+
+    heap = [(priority(t), t) for t in base if indeg[t] == 0]
+    heapq.heapify(heap)
+    out = []
+    while heap:
+        _, t = heapq.heappop(heap)
+        out.append(t)
+        for d in graph.dependents(t):
+            if d in indeg:
+                indeg[d] -= 1
+                if indeg[d] == 0:
+                    heapq.heappush(heap, (priority(d), d))
+
+    if len(out) < len(base):
+        placed = set(out)
+        raise CycleError([graph.names[t] for t in base if t not in placed])
+    return out
+
+
+def study_suggestion(total: int, available: int) -> str:
+    """Same advice as study_suggestion/3."""
+    if total <= available:
+        return f"Fits your schedule with {available - total} hours to spare"
+    return f"Needs {total - available} more hours than you have available"
+
+
+def plan_goal(graph: TopicGraph, goal: str, known: int = 0, tie_break=()) -> list:
+    """plan_path for a goal_topics/2 goal; raises KeyError for unknown goals."""
+    if goal not in graph.goals:
+        raise KeyError(goal)
+    return plan_path(graph, graph.goals[goal], known, tie_break)
@@ -0,0 +1,49 @@
+"""Bit-packed topics × topics prerequisite matrices for vectorised checks.
+
+Row ``t`` holds the prerequisites of topic ``t`` as a bitset packed into
+uint64 words (bit ``p`` of the row is set if ``p`` is a prerequisite). For a
+known-skill vector ``k`` packed the same way, ``M & ~k`` gives every topic's
+missing prerequisites in one NumPy operation. Two matrices are kept: direct
+prerequisites (topic/6) and the transitive closure.
+"""
+from topic_graph import TopicGraph
+
+MODES = ("direct", "transitive")
+
+
+class PrereqMatrix:
+    def __init__(self, graph: TopicGraph):
+        import numpy as np  # deferred: only this analysis needs NumPy
+        self.np = np
+        self.graph = graph
+        self.words = (graph.n + 63) // 64
+        self._nbytes = self.words * 8
+        rows = range(graph.n_topics)
+        self.direct = self._pack([graph.prereq_mask[t] for t in rows])
+        self.transitive = self._pack([graph.ancestors(t) for t in rows])
+
+    def _pack(self, masks):
+        np, nb = self.np, self._nbytes
+        buf = b"".join(m.to_bytes(nb, "little") for m in masks)
+        return np.frombuffer(buf, dtype="<u8").reshape(len(masks), self.words)
+
+    def known_vector(self, known: int):
+        return self.np.frombuffer(known.to_bytes(self._nbytes, "little"), dtype="<u8")
+
+    def missing(self, known: int, mode: str = "direct"):
+        """(topic ids, packed missing-prerequisite rows) for topics with anything missing."""
+        np = self.np
+        matrix = self.transitive if mode == "transitive" else self.direct
+        gaps = matrix & ~self.known_vector(known)
+        rows = np.flatnonzero(gaps.any(axis=1))
+        return rows, gaps[rows]
+
+    def unlearnable(self, known: int, mode: str = "direct") -> list:
+        """[(topic name, [missing prerequisite names])] in topic order."""
+        np, names = self.np, self.graph.names
+        rows, gaps = self.missing(known, mode)
+        if not len(rows):
+            return []
+        bits = np.unpackbits(gaps.view(np.uint8), axis=1, bitorder="little")
+        return [(names[t], [names[p] for p in np.flatnonzero(row)])
+                for t, row in zip(rows.tolist(), bits)]
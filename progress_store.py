@@ -0,0 +1,102 @@
+"""Persistent learning-progress store (SQLite in WAL mode).
+
+Every update is appended to `progress_log`; `progress_latest` keeps the most
+recent status per (user, topic) so reading a whole learning path is one
+indexed lookup instead of a scan-and-sort over every entry, which is what
+get_latest_progress/2 does in Prolog.
+"""
+import sqlite3
+import threading
+import time
+
+COMPLETE_STATUSES = frozenset({"complete", "completed"})
+NOT_STARTED = "not_started"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress_log (
+    id     INTEGER PRIMARY KEY,
+    user   TEXT NOT NULL,
+    topic  TEXT NOT NULL,
+    status TEXT NOT NULL,
+    ts     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS progress_log_user_topic ON progress_log (user, topic, ts);
+CREATE TABLE IF NOT EXISTS progress_latest (
+    user   TEXT NOT NULL,
+    topic  TEXT NOT NULL,
+    status TEXT NOT NULL,
+    ts     REAL NOT NULL,
+    PRIMARY KEY (user, topic)
+) WITHOUT ROWID;
+"""
+
+# Keep the newer entry if updates arrive out of order.
+_UPSERT_LATEST = """
+INSERT INTO progress_latest (user, topic, status, ts) VALUES (?, ?, ?, ?)
+ON CONFLICT (user, topic) DO UPDATE SET status = excluded.status, ts = excluded.ts
+WHERE excluded.ts >= progress_latest.ts
+"""
+
+# Stay well under SQLite's bound-parameter limit.
+_CHUNK = 500
+
+
+class ProgressStore:
+    def __init__(self, path: str = "progress.db"):
+        # Nothing touches the file until the first read or write
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._has_schema = False
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._schema_lock:
+                if not self._has_schema:
+                    with conn:
+                        conn.executescript(_SCHEMA)
+                    self._has_schema = True
+        return conn
+
+    def record(self, user: str, topic: str, status: str, ts: float = None):
+        self.record_many([(user, topic, status, ts)])
+
+    def record_many(self, entries):
+        """Append (user, topic, status[, ts]) entries in a single transaction."""
+        now = time.time()
+        rows = [(e[0], e[1], e[2], e[3] if len(e) > 3 and e[3] is not None else now) for e in entries]
+        if not rows:
+            return
+        with self._conn() as conn:
+            conn.executemany("INSERT INTO progress_log (user, topic, status, ts) VALUES (?, ?, ?, ?)", rows)
+            conn.executemany(_UPSERT_LATEST, rows)
+
+    def status_for(self, user: str, topics) -> dict:
+        """Latest status of each topic for `user` ('not_started' if none)."""
+        topics = list(topics)
+        out = dict.fromkeys(topics, NOT_STARTED)
+        conn = self._conn()
+        for i in range(0, len(topics), _CHUNK):
+            chunk = topics[i:i + _CHUNK]
+            marks = ",".join("?" * len(chunk))
+            for topic, status in conn.execute(
+                    f"SELECT topic, status FROM progress_latest WHERE user = ? AND topic IN ({marks})",
+                    [user, *chunk]):
+                out[topic] = status
+        return out
+
+    def completed(self, user: str, topics) -> set:
+        return {t for t, s in self.status_for(user, topics).items() if s in COMPLETE_STATUSES}
+
+    def history(self, user: str) -> dict:
+        """topic -> [(status, ts), ...] newest first, for every topic the user has touched."""
+        out = {}
+        for topic, status, ts in self._conn().execute(
+                "SELECT topic, status, ts FROM progress_log WHERE user = ? ORDER BY topic, ts DESC", (user,)):
+            out.setdefault(topic, []).append((status, ts))
+        return out
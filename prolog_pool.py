@@ -0,0 +1,275 @@
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from contextlib import contextmanager
+
+import prolog_query
+from prolog_query import PreparedQuery
+
+
+# Predicate name a query is reported under
+_QUERY_NAME = re.compile(r"\s*([a-z][A-Za-z0-9_]*)")
+
+
+def _atom(path: str) -> str:
+    """`path` as a quoted Prolog atom."""
+    return "'" + path.replace("\\", "/").replace("'", "\\'") + "'"
+
+
+RESET_USER_FACTS = PreparedQuery("reset_user_facts")
+
+
+class Overloaded(RuntimeError):
+    """The Prolog executor's queue is full."""
+
+
+class PrologSession:
+    """Per-request view of the shared engine.
+
+    User facts (known/1, student_goal/1, ...) are thread_local in
+    learningpath.pl, so each session only ever sees its own assertions.
+    With `module` set, goals and facts are qualified with it, so the session
+    talks to one loaded version of the knowledge base.
+    """
+
+    def __init__(self, pool: "PrologPool", deadline: float = None, module: str = None):
+        self._pool = pool
+        # perf_counter() time after which queries are refused (set by PrologExecutor)
+        self.deadline = deadline
+        self.module = module
+
+    def query(self, goal: str, maxresult: int = -1) -> list:
+        """Solutions of a goal given as text, which SWI parses on every call.
+
+        Kept only as the text baseline for benchmarks/bench_prepared.py.
+        Request code uses run()/run_many() with a PreparedQuery, so user
+        input is never formatted into goal text.
+        """
+        goal = goal.rstrip().rstrip(".")
+        observer = self._pool.observer
+        if observer is not None:
+            m = _QUERY_NAME.match(goal)
+            name = m.group(1) if m else "other"
+        if self.module:
+            goal = f"{self.module}:({goal})"
+        if observer is not None:
+            goal = f"statistics(inferences, KbInf0_), ({goal}), statistics(inferences, KbInf1_)"
+        if self.deadline is not None:
+            remaining = self.deadline - time.perf_counter()
+            if remaining <= 0:
+                raise TimeoutError(f"request deadline passed before {goal}")
+            goal = f"call_with_time_limit({remaining:.3f}, ({goal}))"
+        if observer is None:
+            with self._pool._query_lock:
+                return list(self._pool.prolog.query(goal, maxresult=maxresult))
+
+        t0 = time.perf_counter()
+        try:
+            with self._pool._query_lock:
+                rows = list(self._pool.prolog.query(goal, maxresult=maxresult))
+        except Exception:
+            observer(name, time.perf_counter() - t0, 0, None, error=True)
+            raise
+        inferences = None
+        if rows and "KbInf1_" in rows[-1]:
+            # Counted from before the first solution to the last one returned
+            inferences = int(rows[-1]["KbInf1_"]) - int(rows[-1]["KbInf0_"])
+        for r in rows:
+            r.pop("KbInf0_", None)
+            r.pop("KbInf1_", None)
+        observer(name, time.perf_counter() - t0, len(rows), inferences)
+        return rows
+
+    def assertz(self, fact: str):
+        """Assert a fact given as text; the baseline for assertz_many() in
+        benchmarks/bench_prepared.py, not for use on the request path."""
+        if self.module:
+            fact = f"{self.module}:({fact})"
+        with self._pool._query_lock:
+            self._pool.prolog.assertz(fact)
+
+    # -- prepared goals (see prolog_query) ----------------------------------
+
+    def _execute(self, name: str, build, maxresult: int = -1) -> list:
+        observer = self._pool.observer
+        if observer is None:
+            with self._pool._query_lock:
+                return prolog_query.execute(self, name, build, maxresult)[0]
+
+        t0 = time.perf_counter()
+        try:
+            with self._pool._query_lock:
+                rows, inferences = prolog_query.execute(self, name, build, maxresult, observe=True)
+        except Exception:
+            observer(name, time.perf_counter() - t0, 0, None, error=True)
+            raise
+        observer(name, time.perf_counter() - t0, len(rows), inferences)
+        return rows
+
+    def run(self, query: PreparedQuery, *args, maxresult: int = -1) -> list:
+        """Solutions of `query` with `args` bound to its inputs, as dicts of its outputs."""
+        return self._execute(query.name, lambda: prolog_query.single(query, args), maxresult)
+
+    def run_many(self, query: PreparedQuery, rows, first: bool = True) -> list:
+        """run() for every argument tuple in `rows`, in one engine call.
+
+        Returns one list of solutions per row; with `first`, each has at most one.
+        """
+        rows = list(rows)
+        if not rows:
+            return []
+        found = self._execute(query.name, lambda: prolog_query.batch(query, rows, first), 1)
+        out = [[] for _ in rows]
+        for i, *values in found[0]["Rows"]:
+            out[i].append(dict(zip(query.outputs, values)))
+        return out
+
+    def assertz_many(self, facts):
+        """Assert ``(query, args)`` facts in one engine call; `query` must have only inputs."""
+        facts = list(facts)
+        if facts:
+            self._execute("assertz", lambda: prolog_query.facts(facts))
+
+    def retract(self, query: PreparedQuery, *args) -> bool:
+        """Retract the first clause matching `query` with `args`; False if there was none."""
+        return bool(self._execute("retract", lambda: prolog_query.retract(query, args), 1))
+
+    def reset(self):
+        self.run(RESET_USER_FACTS)
+
+
+class PrologPool:
+    """Consults the knowledge base once and hands out isolated sessions.
+
+    pyswip attaches one SWI engine per Python thread; `max_sessions` bounds
+    how many of those may be active at the same time. Individual queries are
+    still serialised because pyswip tracks the open query globally.
+
+    Besides `kb_path` (consulted into `user`; pass None to skip it), further
+    sources can be registered under module names with add_source. Each is
+    consulted into its own module the first time a session asks for it, so
+    several versions of the knowledge base can be loaded side by side.
+    """
+
+    def __init__(self, kb_path: str = "learningpath.pl", max_sessions: int = 8, qcompile: bool = False,
+                 observer=None):
+        self.kb_path = kb_path
+        self.qcompile = qcompile
+        # observer(name, seconds, results, inferences, error=False) is told about every query
+        self.observer = observer
+        self.prolog = None
+        self._load_lock = threading.Lock()
+        self._query_lock = threading.RLock()
+        self._slots = threading.BoundedSemaphore(max_sessions)
+        self._sources = {}      # module -> source path
+        self._loaded = set()    # modules consulted into the engine
+
+    def load(self):
+        """Start SWI-Prolog and consult `kb_path` if that has not been done yet."""
+        if self.prolog is not None:
+            return self.prolog
+        with self._load_lock:
+            if self.prolog is None:
+                # Importing pyswip starts SWI-Prolog, so defer it to first use.
+                from pyswip import Prolog
+                p = Prolog()
+                if self.kb_path and self.qcompile:
+                    # Load from (and refresh when stale) the compiled .qlf next to the source
+                    list(p.query(f"load_files('{self.kb_path}', [qcompile(auto)])"))
+                elif self.kb_path:
+                    p.consult(self.kb_path)
+                self.prolog = p
+        return self.prolog
+
+    # -- versioned sources ---------------------------------------------------
+
+    def add_source(self, module: str, path: str):
+        """Register `path` to be consulted into `module` on first use."""
+        self._sources[module] = path
+
+    def ensure_loaded(self, module: str):
+        """Consult the source registered for `module` unless it already is."""
+        if module in self._loaded:
+            return
+        prolog = self.load()
+        with self._load_lock:
+            if module in self._loaded:
+                return
+            options = "[qcompile(auto)]" if self.qcompile else "[]"
+            with self._query_lock:
+                list(prolog.query(f"load_files({module}:{_atom(self._sources[module])}, {options})"))
+            self._loaded.add(module)
+
+    def drop_source(self, module: str):
+        """Unload `module`'s source from the engine and forget it."""
+        path = self._sources.pop(module, None)
+        with self._load_lock:
+            if module not in self._loaded:
+                return
+            self._loaded.discard(module)
+            with self._query_lock:
+                list(self.prolog.query(f"unload_file({_atom(path)})"))
+
+    @contextmanager
+    def session(self, deadline: float = None, module: str = None):
+        self.load()
+        if module:
+            self.ensure_loaded(module)
+        with self._slots:
+            s = PrologSession(self, module=module)
+            s.reset()
+            s.deadline = deadline
+            try:
+                yield s
+            finally:
+                # Engines are reused by the next request on this thread.
+                s.deadline = None
+                s.reset()
+
+
+class PrologExecutor:
+    """Runs Prolog work on one dedicated thread with a bounded queue.
+
+    SWI engines are bound to the thread that created them, so keeping every
+    query on one thread avoids attaching an engine per web worker. Each job
+    gets a fresh session, and its user facts are reset before and after. The
+    job is skipped if its deadline passes while it is still queued. While it
+    runs, the deadline is enforced with call_with_time_limit/2.
+    """
+
+    def __init__(self, pool: PrologPool, max_pending: int = 64):
+        self.pool = pool
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="prolog")
+        self._pending = threading.BoundedSemaphore(max_pending)
+
+    def submit(self, fn, *args, timeout: float = None, module: str = None, **kwargs):
+        """Future for ``fn(session, *args, **kwargs)``; raises Overloaded if the queue is full.
+
+        The session is on `module` (see PrologPool.add_source) when given.
+        """
+        if not self._pending.acquire(blocking=False):
+            raise Overloaded("too many queued Prolog requests")
+        deadline = time.perf_counter() + timeout if timeout is not None else None
+
+        def run():
+            if deadline is not None and time.perf_counter() >= deadline:
+                raise TimeoutError("request deadline passed while queued")
+            with self.pool.session(deadline, module) as s:
+                return fn(s, *args, **kwargs)
+
+        fut = self._executor.submit(run)
+        fut.add_done_callback(lambda _: self._pending.release())
+        return fut
+
+    def call(self, fn, *args, timeout: float = None, module: str = None, **kwargs):
+        """Run `fn` on the Prolog thread and wait; raises TimeoutError after `timeout` seconds."""
+        fut = self.submit(fn, *args, timeout=timeout, module=module, **kwargs)
+        try:
+            return fut.result(timeout)
+        except TimeoutError:
+            fut.cancel()
+            raise
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,218 @@
+"""Prepared Prolog goals, parsed once and called with arguments bound as terms.
+
+    SUGGESTION = PreparedQuery("study_suggestion(+int, +int, -Suggestion)")
+    rows = session.run(SUGGESTION, total_time, hours)   # [{"Suggestion": ...}]
+
+A spec names the predicate and gives one mode per argument. Inputs are
+``+atom``, ``+int`` or ``+list`` (a list of atoms). ``-Name`` marks an
+output, which is reported under that name. Each input is put straight into a
+term reference through pyswip's foreign interface. Nothing is formatted
+into goal text for SWI to parse, so user input (a skill name, say) can only
+ever be an atom. The functor is created once per spec.
+
+PrologSession.run wraps these goals in the session's module, the
+observer's inference counters and call_with_time_limit/2, just as
+PrologSession.query wraps text goals. Here the wrapping is built on terms.
+run_many and assertz_many send a whole batch of argument tuples to the
+engine in one call.
+"""
+import re
+import time
+from concurrent.futures import TimeoutError
+
+_SPEC = re.compile(r"\s*([a-z][A-Za-z0-9_]*)\s*(?:\((.*)\))?\s*\.?\s*")
+_MODE = re.compile(r"\+(atom|int|list)|-([A-Z][A-Za-z0-9_]*)")
+
+
+class _Terms:
+    """Builds terms through pyswip's foreign interface; created on first use (importing pyswip starts SWI-Prolog)."""
+
+    def __init__(self):
+        from pyswip import core, easy, prolog
+        self.core = core
+        self.get_term = easy.getTerm
+        self.normalize = prolog.normalize_values
+        self.PrologError = prolog.PrologError
+        self.attach = prolog.Prolog._init_prolog_thread
+        self.call1 = core.PL_predicate("call", 1, None)
+        self._functors = {}
+
+    def functor(self, name: str, arity: int):
+        f = self._functors.get((name, arity))
+        if f is None:
+            f = self._functors[name, arity] = self.core.PL_new_functor(self.core.PL_new_atom(name), arity)
+        return f
+
+    def var(self) -> int:
+        return self.core.PL_new_term_ref()      # a fresh term reference is unbound
+
+    def atom(self, value) -> int:
+        ref = self.core.PL_new_term_ref()
+        self.core.PL_put_atom_chars(ref, str(value))
+        return ref
+
+    def integer(self, value) -> int:
+        ref = self.core.PL_new_term_ref()
+        self.core.PL_put_integer(ref, int(value))
+        return ref
+
+    def list(self, refs) -> int:
+        ref = self.core.PL_new_term_ref()
+        self.core.PL_put_nil(ref)
+        for item in reversed(refs):
+            self.core.PL_cons_list(ref, item, ref)
+        return ref
+
+    def cons(self, head: int, tail: int) -> int:
+        ref = self.core.PL_new_term_ref()
+        self.core.PL_cons_list(ref, head, tail)
+        return ref
+
+    def compound(self, name: str, *args) -> int:
+        """name(args...) from existing term references."""
+        core = self.core
+        a0 = core.PL_new_term_refs(len(args))
+        for i, arg in enumerate(args):
+            core.PL_put_term(a0 + i, arg)
+        ref = core.PL_new_term_ref()
+        core.PL_cons_functor_v(ref, self.functor(name, len(args)), a0)
+        return ref
+
+    def value(self, ref):
+        """Python value of a term, as PrologSession.query reports it (atoms become str)."""
+        return self.normalize(self.get_term(ref))
+
+
+_terms = None
+
+
+def terms() -> _Terms:
+    global _terms
+    if _terms is None:
+        _terms = _Terms()
+    return _terms
+
+
+class PreparedQuery:
+    """One goal shape: a predicate name plus an input or output mode per argument."""
+
+    __slots__ = ("spec", "name", "modes", "outputs")
+
+    def __init__(self, spec: str):
+        m = _SPEC.fullmatch(spec)
+        if not m:
+            raise ValueError(f"bad goal spec {spec!r}")
+        self.spec = spec
+        self.name = m.group(1)
+        self.modes = []
+        for arg in m.group(2).split(",") if m.group(2) is not None else ():
+            mode = _MODE.fullmatch(arg.strip())
+            if not mode:
+                raise ValueError(f"bad argument {arg.strip()!r} in goal spec {spec!r}")
+            self.modes.append(mode.group(1) or "-" + mode.group(2))
+        self.outputs = [mode[1:] for mode in self.modes if mode[0] == "-"]
+
+    def __repr__(self):
+        return f"PreparedQuery({self.spec!r})"
+
+    def term(self, args) -> tuple:
+        """(goal term, output term refs) with `args` bound to the inputs, in order."""
+        t = terms()
+        n_inputs = len(self.modes) - len(self.outputs)
+        if len(args) != n_inputs:
+            raise TypeError(f"{self.name}/{len(self.modes)} takes {n_inputs} input(s), got {len(args)}")
+        if not self.modes:
+            return t.atom(self.name), []
+        args = iter(args)
+        refs, outputs = [], []
+        for mode in self.modes:
+            if mode == "atom":
+                refs.append(t.atom(next(args)))
+            elif mode == "int":
+                refs.append(t.integer(next(args)))
+            elif mode == "list":
+                refs.append(t.list([t.atom(item) for item in next(args)]))
+            else:
+                ref = t.var()
+                refs.append(ref)
+                outputs.append(ref)
+        return t.compound(self.name, *refs), outputs
+
+
+# -- goals built from prepared ones ---------------------------------------------
+
+def single(query: PreparedQuery, args) -> tuple:
+    goal, outputs = query.term(args)
+    return goal, list(zip(query.outputs, outputs))
+
+
+def batch(query: PreparedQuery, rows, first: bool) -> tuple:
+    """findall([I|Outputs], (member(r(I, Goal, Outputs), Goals), once(Goal)), Rows) over all rows."""
+    t = terms()
+    goals = []
+    for i, args in enumerate(rows):
+        goal, outputs = query.term(args)
+        goals.append(t.compound("r", t.integer(i), goal, t.list(outputs)))
+    i, goal, outputs = t.var(), t.var(), t.var()
+    body = t.compound(",", t.compound("member", t.compound("r", i, goal, outputs), t.list(goals)),
+                      t.compound("once", goal) if first else goal)
+    found = t.var()
+    return t.compound("findall", t.cons(i, outputs), body, found), [("Rows", found)]
+
+
+def facts(items) -> tuple:
+    """forall(member(F, [Fact, ...]), assertz(F)) for (PreparedQuery, args) items."""
+    t = terms()
+    fact = t.var()
+    clauses = t.list([query.term(args)[0] for query, args in items])
+    return t.compound("forall", t.compound("member", fact, clauses), t.compound("assertz", fact)), []
+
+
+def retract(query: PreparedQuery, args) -> tuple:
+    return terms().compound("retract", query.term(args)[0]), []
+
+
+def execute(session, name: str, build, maxresult: int = -1, observe: bool = False) -> tuple:
+    """Run the goal ``build()`` makes on `session`; returns (rows, inferences or None).
+
+    `build` runs inside the query's foreign frame and returns (goal term,
+    [(output name, term ref), ...]). The caller holds the pool's query lock.
+    """
+    t = terms()
+    core = t.core
+    t.attach()
+    fid = core.PL_open_foreign_frame()
+    qid = None
+    try:
+        goal, outputs = build()
+        if session.module:
+            goal = t.compound(":", t.atom(session.module), goal)
+        if observe:
+            inf0, inf1, key = t.var(), t.var(), t.atom("inferences")
+            goal = t.compound(",", t.compound("statistics", key, inf0),
+                              t.compound(",", goal, t.compound("statistics", key, inf1)))
+        if session.deadline is not None:
+            remaining = session.deadline - time.perf_counter()
+            if remaining <= 0:
+                raise TimeoutError(f"request deadline passed before {name}")
+            limit = t.var()
+            # pyswip binds no PL_put_float, so this number is the one thing parsed
+            core.PL_chars_to_term(f"{remaining:.3f}", limit)
+            goal = t.compound("call_with_time_limit", limit, goal)
+
+        qid = core.PL_open_query(None, core.PL_Q_NODEBUG | core.PL_Q_CATCH_EXCEPTION, t.call1, goal)
+        rows, inferences = [], None
+        while maxresult and core.PL_next_solution(qid):
+            maxresult -= 1
+            rows.append({key: t.value(ref) for key, ref in outputs})
+            if observe:
+                # Counted from before the first solution to the last one returned
+                inferences = t.value(inf1) - t.value(inf0)
+        exc = core.PL_exception(qid)
+        if exc:
+            raise t.PrologError(f"Caused by: '{name}'. Returned: '{t.get_term(exc)}'.")
+        return rows, inferences
+    finally:
+        if qid is not None:
+            core.PL_cut_query(qid)
+        core.PL_discard_foreign_frame(fid)
@@ -0,0 +1,92 @@
+"""Small LRU + TTL cache for fully computed page results.
+
+Entries carry an approximate byte size and the cache evicts least recently
+used entries once `max_bytes` is exceeded. `sync_version` drops everything
+when the knowledge base fingerprint changes, so a stale result can never be
+served for a new KB.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+def approx_size(obj) -> int:
+    """Rough in-memory footprint of plain data (bytes, str, numbers, containers)."""
+    if isinstance(obj, (bytes, bytearray, str)):
+        return len(obj) + 48
+    if isinstance(obj, dict):
+        return 64 + sum(approx_size(k) + approx_size(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return 56 + sum(approx_size(x) for x in obj)
+    return 32
+
+
+class ResultCache:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 600.0):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.version = None
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    def sync_version(self, version: str):
+        """Clear the cache if the knowledge base version changed."""
+        if version == self.version:
+            return
+        with self._lock:
+            if version != self.version:
+                if self.version is not None:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._bytes = 0
+                self.version = version
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, size, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, size: int = None):
+        size = approx_size(value) if size is None else size
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (time.monotonic() + self.ttl, size, value)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, old_size, _) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+        }
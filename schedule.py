@@ -0,0 +1,165 @@
+"""Week-by-week study calendar with parallel tracks.
+
+`schedule` list-schedules a set of topics over the prerequisite DAG onto
+`tracks` parallel lanes. Ready topics are started in order of their critical
+path to the end of the plan (longest remaining chain of hours first), and a
+topic only becomes ready when all of its prerequisites have finished.
+`hours_per_week` is the learner's whole weekly cap, shared evenly by the
+tracks. Each track therefore advances ``hours_per_week / tracks`` hours a
+week, and track-hour `h` falls in week ``h * tracks // hours_per_week + 1``.
+More tracks mean more topics in flight, not more hours in a week.
+
+Slack is how many hours a topic could start later without pushing back the
+finish, taking the prerequisite order into account but not track
+contention. Critical topics have zero slack. The cost is
+O((V + E) log V) in the size of the plan.
+"""
+import heapq
+from fractions import Fraction
+
+from topic_graph import TopicGraph
+
+
+class ScheduledTopic:
+    __slots__ = ("id", "track", "start", "finish", "slack")
+
+    def __init__(self, id, track, start, finish):
+        self.id = id
+        self.track = track
+        self.start = start
+        self.finish = finish
+        self.slack = 0
+
+
+def _hours(x):
+    """Fractional hours for display: whole numbers stay ints."""
+    return int(x) if x == int(x) else round(float(x), 2)
+
+
+class Schedule:
+    __slots__ = ("topics", "order", "tracks", "hours_per_week", "makespan", "weeks")
+
+    @property
+    def track_hours_per_week(self) -> Fraction:
+        """Each track's share of the learner's weekly hours."""
+        return Fraction(self.hours_per_week, self.tracks)
+
+    @property
+    def makespan_weeks(self) -> int:
+        return -(-self.makespan * self.tracks // self.hours_per_week)
+
+    def week_of(self, hour) -> int:
+        return int(hour * self.tracks // self.hours_per_week) + 1
+
+    def calendar(self, graph: TopicGraph) -> list:
+        """[{week, hours, entries: [(topic, track, hours)]}] for every week of the plan."""
+        # One pass over the plan in units of 1/tracks hour, so week w of every
+        # track is [w * hours_per_week, (w + 1) * hours_per_week) and no
+        # fractions are needed until the hours are displayed.
+        tracks, per_week = self.tracks, self.hours_per_week
+        n_weeks = self.makespan_weeks
+        entries = [[] for _ in range(n_weeks)]
+        units = [0] * n_weeks
+        names, topics = graph.names, self.topics
+        for tid in self.order:
+            s = topics[tid]
+            name, track = names[tid], s.track + 1
+            t, finish = s.start * tracks, s.finish * tracks
+            w = int(t // per_week)
+            while t < finish:
+                end = min(finish, (w + 1) * per_week)
+                entries[w].append((name, track, _hours((end - t) / tracks)))
+                units[w] += end - t
+                t = end
+                w += 1
+        return [{'week': w + 1, 'hours': _hours(units[w] / tracks), 'entries': entries[w]}
+                for w in range(n_weeks)]
+
+    def as_dict(self, graph: TopicGraph) -> dict:
+        return {
+            'tracks': self.tracks,
+            'hours_per_week': self.hours_per_week,
+            'track_hours_per_week': _hours(self.track_hours_per_week),
+            'makespan': self.makespan,
+            'makespan_weeks': self.makespan_weeks,
+            'topics': {
+                graph.names[tid]: {'track': s.track + 1, 'start': s.start, 'finish': s.finish,
+                                   'slack': s.slack, 'week': self.week_of(s.start)}
+                for tid, s in ((tid, self.topics[tid]) for tid in self.order)
+            },
+            'critical': [graph.names[tid] for tid in self.order if self.topics[tid].slack == 0],
+            'weeks': self.calendar(graph),
+        }
+
+
+def schedule(graph: TopicGraph, topic_ids, hours_per_week: int = 10, tracks: int = 1) -> Schedule:
+    """Schedule `topic_ids`; prerequisites outside that set count as already known."""
+    if hours_per_week <= 0 or tracks <= 0:
+        raise ValueError("hours_per_week and tracks must be positive")
+    ids = list(dict.fromkeys(topic_ids))
+    rank = {t: i for i, t in enumerate(ids)}
+    records = graph.records
+    duration = {t: records[t].duration for t in ids}
+    # Dependents inside the plan, looked up once
+    deps = {t: [d for d in graph.dependents(t) if d in rank] for t in ids}
+
+    indeg = dict.fromkeys(ids, 0)
+    for t in ids:
+        for d in deps[t]:
+            indeg[d] += 1
+
+    # Topological order (Kahn), then longest remaining chain of hours per topic
+    topo = [t for t in ids if indeg[t] == 0]
+    remaining = dict(indeg)
+    for t in topo:
+        for d in deps[t]:
+            remaining[d] -= 1
+            if remaining[d] == 0:
+                topo.append(d)
+    if len(topo) < len(ids):
+        from planner import CycleError
+        placed = set(topo)
+        raise CycleError([graph.names[t] for t in ids if t not in placed])
+    tail = {}
+    for t in reversed(topo):
+        tail[t] = duration[t] + max([tail[d] for d in deps[t]], default=0)
+
+    # List scheduling: whenever tracks are free, start the ready topics with the longest tails
+    ready = [(-tail[t], rank[t], t) for t in ids if indeg[t] == 0]
+    heapq.heapify(ready)
+    free = list(range(tracks))
+    running = []
+    placed = {}
+    order = []
+    now = 0
+    while ready or running:
+        while ready and free:
+            _, _, t = heapq.heappop(ready)
+            track = heapq.heappop(free)
+            placed[t] = ScheduledTopic(t, track, now, now + duration[t])
+            order.append(t)
+            heapq.heappush(running, (now + duration[t], track, t))
+        now = running[0][0]
+        while running and running[0][0] == now:
+            _, track, t = heapq.heappop(running)
+            heapq.heappush(free, track)
+            for d in deps[t]:
+                indeg[d] -= 1
+                if indeg[d] == 0:
+                    heapq.heappush(ready, (-tail[d], rank[d], d))
+
+    makespan = max((s.finish for s in placed.values()), default=0)
+    # Latest finish that still meets the makespan, walking prerequisites backwards
+    latest_finish = {}
+    for t in reversed(topo):
+        lf = min([latest_finish[d] - duration[d] for d in deps[t]], default=makespan)
+        latest_finish[t] = lf
+        placed[t].slack = lf - placed[t].finish
+
+    out = Schedule()
+    out.topics = placed
+    out.order = order
+    out.tracks = tracks
+    out.hours_per_week = hours_per_week
+    out.makespan = makespan
+    return out
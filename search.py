@@ -0,0 +1,314 @@
+"""Path search over the edge/3 graph held in a TopicGraph.
+
+Each search returns a SearchResult carrying the path, its cost and the
+counters shown on /astar (nodes expanded, nodes generated, largest frontier,
+wall time).
+"""
+import heapq
+import time
+
+from topic_graph import TopicGraph
+
+
+class SearchResult:
+    __slots__ = ("path", "cost", "expanded", "generated", "max_frontier", "elapsed_ms")
+
+    def __init__(self, path=None, cost=0, expanded=0, generated=0, max_frontier=0, elapsed_ms=0.0):
+        self.path = path or []
+        self.cost = cost
+        self.expanded = expanded
+        self.generated = generated
+        self.max_frontier = max_frontier
+        self.elapsed_ms = elapsed_ms
+
+    @property
+    def found(self) -> bool:
+        return bool(self.path)
+
+    def as_dict(self, graph: TopicGraph = None) -> dict:
+        path = [graph.names[t] for t in self.path] if graph else list(self.path)
+        return {
+            'path': path,
+            'cost': self.cost,
+            'expanded': self.expanded,
+            'generated': self.generated,
+            'max_frontier': self.max_frontier,
+            'elapsed_ms': round(self.elapsed_ms, 3),
+        }
+
+
+def _walk_back(parent, goal) -> list:
+    path = [goal]
+    while parent[path[-1]] >= 0:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+
+def astar(graph: TopicGraph, start: int, goal: int, heuristic=None,
+          banned_nodes=(), banned_edges=None) -> SearchResult:
+    """A* with a binary heap and lazy deletion of stale entries.
+
+    `heuristic(node)` defaults to the h/2 table; the result is optimal when it
+    is consistent (LandmarkIndex.heuristic is). Nodes for which it returns
+    infinity are never queued. `banned_nodes` are skipped, and `banned_edges`
+    maps a node to the children it may not step to.
+    """
+    t0 = time.perf_counter()
+    h = heuristic or graph.heur.__getitem__
+    n = graph.n
+    inf = float("inf")
+    g = [inf] * n
+    parent = [-1] * n
+    closed = bytearray(n)
+    for b in banned_nodes:
+        closed[b] = 1
+    adj_off, adj_to, adj_w = graph.adj_off, graph.adj_to, graph.adj_w
+
+    g[start] = 0
+    h0 = h(start)
+    frontier = [(h0, 0, start)] if h0 != inf else []
+    res = SearchResult(generated=1, max_frontier=1)
+    while frontier:
+        _, gn, node = heapq.heappop(frontier)
+        if closed[node] or gn > g[node]:
+            continue
+        if node == goal:
+            res.path, res.cost = _walk_back(parent, goal), gn
+            break
+        closed[node] = 1
+        res.expanded += 1
+        skip = banned_edges.get(node) if banned_edges else None
+        for j in range(adj_off[node], adj_off[node + 1]):
+            child = adj_to[j]
+            if closed[child] or (skip and child in skip):
+                continue
+            g1 = gn + adj_w[j]
+            if g1 < g[child]:
+                hc = h(child)
+                if hc == inf:
+                    continue
+                g[child] = g1
+                parent[child] = node
+                heapq.heappush(frontier, (g1 + hc, g1, child))
+                res.generated += 1
+        if len(frontier) > res.max_frontier:
+            res.max_frontier = len(frontier)
+    res.elapsed_ms = (time.perf_counter() - t0) * 1000
+    return res
+
+
+def edge_cost(graph: TopicGraph, a: int, b: int):
+    """Weight of the cheapest edge/3 arc from `a` to `b` (None if there is none)."""
+    best = None
+    for j in range(graph.adj_off[a], graph.adj_off[a + 1]):
+        if graph.adj_to[j] == b and (best is None or graph.adj_w[j] < best):
+            best = graph.adj_w[j]
+    return best
+
+
+class Routes:
+    """The k cheapest loopless paths, cheapest first, with totals over every A* run."""
+    __slots__ = ("routes", "searches", "expanded", "elapsed_ms", "timed_out")
+
+    def __init__(self):
+        self.routes = []        # (cost, path)
+        self.searches = 0
+        self.expanded = 0
+        self.elapsed_ms = 0.0
+        self.timed_out = False
+
+    def as_dict(self, graph: TopicGraph = None) -> dict:
+        return {
+            'routes': [{'cost': cost, 'path': [graph.names[t] for t in path] if graph else list(path)}
+                       for cost, path in self.routes],
+            'searches': self.searches,
+            'expanded': self.expanded,
+            'elapsed_ms': round(self.elapsed_ms, 3),
+            'timed_out': self.timed_out,
+        }
+
+
+def k_shortest_paths(graph: TopicGraph, start: int, goal: int, k: int, heuristic=None,
+                     time_budget: float = None) -> Routes:
+    """Yen's algorithm: the `k` cheapest loopless start-goal paths by total edge weight.
+
+    Each route after the first deviates from an accepted one at a spur node.
+    The spur search is an A* run with the accepted root's nodes and the
+    already-used next edges removed. Removing nodes and edges only lengthens
+    paths, so one goal heuristic (e.g. from LandmarkIndex) stays admissible
+    for all of them. Stops early, with `timed_out` set, after `time_budget`
+    seconds.
+    """
+    t0 = time.perf_counter()
+    out = Routes()
+    first = astar(graph, start, goal, heuristic)
+    out.searches, out.expanded = 1, first.expanded
+    if first.found:
+        out.routes.append((first.cost, first.path))
+    candidates, seen = [], {tuple(first.path)}
+    while out.routes and len(out.routes) < k:
+        _, prev = out.routes[-1]
+        root_cost = 0
+        for i in range(len(prev) - 1):
+            if time_budget is not None and time.perf_counter() - t0 > time_budget:
+                out.timed_out = True
+                break
+            root = prev[:i + 1]
+            banned_edges = {}
+            for _, p in out.routes:
+                if p[:i + 1] == root:
+                    banned_edges.setdefault(p[i], set()).add(p[i + 1])
+            spur = astar(graph, prev[i], goal, heuristic, banned_nodes=root[:-1], banned_edges=banned_edges)
+            out.searches += 1
+            out.expanded += spur.expanded
+            if spur.found:
+                path = root[:-1] + spur.path
+                if tuple(path) not in seen:
+                    seen.add(tuple(path))
+                    heapq.heappush(candidates, (root_cost + spur.cost, len(path), path))
+            root_cost += edge_cost(graph, prev[i], prev[i + 1])
+        if out.timed_out or not candidates:
+            break
+        cost, _, path = heapq.heappop(candidates)
+        out.routes.append((cost, path))
+    out.elapsed_ms = (time.perf_counter() - t0) * 1000
+    return out
+
+
+def uninformed_dfs(graph: TopicGraph, start: int, goal: int) -> SearchResult:
+    """First path found by depth-first search in edge order (uninformed_dfs/5)."""
+    t0 = time.perf_counter()
+    adj_off, adj_to, adj_w = graph.adj_off, graph.adj_to, graph.adj_w
+    # A node that was fully explored without reaching the goal never will,
+    # so one visited set gives the same answer as the backtracking version.
+    visited = bytearray(graph.n)
+    visited[start] = 1
+    stack = [(start, adj_off[start], 0)]
+    res = SearchResult(generated=1, max_frontier=1)
+    if start == goal:
+        res.path = [start]
+    while stack and not res.found:
+        node, j, cost = stack[-1]
+        if j == adj_off[node]:
+            res.expanded += 1
+        if j >= adj_off[node + 1]:
+            stack.pop()
+            continue
+        stack[-1] = (node, j + 1, cost)
+        child = adj_to[j]
+        if visited[child]:
+            continue
+        visited[child] = 1
+        res.generated += 1
+        stack.append((child, adj_off[child], cost + adj_w[j]))
+        if len(stack) > res.max_frontier:
+            res.max_frontier = len(stack)
+        if child == goal:
+            res.path = [s[0] for s in stack]
+            res.cost = cost + adj_w[j]
+    res.elapsed_ms = (time.perf_counter() - t0) * 1000
+    return res
+
+
+# -- exhaustive path enumeration over prerequisite links ----------------------
+#
+# These follow exhaustive_search/6: from a topic, step to any topic that lists
+# it as a prerequisite, never revisiting a topic on the current path.
+
+def hops_to_goal(graph: TopicGraph, goal: int) -> list:
+    """Fewest prerequisite links from each topic forward to `goal` (-1 if unreachable)."""
+    dist = [-1] * graph.n
+    dist[goal] = 0
+    queue = [goal]
+    for v in queue:
+        for p in graph.prereqs(v):
+            if dist[p] < 0 and graph.is_topic(p):
+                dist[p] = dist[v] + 1
+                queue.append(p)
+    return dist
+
+
+class PathEnumeration:
+    """Lazy iterator over start→goal paths with depth, count and time cut-offs.
+
+    After iteration `limited` / `timed_out` say whether a cut-off stopped it early.
+    """
+
+    def __init__(self, graph: TopicGraph, start: int, goal: int, max_depth: int,
+                 limit: int = None, time_budget: float = None, dist: list = None):
+        self.graph = graph
+        self.start, self.goal, self.max_depth = start, goal, max_depth
+        self.limit = limit
+        self.time_budget = time_budget
+        self.dist = dist if dist is not None else hops_to_goal(graph, goal)
+        self.limited = False
+        self.timed_out = False
+
+    def __iter__(self):
+        graph, goal, dist = self.graph, self.goal, self.dist
+        if dist[self.start] < 0 or dist[self.start] > self.max_depth:
+            return
+        deadline = time.perf_counter() + self.time_budget if self.time_budget else None
+        dep_off, dep_idx = graph.dep_off, graph.dep_idx
+        path = [self.start]
+        on_path = {self.start}
+        stack = [dep_off[self.start]]
+        produced = steps = 0
+        if self.start == goal:
+            yield [self.start]
+            return
+        while stack:
+            node = path[-1]
+            j = stack[-1]
+            if j >= dep_off[node + 1]:
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+            stack[-1] = j + 1
+            nxt = dep_idx[j]
+            remaining = self.max_depth - len(path)
+            # Skip anything that cannot reach the goal within the hops left.
+            if nxt in on_path or dist[nxt] < 0 or dist[nxt] > remaining:
+                continue
+            steps += 1
+            if deadline is not None and steps & 0x3ff == 0 and time.perf_counter() > deadline:
+                self.timed_out = True
+                return
+            if nxt == goal:
+                yield path + [nxt]
+                produced += 1
+                if self.limit is not None and produced >= self.limit:
+                    self.limited = True
+                    return
+                continue
+            path.append(nxt)
+            on_path.add(nxt)
+            stack.append(dep_off[nxt])
+
+
+def count_paths(graph: TopicGraph, start: int, goal: int, max_depth: int, dist: list = None) -> int:
+    """Number of start→goal paths of at most `max_depth` links, by DP over hop counts.
+
+    Exact when the prerequisite graph is acyclic (every walk is then a simple
+    path); on a cyclic graph it is an upper bound.
+    """
+    dist = dist if dist is not None else hops_to_goal(graph, goal)
+    if dist[start] < 0 or dist[start] > max_depth:
+        return 0
+    live = [v for v in range(graph.n) if 0 <= dist[v] <= max_depth]
+    # ways[v] = paths from v to goal using at most k links, for increasing k
+    ways = {v: 0 for v in live}
+    ways[goal] = 1
+    dep_off, dep_idx = graph.dep_off, graph.dep_idx
+    for k in range(1, max_depth + 1):
+        nxt = {goal: 1}
+        for v in live:
+            if v == goal or dist[v] > k:
+                continue
+            total = 0
+            for j in range(dep_off[v], dep_off[v + 1]):
+                total += ways.get(dep_idx[j], 0)
+            nxt[v] = total
+        ways = nxt
+    return ways.get(start, 0)
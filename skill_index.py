@@ -0,0 +1,227 @@
+"""Resolves free-text skill names to topic IDs.
+
+Every surface form is reduced to a compact key: lower case, keeping only
+letters, digits, ``+`` and ``#``. So "Node.js", "node js" and "nodejs" all
+become ``nodejs``. Keys come from topic names, synonym/2 facts and
+long description words that occur in only one topic's description. A term
+resolves in this order:
+
+1. Exact key lookup, a dict hit.
+2. Trigram candidates among topic and synonym keys within a small edit
+   distance, which scales with the term length (at most 2, with an adjacent
+   transposition counting as one edit).
+3. Unresolved.
+
+Autocomplete bisects a sorted key array for the typed prefix.
+"""
+import bisect
+import re
+
+from kb_loader import read_facts
+from topic_graph import TopicGraph
+
+_NON_KEY = re.compile(r"[^a-z0-9+#]+")
+_WORD = re.compile(r"[A-Za-z][A-Za-z0-9.+#]*")
+
+# Lower is preferred when a key or a fuzzy match is ambiguous
+VIA_RANK = {"topic": 0, "synonym": 1, "description": 2}
+MIN_DESCRIPTION_WORD = 6
+MAX_FUZZY_CANDIDATES = 2000
+
+
+def compact(text: str) -> str:
+    return _NON_KEY.sub("", str(text).lower())
+
+
+def max_distance(key: str) -> int:
+    """Edit distance tolerated for a term of this length."""
+    return 0 if len(key) <= 3 else 1 if len(key) <= 7 else 2
+
+
+def _trigrams(key: str) -> set:
+    padded = f"^{key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_distance(a: str, b: str, k: int) -> int:
+    """Edit distance counting adjacent transpositions as one edit, or k + 1 once it exceeds `k`."""
+    if abs(len(a) - len(b)) > k:
+        return k + 1
+    before, prev = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cur[j] = min(cur[j], before[j - 2] + 1)
+        if min(cur) > k and (before is None or min(prev) > k):
+            return k + 1
+        before, prev = prev, cur
+    return min(prev[-1], k + 1)
+
+
+class SkillResolution:
+    __slots__ = ("ids", "names", "matches", "unresolved")
+
+    def __init__(self):
+        self.ids = []           # topic IDs, in input order, without duplicates
+        self.names = []
+        self.matches = []       # (term, topic, via, distance)
+        self.unresolved = []    # terms nothing matched
+
+    def as_dict(self) -> dict:
+        return {
+            "topics": self.names,
+            "matches": [{"term": t, "topic": n, "via": via, "distance": d} for t, n, via, d in self.matches],
+            "unresolved": self.unresolved,
+        }
+
+
+class SkillIndex:
+    """Built once per KB version; lookups never touch Prolog."""
+
+    def __init__(self, graph: TopicGraph, synonyms=()):
+        self.graph = graph
+        self.exact = {}         # key -> (topic id, via, label)
+        for rec in graph.records:
+            self._add(rec.name, rec.id, "topic", rec.name.replace("_", " "))
+        for alias, topic in synonyms:
+            tid = graph.index.get(str(topic))
+            if tid is None or tid >= graph.n_topics:
+                raise KeyError(f"synonym refers to unknown topic {topic!r}")
+            self._add(alias, tid, "synonym", str(alias).replace("_", " "))
+        # Description words that single out one topic ("orchestration" -> kubernetes)
+        owners = {}
+        for rec in graph.records:
+            for word in _WORD.findall(rec.description):
+                key = compact(word)
+                if len(key) >= MIN_DESCRIPTION_WORD:
+                    owners.setdefault(key, set()).add(rec.id)
+        for key, tids in owners.items():
+            if len(tids) == 1:
+                tid = next(iter(tids))
+                self._add(key, tid, "description", f"{graph.names[tid].replace('_', ' ')} ({key})")
+
+        self.keys = sorted(self.exact)
+        self.grams = {}
+        for i, key in enumerate(self.keys):
+            if self.exact[key][1] == "description":
+                continue        # too loose to guess at; exact and prefix hits only
+            for gram in _trigrams(key):
+                self.grams.setdefault(gram, []).append(i)
+        self._memo = {}
+
+    def _add(self, text, tid, via, label):
+        key = compact(text)
+        old = self.exact.get(key)
+        if key and (old is None or VIA_RANK[via] < VIA_RANK[old[1]]):
+            self.exact[key] = (tid, via, label)
+
+    @classmethod
+    def from_file(cls, path: str, graph: TopicGraph) -> "SkillIndex":
+        with open(path, encoding="utf-8") as fh:
+            facts = read_facts(fh.read(), {"synonym": 2})
+        return cls(graph, facts["synonym"])
+
+    # -- lookups -----------------------------------------------------------
+
+    def fuzzy(self, key: str, k: int = None):
+        """(key, distance) of the closest indexed key within `k` edits, or None.
+
+        Also None when the term is too ambiguous to guess at, i.e. its rarest
+        trigrams still point at more than MAX_FUZZY_CANDIDATES keys.
+        """
+        k = max_distance(key) if k is None else k
+        if not k:
+            return None
+        postings = sorted((self.grams.get(gram, ()) for gram in _trigrams(key)), key=len)
+        # One edit changes at most four trigrams (a transposition), so a key within k
+        # edits contains at least one of the term's 4k + 1 rarest trigrams
+        postings = postings[:4 * k + 1]
+        if sum(map(len, postings)) > MAX_FUZZY_CANDIDATES:
+            return None
+        best = None
+        keys = self.keys
+        for i in set().union(*postings):
+            cand = keys[i]
+            if abs(len(cand) - len(key)) > k:
+                continue
+            d = bounded_distance(key, cand, k)
+            if d > k:
+                continue
+            rank = (d, VIA_RANK[self.exact[cand][1]], cand)
+            if best is None or rank < best:
+                best = rank
+        return (best[2], best[0]) if best else None
+
+    def lookup(self, term: str):
+        """(topic id, via, distance) for one term, or None; results are memoised."""
+        key = compact(term)
+        if key in self._memo:
+            return self._memo[key]
+        hit = self.exact.get(key)
+        if hit is not None:
+            out = (hit[0], hit[1], 0)
+        else:
+            near = self.fuzzy(key) if key else None
+            out = None
+            if near is not None:
+                tid, via, _ = self.exact[near[0]]
+                out = (tid, via, near[1])
+        if len(self._memo) < 100_000:
+            self._memo[key] = out
+        return out
+
+    def resolve(self, terms) -> SkillResolution:
+        """Resolve a comma-separated string or an iterable of terms."""
+        if isinstance(terms, str):
+            terms = terms.split(",")
+        res = SkillResolution()
+        seen = set()
+        names = self.graph.names
+        for term in terms:
+            term = str(term).strip()
+            if not term:
+                continue
+            hit = self.lookup(term)
+            if hit is None:
+                res.unresolved.append(term)
+                continue
+            tid, via, d = hit
+            res.matches.append((term, names[tid], via, d))
+            if tid not in seen:
+                seen.add(tid)
+                res.ids.append(tid)
+                res.names.append(names[tid])
+        return res
+
+    def mask(self, terms) -> int:
+        m = 0
+        for tid in self.resolve(terms).ids:
+            m |= 1 << tid
+        return m
+
+    def complete(self, prefix: str, limit: int = 10) -> list:
+        """Suggestions for a partly typed skill: topics whose keys start with it, else near misses."""
+        key = compact(prefix)
+        if not key:
+            return []
+        keys = self.keys
+        found = {}
+        i = bisect.bisect_left(keys, key)
+        # Scan a bounded window of the prefix range, then keep the best entry per topic
+        for cand in keys[i:i + limit * 4]:
+            if not cand.startswith(key):
+                break
+            tid, via, label = self.exact[cand]
+            rank = (VIA_RANK[via], len(cand), cand)
+            if tid not in found or rank < found[tid][0]:
+                found[tid] = (rank, via, label)
+        if not found:
+            near = self.fuzzy(key)
+            if near is not None:
+                tid, via, label = self.exact[near[0]]
+                found[tid] = ((0, 0, ""), via, label)
+        names = self.graph.names
+        ordered = sorted(found.items(), key=lambda item: item[1][0])[:limit]
+        return [{"topic": names[tid], "label": label, "via": via} for tid, (_, via, label) in ordered]
@@ -0,0 +1,24 @@
+"""AND-OR graph validation."""
+import pytest
+
+from aostar import AndOrGraph, AOStar
+from conftest import KB_PATH
+from kb_versions import KBRegistry, KBValidationError
+
+
+def test_empty_alternatives_are_rejected():
+    with pytest.raises(ValueError, match="no alternatives"):
+        AndOrGraph([("course", [["a", "b"]]), ("a", [])])
+
+
+def test_empty_and_set_still_solves():
+    res = AOStar(AndOrGraph([("course", [[], ["a"]])])).solve("course")
+    assert res.cost == 0
+
+
+def test_registry_rejects_empty_alternatives(tmp_path):
+    path = tmp_path / "kb.pl"
+    with open(KB_PATH, encoding="utf-8") as fh:
+        path.write_text(fh.read() + "\nandor(broken, []).\n", encoding="utf-8")
+    with pytest.raises(KBValidationError, match="no alternatives"):
+        KBRegistry(str(path), store_dir=str(tmp_path / "store"))
@@ -0,0 +1,52 @@
+"""Bulk recommendations: malformed profiles and the plan cache."""
+import json
+
+import pytest
+
+import batch
+from batch import BatchRecommender
+from conftest import KB_PATH
+from planner import plan_goal
+from topic_graph import TopicGraph
+
+
+@pytest.fixture(scope="module")
+def graph():
+    return TopicGraph.from_file(KB_PATH)
+
+
+def test_malformed_profiles_get_an_error_line_each(graph):
+    profiles = [
+        {"goal": "frontend_dev", "skills": None},
+        {"goal": "frontend_dev", "skills": 5},
+        {"goal": "frontend_dev", "skills": ["html", 3]},
+        {"goal": "frontend_dev", "skills": {"html": True}},
+        {"goal": "frontend_dev", "order_by": ["duration"]},
+        {"goal": "frontend_dev", "hours": [40]},
+        {"goal": ["frontend_dev"]},
+        "frontend_dev",
+        None,
+        {"goal": "frontend_dev", "skills": ["html"], "hours": 40, "id": "ok"},
+    ]
+    out = list(BatchRecommender(graph).recommend_many(profiles))
+    assert [o["index"] for o in out] == list(range(len(profiles)))
+    assert all("error" in o for o in out[:-1])
+    last = out[-1]
+    assert last["id"] == "ok" and "error" not in last
+    assert last["path"] == [graph.names[t] for t in plan_goal(graph, "frontend_dev", graph.mask(["html"]))]
+
+
+def test_ndjson_stream_survives_bad_profiles(graph):
+    lines = list(BatchRecommender(graph).ndjson([{"goal": "frontend_dev", "skills": 5},
+                                                 {"goal": "frontend_dev", "skills": "html"}]))
+    rows = [json.loads(line) for line in lines]
+    assert "error" in rows[0] and "path" in rows[1]
+
+
+def test_plan_cache_is_capped(graph, monkeypatch):
+    monkeypatch.setattr(batch, "MAX_CACHED", 3)
+    rec = BatchRecommender(graph)
+    topics = graph.names[:graph.n_topics]
+    for i, t in enumerate(topics[:10]):
+        rec.recommend({"goal": "frontend_dev", "skills": t, "order_by": "duration" if i % 2 else ""})
+    assert len(rec._plans) <= 3 and len(rec._masks) <= 3
@@ -0,0 +1,57 @@
+"""fit_budget against brute force over every subset of a goal's topics."""
+import itertools
+import random
+
+import pytest
+
+from budget import fit_budget
+from conftest import KB_PATH
+from planner import _closure_postorder
+from topic_graph import TopicGraph
+
+
+@pytest.fixture(scope="module")
+def graph():
+    return TopicGraph.from_file(KB_PATH)
+
+
+def brute_force(graph, goals, budget, known, weight):
+    """(value, hours) of the best subset: most value, then fewest hours."""
+    best = (0, 0)
+    for r in range(1, len(goals) + 1):
+        for subset in itertools.combinations(goals, r):
+            need = set(_closure_postorder(graph, subset, known))
+            hours = sum(graph.records[t].duration for t in need)
+            if hours <= budget:
+                value = sum(weight[t] for t in goals if t in need)
+                if (value, -hours) > (best[0], -best[1]):
+                    best = (value, hours)
+    return best
+
+
+def check(graph, goal, budget, known, weights=None):
+    goals = [t for t in dict.fromkeys(graph.goal_ids(goal)) if not known >> t & 1]
+    weight = {t: (weights or {}).get(t, 1) for t in goals}
+    plan = fit_budget(graph, graph.goal_ids(goal), budget, known, weights, time_limit=10)
+    assert plan.optimal
+    assert (plan.value, plan.hours) == brute_force(graph, goals, budget, known, weight), (goal, budget)
+    # The plan is what it claims: within budget, prerequisite-closed, goal topics covered
+    assert plan.hours == sum(graph.records[t].duration for t in plan.topics) <= budget
+    assert set(plan.topics) == set(_closure_postorder(graph, plan.covered, known))
+
+
+def test_optimal_on_every_goal(graph):
+    for goal in graph.goals:
+        full = sum(graph.records[t].duration for t in _closure_postorder(graph, graph.goal_ids(goal), 0))
+        for budget in range(0, full + 10, 5):
+            check(graph, goal, budget, 0)
+
+
+def test_optimal_with_known_skills_and_weights(graph):
+    rng = random.Random(0)
+    topics = graph.names[:graph.n_topics]
+    for goal in graph.goals:
+        for _ in range(5):
+            known = graph.mask(rng.sample(topics, rng.randint(0, 10)))
+            weights = {t: rng.randint(1, 5) for t in graph.goal_ids(goal)}
+            check(graph, goal, rng.randint(10, 120), known, weights)
@@ -0,0 +1,28 @@
+"""ChartService: charts queued by one worker served by another through the shared directory."""
+from charts import ChartService
+
+SPECS = {'difficulty': {'kind': 'difficulty', 'goal': 'g', 'counts': {'beginner': 2, 'advanced': 1}}}
+
+
+def test_a_chart_another_worker_is_still_drawing_is_rendered_here(tmp_path, monkeypatch):
+    a, b = ChartService(dpi=30, directory=str(tmp_path)), ChartService(dpi=30, directory=str(tmp_path))
+    # Worker a queues the render but has not finished it
+    monkeypatch.setattr(a, "_submit", lambda digest, spec: None)
+    name = a.ensure(SPECS, wait=False)['difficulty']
+    assert not (tmp_path / name).exists()
+
+    data, mimetype = b.get(name, timeout=30)
+    assert mimetype == "image/png" and data[:4] == b"\x89PNG"
+
+
+def test_a_spec_for_other_render_settings_is_not_used(tmp_path):
+    a, b = ChartService(dpi=30, directory=str(tmp_path)), ChartService(dpi=40, directory=str(tmp_path))
+    name = a.ensure(SPECS, wait=False)['difficulty']
+    assert b.get(name) is None
+    assert a.get(name, timeout=30)[0][:4] == b"\x89PNG"
+
+
+def test_unknown_charts_are_none(tmp_path):
+    service = ChartService(directory=str(tmp_path))
+    assert service.get("0" * 40 + ".png") is None
+    assert service.get("../etc.png") is None
@@ -0,0 +1,109 @@
+"""Snapshot file format, SnapshotGraph against TopicGraph.from_file, KBBuilder validation."""
+import json
+import os
+import shutil
+from array import array
+
+import pytest
+
+import kb_snapshot
+from conftest import KB_PATH
+from kb_snapshot import KBBuilder, ValidationError, load_graph, open_snapshot, read_prolog, write_snapshot
+from kb_versions import KBRegistry, KBValidationError
+from planner import plan_goal
+from topic_graph import TopicGraph
+
+
+@pytest.fixture(scope="module")
+def snap(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("snap") / "kb.snap")
+    assert kb_snapshot.main(["from-prolog", KB_PATH, "-o", path]) == 0
+    return path
+
+
+def test_sections_round_trip(tmp_path):
+    path = str(tmp_path / "s.snap")
+    sections = {"ints": array('i', [1, -2, 3]), "blob": b"hello", "empty": array('i'), "more": array('i', [7])}
+    write_snapshot(path, sections)
+    got = open_snapshot(path)
+    assert list(got["ints"]) == [1, -2, 3]
+    assert bytes(got["blob"]) == b"hello"
+    assert list(got["empty"]) == [] and list(got["more"]) == [7]
+    with open(path, "rb") as fh:
+        raw = fh.read()
+    assert raw[:4] == kb_snapshot.MAGIC and len(raw) % 8 == 0
+    for i in range(len(sections)):
+        _, off, _, _ = kb_snapshot._SECTION.unpack_from(raw, kb_snapshot._HEADER.size + i * kb_snapshot._SECTION.size)
+        assert off % 8 == 0
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "not.snap"
+    path.write_bytes(b"XXXX" + bytes(64))
+    with pytest.raises(ValueError, match="not a version"):
+        open_snapshot(str(path))
+
+
+def test_snapshot_graph_matches_the_parsed_source(snap):
+    want = TopicGraph.from_file(KB_PATH)
+    got = load_graph(snap)
+    assert (got.n, got.n_topics) == (want.n, want.n_topics)
+    assert got.names == want.names and got.index == want.index
+    assert [r.as_dict() for r in got.records] == [r.as_dict() for r in want.records]
+    assert got.prereq_mask == want.prereq_mask
+    for key in ("pre_off", "pre_idx", "dep_off", "dep_idx", "adj_off", "adj_to", "adj_w", "heur"):
+        assert list(getattr(got, key)) == list(getattr(want, key)), key
+    assert {g: list(ids) for g, ids in got.goals.items()} == {g: list(ids) for g, ids in want.goals.items()}
+    assert [got.ancestors(t) for t in range(got.n)] == [want.ancestors(t) for t in range(want.n)]
+    for goal in want.goals:
+        assert plan_goal(got, goal, 0) == plan_goal(want, goal, 0)
+
+
+def test_from_prolog_records_the_source_digest(snap):
+    assert load_graph(snap).source_digest == kb_snapshot.file_digest(KB_PATH)
+
+
+def test_jsonl_import_with_prolog_matches_the_written_source(tmp_path):
+    src = tmp_path / "catalog.jsonl"
+    src.write_text("\n".join(json.dumps(r) for r in [
+        {"type": "topic", "name": "html", "prereqs": [], "duration": 5, "difficulty": "beginner",
+         "category": "web", "description": "Markup"},
+        {"type": "topic", "name": "css", "prereqs": ["html"], "duration": 6, "difficulty": "beginner",
+         "category": "web", "description": "It's style"},
+        {"type": "goal", "name": "web", "topics": ["css"]},
+    ]) + "\n", encoding="utf-8")
+    pl, out = str(tmp_path / "catalog.pl"), str(tmp_path / "catalog.snap")
+    assert kb_snapshot.main(["import", str(src), "--prolog", pl, "-o", out]) == 0
+    graph = load_graph(out)
+    assert graph.source_digest == kb_snapshot.file_digest(pl)
+    assert graph.names == ["html", "css"] and graph.records[1].description == "It's style"
+    reparsed = KBBuilder().add_records(read_prolog(pl)).sections()
+    assert bytes(reparsed["name_blob"]) == b"htmlcss"
+
+
+@pytest.mark.parametrize("records,problem", [
+    ([("topic", ("a", [], 1, "x", "y", "z")), ("topic", ("a", [], 2, "x", "y", "z"))], "duplicate topic a"),
+    ([("topic", ("a", ["ghost"], 1, "x", "y", "z"))], "a requires unknown topic ghost"),
+    ([("topic", ("a", [], 1, "x", "y", "z")), ("goal", ("g", ["a", "ghost"]))], "goal g lists unknown topic ghost"),
+    ([("topic", ("a", ["b"], 1, "x", "y", "z")), ("topic", ("b", ["a"], 1, "x", "y", "z")),
+      ("topic", ("c", [], 1, "x", "y", "z"))], "prerequisite cycle involving a, b"),
+    ([("topic", ("a", [], "soon", "x", "y", "z"))], "topic a: bad duration 'soon'"),
+])
+def test_builder_rejects_inconsistent_catalogues(records, problem):
+    with pytest.raises(ValidationError) as e:
+        KBBuilder().add_records(records).sections()
+    assert e.value.problems == [problem]
+
+
+def test_registry_refuses_a_snapshot_of_another_source(snap, tmp_path):
+    kb = tmp_path / "learningpath.pl"
+    shutil.copy(KB_PATH, kb)
+    store = str(tmp_path / "store")
+    registry = KBRegistry(str(kb), snapshot=snap, store_dir=store)
+    assert registry.current.graph.source_digest == kb_snapshot.file_digest(str(kb))
+
+    with open(kb, "a", encoding="utf-8") as fh:
+        fh.write("\nsynonym(js, javascript).\n")
+    with pytest.raises(KBValidationError, match="not made from this learningpath.pl"):
+        KBRegistry(str(kb), snapshot=snap, store_dir=store)
+    assert os.listdir(store) == [os.path.basename(registry.current.source)]
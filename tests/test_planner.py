@@ -0,0 +1,97 @@
+"""plan_path: tie-breaks against brute force over topological orders, cycles, unknown topics."""
+import itertools
+import random
+
+import pytest
+
+from planner import TIE_BREAKS, CycleError, PlanError, _closure_postorder, plan_goal, plan_path
+from topic_graph import TopicGraph
+
+DIFFICULTIES = ["beginner", "intermediate", "advanced"]
+CATEGORIES = ["web", "data", "ops"]
+
+
+def random_kb(seed: int, n: int = 9) -> TopicGraph:
+    rng = random.Random(seed)
+    names = [f"t{i}" for i in range(n)]
+    topics = []
+    for b in range(n):
+        prereqs = [names[a] for a in range(b) if rng.random() < 0.25]
+        topics.append((names[b], prereqs, rng.randint(1, 4), rng.choice(DIFFICULTIES),
+                       rng.choice(CATEGORIES), ""))
+    return TopicGraph(topics)
+
+
+def closure(graph: TopicGraph, roots, known: int) -> set:
+    out, stack = set(), [r for r in roots if not known >> r & 1]
+    while stack:
+        t = stack.pop()
+        if t not in out:
+            out.add(t)
+            stack.extend(p for p in graph.prereqs(t) if not known >> p & 1)
+    return out
+
+
+def best_order(graph: TopicGraph, roots, known: int, tie_break) -> list:
+    """The topological order whose priorities are lexicographically smallest, by brute force."""
+    rank = {t: i for i, t in enumerate(_closure_postorder(graph, roots, known))}
+    keys = [TIE_BREAKS[k] for k in tie_break]
+
+    def priority(t):
+        return tuple(k(graph.records[t]) for k in keys) + (rank[t],)
+
+    best = None
+    for order in itertools.permutations(rank):
+        pos = {t: i for i, t in enumerate(order)}
+        if all(pos[p] < pos[t] for t in order for p in graph.prereqs(t) if p in pos):
+            cand = [priority(t) for t in order]
+            if best is None or cand < best[0]:
+                best = (cand, list(order))
+    return best[1]
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_tie_breaks_pick_the_best_ready_topic_first(seed):
+    graph = random_kb(seed)
+    rng = random.Random(seed)
+    roots = rng.sample(range(graph.n_topics // 2, graph.n_topics), 3)
+    known = graph.mask([graph.names[rng.randrange(graph.n_topics // 2)]])
+    for tie_break in [(), ("duration",), ("difficulty", "category"), ("category", "duration")]:
+        got = plan_path(graph, roots, known, tie_break)
+        assert set(got) == closure(graph, roots, known)
+        assert got == best_order(graph, roots, known, tie_break)
+
+
+def test_default_order_is_the_dfs_postorder():
+    graph = random_kb(4, n=12)
+    roots = [11, 7]
+    assert plan_path(graph, roots) == _closure_postorder(graph, roots, 0)
+
+
+def test_tie_break_may_be_a_comma_separated_string():
+    graph = random_kb(2)
+    roots = list(range(graph.n_topics))
+    assert plan_path(graph, roots, 0, "difficulty, duration") == plan_path(graph, roots, 0, ("difficulty", "duration"))
+
+
+def test_known_topics_are_left_out_with_their_prerequisites():
+    graph = TopicGraph([("a", [], 1, "beginner", "x", ""), ("b", ["a"], 1, "beginner", "x", ""),
+                        ("c", ["b"], 1, "beginner", "x", "")], goals=[("g", ["c"])])
+    assert [graph.names[t] for t in plan_goal(graph, "g")] == ["a", "b", "c"]
+    assert [graph.names[t] for t in plan_goal(graph, "g", graph.mask(["b"]))] == ["c"]
+    with pytest.raises(KeyError):
+        plan_goal(graph, "nope")
+
+
+def test_cycles_raise_cycle_error():
+    graph = TopicGraph([("a", ["c"], 1, "beginner", "x", ""), ("b", ["a"], 1, "beginner", "x", ""),
+                        ("c", ["b"], 1, "beginner", "x", ""), ("d", ["c"], 1, "beginner", "x", "")])
+    with pytest.raises(CycleError) as e:
+        plan_path(graph, [graph.id("d")])
+    assert set(e.value.cycle) >= {"a", "b", "c"}
+
+
+def test_unknown_prerequisites_raise_plan_error():
+    graph = TopicGraph([("a", ["ghost"], 1, "beginner", "x", "")])
+    with pytest.raises(PlanError, match="a requires unknown topic ghost"):
+        plan_path(graph, [graph.id("a")])
@@ -0,0 +1,66 @@
+"""ProgressStore against a replay of the full log."""
+import os
+import random
+import threading
+
+from progress_store import NOT_STARTED, ProgressStore
+
+STATUSES = ["in_progress", "complete", "completed", "paused"]
+
+
+def test_nothing_is_created_before_first_use(tmp_path):
+    path = tmp_path / "progress.db"
+    ProgressStore(str(path))
+    assert not os.path.exists(path)
+
+
+def test_latest_status_matches_a_replay_of_the_log(tmp_path):
+    store = ProgressStore(str(tmp_path / "progress.db"))
+    rng = random.Random(0)
+    users, topics = ["ann", "bo"], [f"t{i}" for i in range(30)]
+    log = []
+    for step in range(600):
+        # Timestamps arrive out of order; the newest one must win, later writes on ties
+        entry = (rng.choice(users), rng.choice(topics), rng.choice(STATUSES), float(rng.randint(0, 200)))
+        log.append(entry)
+        if step % 7:
+            store.record(*entry)
+        else:
+            store.record_many([entry])
+
+    for user in users:
+        latest = {}
+        for u, topic, status, ts in log:
+            if u == user and (topic not in latest or ts >= latest[topic][1]):
+                latest[topic] = (status, ts)
+        wanted = topics + ["never_seen"]
+        assert store.status_for(user, wanted) == {t: latest[t][0] if t in latest else NOT_STARTED for t in wanted}
+        assert store.completed(user, wanted) == {t for t, (s, _) in latest.items() if s in ("complete", "completed")}
+        history = store.history(user)
+        assert set(history) == set(latest)
+        for topic, entries in history.items():
+            stamps = [ts for _, ts in entries]
+            assert stamps == sorted(stamps, reverse=True)
+            assert sorted(entries) == sorted((s, ts) for u, t, s, ts in log if u == user and t == topic)
+
+
+def test_status_for_many_topics_crosses_the_parameter_chunks(tmp_path):
+    store = ProgressStore(str(tmp_path / "progress.db"))
+    topics = [f"t{i}" for i in range(1200)]
+    store.record_many(("u", t, "complete", 1.0) for t in topics[::3])
+    assert store.completed("u", topics) == set(topics[::3])
+
+
+def test_threads_share_the_file(tmp_path):
+    store = ProgressStore(str(tmp_path / "progress.db"))
+
+    def work(i):
+        for j in range(20):
+            store.record(f"user{i}", f"t{j}", "complete")
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for i in range(4):
+        assert len(store.completed(f"user{i}", [f"t{j}" for j in range(20)])) == 20
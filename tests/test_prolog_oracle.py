@@ -0,0 +1,89 @@
+"""TopicGraph and the planner against the Prolog predicates they replace.
+
+learningpath.pl stays the reference: path_to_goal/2, all_prerequisites/2,
+cannot_learn/1 and can_learn/1 are asked the same questions as the Python
+code, for every goal and topic under sampled known-skill sets. Skipped
+when SWI-Prolog (or pyswip) is not available.
+"""
+import random
+
+import pytest
+
+from conftest import KB_PATH
+from planner import plan_goal
+from prolog_pool import PrologPool
+from prolog_query import PreparedQuery
+from topic_graph import TopicGraph
+
+KNOWN = PreparedQuery("known(+atom)")
+PATH_TO_GOAL = PreparedQuery("path_to_goal(+atom, -Path)")
+ALL_PREREQUISITES = PreparedQuery("all_prerequisites(+atom, -Prereqs)")
+CANNOT_LEARN = PreparedQuery("cannot_learn(-Topic)")
+CAN_LEARN = PreparedQuery("can_learn(-Topic)")
+TOPIC = PreparedQuery("topic(+atom, -Prereqs, -Duration, -Difficulty, -Category, -Description)")
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = PrologPool(KB_PATH)
+    try:
+        pool.load()
+    except Exception as e:      # no SWI-Prolog, or pyswip missing
+        pytest.skip(f"SWI-Prolog unavailable: {type(e).__name__}: {e}")
+    return pool
+
+
+@pytest.fixture(scope="module")
+def graph():
+    return TopicGraph.from_file(KB_PATH)
+
+
+def known_sets(graph, count=8, seed=0):
+    rng = random.Random(seed)
+    topics = graph.names[:graph.n_topics]
+    yield []
+    for _ in range(count):
+        yield rng.sample(topics, rng.randint(1, len(topics) // 2))
+
+
+def test_plan_goal_matches_path_to_goal(pool, graph):
+    for skills in known_sets(graph):
+        with pool.session() as s:
+            s.assertz_many((KNOWN, (k,)) for k in skills)
+            for goal in graph.goals:
+                rows = s.run(PATH_TO_GOAL, goal, maxresult=1)
+                expected = [str(t) for t in rows[0]["Path"]]
+                assert [graph.names[t] for t in plan_goal(graph, goal, graph.mask(skills))] == expected, \
+                    (goal, skills)
+
+
+def test_ancestors_match_all_prerequisites(pool, graph):
+    with pool.session() as s:
+        for t in range(graph.n_topics):
+            rows = s.run(ALL_PREREQUISITES, graph.names[t], maxresult=1)
+            assert set(graph.names_of(graph.ancestors(t))) == {str(p) for p in rows[0]["Prereqs"]}, \
+                graph.names[t]
+
+
+def test_unlearnable_topics_match_cannot_learn(pool, graph):
+    for skills in known_sets(graph):
+        known = graph.mask(skills)
+        missing = graph.missing_prereqs(known)
+        with pool.session() as s:
+            s.assertz_many((KNOWN, (k,)) for k in skills)
+            cannot = {str(r["Topic"]) for r in s.run(CANNOT_LEARN)}
+            can = {str(r["Topic"]) for r in s.run(CAN_LEARN)}
+            assert {graph.names[t] for t in missing} == cannot, skills
+            assert set(graph.names_of(graph.learnable(known))) == can, skills
+            # The per-topic question /unlearnable-topics used to ask Prolog
+            for t, gap in missing.items():
+                prereqs = {str(p) for p in s.run(TOPIC, graph.names[t])[0]["Prereqs"]}
+                assert set(graph.names_of(gap)) == prereqs - set(skills)
+
+
+def test_info_many_matches_topic_facts(pool, graph):
+    with pool.session() as s:
+        for rec in graph.info_many(range(graph.n_topics)):
+            row = s.run(TOPIC, rec.name)[0]
+            assert (row["Duration"], str(row["Difficulty"]), str(row["Category"])) == \
+                (rec.duration, rec.difficulty, rec.category)
@@ -0,0 +1,103 @@
+"""ResultCache against a plain-list model of LRU eviction and TTL expiry."""
+import random
+from types import SimpleNamespace
+
+import pytest
+
+import result_cache
+from result_cache import ResultCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(result_cache, "time", SimpleNamespace(monotonic=c))
+    return c
+
+
+class Model:
+    """Entries as [key, expires_at, size, value], least recently used first."""
+
+    def __init__(self, max_bytes, ttl):
+        self.max_bytes, self.ttl = max_bytes, ttl
+        self.entries = []
+
+    def find(self, key):
+        return next((e for e in self.entries if e[0] == key), None)
+
+    def get(self, key, now):
+        e = self.find(key)
+        if e is None:
+            return None
+        self.entries.remove(e)
+        if e[1] < now:
+            return None
+        self.entries.append(e)
+        return e[3]
+
+    def put(self, key, value, size, now):
+        if size > self.max_bytes:
+            return
+        e = self.find(key)
+        if e is not None:
+            self.entries.remove(e)
+        self.entries.append([key, now + self.ttl, size, value])
+        while sum(e[2] for e in self.entries) > self.max_bytes:
+            self.entries.pop(0)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_the_model(clock, seed):
+    rng = random.Random(seed)
+    cache, model = ResultCache(max_bytes=100, ttl=5.0), Model(100, 5.0)
+    for step in range(2000):
+        key = rng.randrange(12)
+        if rng.random() < 0.5:
+            size = rng.randint(1, 40) if rng.random() < 0.95 else 150
+            cache.put(key, step, size)
+            model.put(key, step, size, clock.now)
+        else:
+            assert cache.get(key) == model.get(key, clock.now)
+        clock.now += rng.choice([0, 0, 0.1, 0.5, 2.0])
+        assert cache.stats()["bytes"] == sum(e[2] for e in model.entries) <= 100
+        assert list(cache._entries) == [e[0] for e in model.entries]
+
+
+def test_least_recently_used_goes_first(clock):
+    cache = ResultCache(max_bytes=30, ttl=60)
+    for key in "abc":
+        cache.put(key, key, 10)
+    assert cache.get("a") == "a"            # b is now the oldest
+    cache.put("d", "d", 10)
+    assert cache.get("b") is None
+    assert [cache.get(k) for k in "acd"] == ["a", "c", "d"]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResultCache(ttl=10)
+    cache.put("k", "v")
+    clock.now += 10
+    assert cache.get("k") == "v"
+    clock.now += 0.01
+    assert cache.get("k") is None
+    s = cache.stats()
+    assert (s["hits"], s["misses"], s["expirations"], s["entries"], s["bytes"]) == (1, 1, 1, 0, 0)
+
+
+def test_new_kb_version_drops_everything(clock):
+    cache = ResultCache()
+    cache.sync_version("v1")
+    cache.put("k", "v")
+    cache.sync_version("v1")
+    assert cache.get("k") == "v"
+    cache.sync_version("v2")
+    assert cache.get("k") is None and cache.stats()["invalidations"] == 1
@@ -0,0 +1,90 @@
+"""schedule: prerequisite order, track exclusivity, the weekly cap and slack."""
+import os
+import sys
+from functools import lru_cache
+
+import pytest
+
+from conftest import KB_PATH, ROOT
+from schedule import schedule
+from topic_graph import TopicGraph
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+from synthetic_kb import generate  # noqa: E402
+
+SETTINGS = [(10, 1), (10, 3), (7, 3), (12, 5)]     # (hours_per_week, tracks)
+
+
+def graphs():
+    yield "demo", TopicGraph.from_file(KB_PATH)
+    for seed in range(3):
+        yield f"synthetic-{seed}", generate(300, seed=seed).graph()
+
+
+@pytest.fixture(scope="module", params=list(graphs()), ids=lambda p: p[0])
+def graph(request):
+    return request.param[1]
+
+
+@pytest.mark.parametrize("hours_per_week,tracks", SETTINGS)
+def test_prerequisites_finish_first(graph, hours_per_week, tracks):
+    s = schedule(graph, range(graph.n_topics), hours_per_week, tracks)
+    assert sorted(s.order) == list(range(graph.n_topics))
+    for t, slot in s.topics.items():
+        for p in graph.prereqs(t):
+            assert s.topics[p].finish <= slot.start
+
+
+@pytest.mark.parametrize("hours_per_week,tracks", SETTINGS)
+def test_one_topic_per_track_at_a_time(graph, hours_per_week, tracks):
+    s = schedule(graph, range(graph.n_topics), hours_per_week, tracks)
+    by_track = {}
+    for slot in s.topics.values():
+        assert 0 <= slot.track < tracks
+        by_track.setdefault(slot.track, []).append((slot.start, slot.finish))
+    for spans in by_track.values():
+        spans.sort()
+        for (_, f), (st, _) in zip(spans, spans[1:]):
+            assert f <= st
+
+
+@pytest.mark.parametrize("hours_per_week,tracks", SETTINGS)
+def test_weeks_stay_within_the_cap(graph, hours_per_week, tracks):
+    s = schedule(graph, range(graph.n_topics), hours_per_week, tracks)
+    weeks = s.as_dict(graph)["weeks"]
+    assert len(weeks) == s.makespan_weeks
+    eps = 0.01 * len(graph.names)      # display rounding, at most 0.005h per entry
+    for week in weeks:
+        assert week["hours"] <= hours_per_week + 1e-9
+        per_track = {}
+        for _, track, hours in week["entries"]:
+            per_track[track] = per_track.get(track, 0) + hours
+        for hours in per_track.values():
+            assert hours <= hours_per_week / tracks + 0.01 * len(week["entries"])
+    total = sum(graph.records[t].duration for t in range(graph.n_topics))
+    assert sum(e[2] for w in weeks for e in w["entries"]) == pytest.approx(total, abs=eps)
+
+
+@pytest.mark.parametrize("hours_per_week,tracks", SETTINGS)
+def test_slack_is_room_before_the_longest_remaining_chain(graph, hours_per_week, tracks):
+    s = schedule(graph, range(graph.n_topics), hours_per_week, tracks)
+
+    @lru_cache(maxsize=None)
+    def after(t):
+        """Hours of the longest chain of dependents that must follow t."""
+        return max((graph.records[d].duration + after(d) for d in graph.dependents(t)), default=0)
+
+    for t, slot in s.topics.items():
+        assert slot.slack == s.makespan - slot.finish - after(t)
+        assert slot.slack >= 0
+    d = s.as_dict(graph)
+    assert d["critical"] == [graph.names[t] for t in s.order if s.topics[t].slack == 0]
+    assert any(s.topics[t].finish == s.makespan for t in s.order if s.topics[t].slack == 0)
+
+
+def test_prerequisites_outside_the_plan_count_as_known():
+    graph = TopicGraph.from_file(KB_PATH)
+    goal = [t for t in range(graph.n_topics) if len(graph.prereqs(t))][0]
+    s = schedule(graph, [goal], 10, 2)
+    assert s.topics[goal].start == 0
+    assert s.makespan == graph.records[goal].duration
@@ -0,0 +1,165 @@
+"""Path search on random weighted DAGs, checked against brute force."""
+import random
+
+import pytest
+
+import search
+from landmarks import LandmarkIndex
+from topic_graph import TopicGraph
+
+INF = float("inf")
+
+
+def random_dag(seed: int, n: int = 12, p: float = 0.4) -> TopicGraph:
+    rng = random.Random(seed)
+    names = [f"t{i}" for i in range(n)]
+    topics = [(name, [], 1, "beginner", "test", "") for name in names]
+    edges = [(names[a], names[b], rng.randint(1, 9))
+             for a in range(n) for b in range(a + 1, n) if rng.random() < p]
+    return TopicGraph(topics, edges)
+
+
+def all_paths(graph: TopicGraph, start: int, goal: int) -> list:
+    """Every loopless start-goal path as (cost, path), cheapest first."""
+    out = []
+
+    def walk(v, path, cost):
+        if v == goal:
+            out.append((cost, path))
+            return
+        for u, w in graph.neighbours(v):
+            if u not in path:
+                walk(u, path + [u], cost + w)
+    walk(start, [start], 0)
+    return sorted(out, key=lambda r: r[0])
+
+
+def path_cost(graph: TopicGraph, path: list):
+    return sum(search.edge_cost(graph, a, b) for a, b in zip(path, path[1:]))
+
+
+def pairs(graph: TopicGraph, rng: random.Random, count: int = 8):
+    """(start, goal) pairs, mostly forwards so that most have several paths."""
+    n = graph.n_topics
+    out = []
+    for i in range(count):
+        a, b = sorted(rng.sample(range(n), 2))
+        out.append((a, b) if i % 4 else (b, a))
+    return out
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_k_shortest_paths_match_brute_force(seed):
+    graph = random_dag(seed)
+    index = LandmarkIndex(graph, count=4)
+    rng = random.Random(seed)
+    for start, goal in pairs(graph, rng):
+        expected = all_paths(graph, start, goal)
+        for k in (1, 3, 10):
+            for h in (lambda v: 0, index.heuristic(goal)):
+                routes = search.k_shortest_paths(graph, start, goal, k, h).routes
+                assert [c for c, _ in routes] == [c for c, _ in expected[:k]]
+                paths = [tuple(p) for _, p in routes]
+                assert len(set(paths)) == len(paths)
+                for cost, path in routes:
+                    assert path[0] == start and path[-1] == goal
+                    assert len(set(path)) == len(path)
+                    assert path_cost(graph, path) == cost
+
+
+def test_k_shortest_paths_to_an_unreachable_goal_is_empty():
+    graph = random_dag(0)
+    index = LandmarkIndex(graph)
+    last = graph.n_topics - 1
+    routes = search.k_shortest_paths(graph, last, 0, 5, index.heuristic(0))
+    assert routes.routes == []
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_landmark_heuristic_is_admissible_and_consistent(seed):
+    graph = random_dag(seed)
+    index = LandmarkIndex(graph, count=4)
+    n = graph.n_topics
+    for goal in range(n):
+        h = index.heuristic(goal)
+        for v in range(n):
+            paths = all_paths(graph, v, goal)
+            dist = paths[0][0] if paths else INF
+            assert h(v) <= dist
+            if dist < INF:
+                for u, w in graph.neighbours(v):
+                    assert h(v) <= w + h(u)
+            res = search.astar(graph, v, goal, h)
+            assert res.found == (dist < INF)
+            if res.found:
+                assert res.cost == dist
+
+
+def test_landmark_heuristic_is_infinite_when_goal_reaches_a_landmark_v_cannot():
+    # Two components: a -> b and c -> d; with four landmarks every end is one
+    topics = [(name, [], 1, "beginner", "test", "") for name in "abcd"]
+    graph = TopicGraph(topics, [("a", "b", 1), ("c", "d", 2)])
+    index = LandmarkIndex(graph, count=4)
+    assert sorted(graph.names[v] for v in index.landmarks) == ["a", "b", "c", "d"]
+    h = index.heuristic(graph.id("b"))
+    assert h(graph.id("c")) == INF and h(graph.id("d")) == INF
+    assert h(graph.id("a")) <= 1
+    assert not search.astar(graph, graph.id("c"), graph.id("b"), h).found
+
+
+# -- path enumeration over prerequisites ------------------------------------------
+
+def random_prereq_dag(seed: int, n: int = 14, p: float = 0.35) -> TopicGraph:
+    rng = random.Random(seed)
+    names = [f"t{i}" for i in range(n)]
+    topics = [(names[b], [names[a] for a in range(b) if rng.random() < p], 1, "beginner", "test", "")
+              for b in range(n)]
+    return TopicGraph(topics)
+
+
+def prereq_paths(graph: TopicGraph, start: int, goal: int, max_depth: int) -> list:
+    """Every simple start->goal walk along prerequisite->dependent links, at most max_depth links."""
+    out = []
+
+    def walk(path):
+        if path[-1] == goal:
+            out.append(path)
+            return
+        if len(path) > max_depth:
+            return
+        for d in graph.dependents(path[-1]):
+            if d not in path:
+                walk(path + [d])
+    walk([start])
+    return out
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_path_enumeration_and_count_match_brute_force(seed):
+    graph = random_prereq_dag(seed)
+    n = graph.n_topics
+    for start in range(0, n, 3):
+        for goal in range(n):
+            for depth in (0, 2, 4, n):
+                expected = prereq_paths(graph, start, goal, depth)
+                paths = list(search.PathEnumeration(graph, start, goal, depth))
+                assert sorted(paths) == sorted(expected)
+                assert search.count_paths(graph, start, goal, depth) == len(expected)
+
+
+def test_path_enumeration_limit_stops_early():
+    graph = random_prereq_dag(3, n=16, p=0.5)
+    expected = prereq_paths(graph, 0, 15, 15)
+    assert len(expected) > 5
+    paths = search.PathEnumeration(graph, 0, 15, 15, limit=5)
+    got = list(paths)
+    assert len(got) == 5 and paths.limited and not paths.timed_out
+    assert all(p in expected for p in got)
+    everything = search.PathEnumeration(graph, 0, 15, 15, limit=len(expected) + 1)
+    assert len(list(everything)) == len(expected) and not everything.limited
+
+
+def test_start_equal_to_goal_is_one_empty_path():
+    graph = random_prereq_dag(0)
+    assert list(search.PathEnumeration(graph, 4, 4, 3)) == [[4]]
+    assert search.count_paths(graph, 4, 4, 3) == 1
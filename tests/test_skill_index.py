@@ -0,0 +1,95 @@
+"""SkillIndex against brute force over every indexed key of learningpath.pl."""
+import random
+
+import pytest
+
+from conftest import KB_PATH
+from skill_index import VIA_RANK, SkillIndex, bounded_distance, compact, max_distance
+from topic_graph import TopicGraph
+
+ALPHABET = "abcdejnosty+#"
+
+
+@pytest.fixture(scope="module")
+def index():
+    return SkillIndex.from_file(KB_PATH, TopicGraph.from_file(KB_PATH))
+
+
+def osa(a: str, b: str) -> int:
+    """Optimal string alignment distance (adjacent transpositions cost one), full table."""
+    d = [[i + j if not i * j else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+
+def mutate(rng: random.Random, key: str, edits: int) -> str:
+    for _ in range(edits):
+        i = rng.randrange(len(key) + 1)
+        op = rng.choice("isdt")
+        c = rng.choice(ALPHABET)
+        if op == "i":
+            key = key[:i] + c + key[i:]
+        elif op == "s" and i < len(key):
+            key = key[:i] + c + key[i + 1:]
+        elif op == "d" and i < len(key):
+            key = key[:i] + key[i + 1:]
+        elif op == "t" and i + 1 < len(key):
+            key = key[:i] + key[i + 1] + key[i] + key[i + 2:]
+    return key
+
+
+def test_bounded_distance_matches_full_table():
+    rng = random.Random(0)
+    for _ in range(3000):
+        a = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+        b = "".join(rng.choice("abc") for _ in range(rng.randint(0, 7)))
+        for k in (0, 1, 2):
+            assert bounded_distance(a, b, k) == min(osa(a, b), k + 1), (a, b, k)
+
+
+def test_fuzzy_finds_the_closest_key(index):
+    rng = random.Random(1)
+    fuzzy_keys = [k for k in index.keys if index.exact[k][1] != "description"]
+    checked = 0
+    for key in fuzzy_keys * 3:
+        term = mutate(rng, key, rng.randint(1, 2))
+        k = max_distance(term)
+        near = [(osa(term, cand), VIA_RANK[index.exact[cand][1]], cand) for cand in fuzzy_keys]
+        near = [r for r in near if r[0] <= k]
+        expected = (min(near)[2], min(near)[0]) if near and k else None
+        assert index.fuzzy(term) == expected, term
+        checked += expected is not None
+    assert checked > len(fuzzy_keys)
+
+
+def test_complete_lists_prefix_matches_best_first(index):
+    for prefix in ["p", "py", "ja", "do", "re", "ku", "ma", "c"]:
+        key = compact(prefix)
+        best = {}
+        for cand in index.keys:
+            if cand.startswith(key):
+                tid, via, label = index.exact[cand]
+                rank = (VIA_RANK[via], len(cand), cand)
+                if tid not in best or rank < best[tid][0]:
+                    best[tid] = (rank, label)
+        expected = [label for _, (_, label) in sorted(best.items(), key=lambda item: item[1][0])][:50]
+        assert [s["label"] for s in index.complete(prefix, limit=50)] == expected
+        short = index.complete(prefix, limit=2)
+        assert len(short) <= 2
+
+
+def test_complete_falls_back_to_a_near_miss(index):
+    assert [s["topic"] for s in index.complete("pyhton")] == ["python"]
+    assert index.complete("") == [] and index.complete("zzzzzzzz") == []
+
+
+def test_resolve_reports_matches_and_leftovers(index):
+    res = index.resolve("Python, pyhton, k8s, , basket weaving")
+    assert res.names == ["python", "kubernetes"]
+    assert [(m[0], m[1], m[2], m[3]) for m in res.matches] == [
+        ("Python", "python", "topic", 0), ("pyhton", "python", "topic", 1), ("k8s", "kubernetes", "synonym", 0)]
+    assert res.unresolved == ["basket weaving"]
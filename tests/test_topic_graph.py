@@ -0,0 +1,75 @@
+"""TopicGraph's batched lookups on a small hand-built graph and on learningpath.pl."""
+import random
+
+import pytest
+
+from conftest import KB_PATH
+from topic_graph import TopicGraph
+
+TOPICS = [
+    # name, prerequisites, duration, difficulty, category, description
+    ("html", [], 5, "beginner", "web", "Markup"),
+    ("css", ["html"], 6, "beginner", "web", "Styles"),
+    ("javascript", ["html"], 10, "intermediate", "web", "Scripting"),
+    ("react", ["javascript", "css"], 12, "intermediate", "frontend", "UI library"),
+    ("redux", ["react", "flux"], 4, "advanced", "frontend", "State"),   # flux is not a topic
+]
+
+
+@pytest.fixture
+def graph():
+    return TopicGraph(TOPICS, goals=[("frontend", ["react", "redux"])])
+
+
+@pytest.fixture(scope="module")
+def kb():
+    return TopicGraph.from_file(KB_PATH)
+
+
+def test_ids_follow_file_order_and_unknown_prereqs_come_last(graph):
+    assert graph.names[:graph.n_topics] == [t[0] for t in TOPICS]
+    assert graph.n_topics == 5 and graph.names[5:] == ["flux"]
+    assert not graph.is_topic(graph.id("flux"))
+
+
+def test_info_many_keeps_order_and_skips_non_topics(graph):
+    ids = [graph.id("react"), graph.id("flux"), graph.id("html"), graph.id("react")]
+    recs = graph.info_many(ids)
+    assert [r.name for r in recs] == ["react", "html", "react"]
+    assert recs[0].as_dict()["topic"] == "react"
+    assert (recs[0].duration, recs[0].difficulty, recs[0].category) == (12, "intermediate", "frontend")
+    assert graph.info_many([]) == []
+
+
+def test_missing_prereqs(graph):
+    known = graph.mask(["html"])
+    missing = {graph.names[t]: set(graph.names_of(m)) for t, m in graph.missing_prereqs(known).items()}
+    assert missing == {"react": {"javascript", "css"}, "redux": {"react", "flux"}}
+    # Nothing is missing once every prerequisite, including the non-topic one, is known
+    assert graph.missing_prereqs(graph.mask(["html", "css", "javascript", "react", "flux"])) == {}
+
+
+def test_learnable(graph):
+    assert graph.names_of(graph.learnable(0)) == ["html"]
+    assert graph.names_of(graph.learnable(graph.mask(["html"]))) == ["html", "css", "javascript"]
+    everything = graph.mask(["html", "css", "javascript", "react", "flux"])
+    assert graph.names_of(graph.learnable(everything)) == [t[0] for t in TOPICS]
+
+
+def test_learnable_and_missing_prereqs_partition_the_topics(kb):
+    rng = random.Random(0)
+    topics = kb.names[:kb.n_topics]
+    for _ in range(50):
+        known = kb.mask(rng.sample(topics, rng.randint(0, len(topics))))
+        learnable = kb.learnable(known)
+        missing = kb.missing_prereqs(known)
+        for t in range(kb.n_topics):
+            assert bool(learnable >> t & 1) != (t in missing)
+            assert missing.get(t, 0) == kb.prereq_mask[t] & ~known
+
+
+def test_info_many_matches_topic_facts(kb):
+    recs = kb.info_many(range(kb.n))
+    assert len(recs) == kb.n_topics
+    assert [r.name for r in recs] == kb.names[:kb.n_topics]
+    assert all(isinstance(r.duration, int) and r.duration > 0 for r in recs)
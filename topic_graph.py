@@ -0,0 +1,324 @@
+"""In-memory view of the topic/prerequisite knowledge base.
+
+Topics get dense integer IDs; prerequisites and edges are stored in CSR form
+(an offsets array plus a flat targets array) and skill sets are Python ints
+used as bitsets, so whole-catalogue questions are a few integer operations
+instead of one Prolog query per topic.
+"""
+import bisect
+import hashlib
+from array import array
+from functools import cached_property
+
+from kb_loader import read_facts
+
+KB_FACTS = {"topic": 6, "edge": 3, "h": 2, "goal_topics": 2}
+GROUP_FIELDS = ("duration", "difficulty", "category")
+
+
+class TopicRecord:
+    __slots__ = ("id", "name", "duration", "difficulty", "category", "description")
+
+    def __init__(self, id, name, duration, difficulty, category, description):
+        self.id = id
+        self.name = name
+        self.duration = duration
+        self.difficulty = difficulty
+        self.category = category
+        self.description = description
+
+    def as_dict(self) -> dict:
+        return {
+            'topic': self.name,
+            'duration': self.duration,
+            'difficulty': self.difficulty,
+            'category': self.category,
+            'description': self.description,
+        }
+
+
+def _csr(n: int, pairs) -> tuple:
+    """Build (offsets, targets) for `n` rows from (row, target) pairs, keeping input order."""
+    counts = [0] * (n + 1)
+    for r, _ in pairs:
+        counts[r + 1] += 1
+    for i in range(n):
+        counts[i + 1] += counts[i]
+    offsets = array('i', counts)
+    targets = array('i', bytes(4 * len(pairs)))
+    fill = list(counts[:n])
+    for r, t in pairs:
+        targets[fill[r]] = t
+        fill[r] += 1
+    return offsets, targets
+
+
+class TopicGraph:
+    """Immutable, array-backed topic graph.
+
+    Node IDs ``0 .. n_topics-1`` are topic/6 entries in file order; nodes that
+    only appear in edge/3, h/2 or as unknown prerequisites follow them.
+    """
+
+    def __init__(self, topics, edges=(), heuristics=(), goals=(), version=""):
+        self.version = version
+        self.names = []
+        self.index = {}
+        self.records = []
+        for name, _, duration, difficulty, category, description in topics:
+            if name in self.index:
+                continue
+            tid = self._intern(name)
+            self.records.append(TopicRecord(tid, name, int(duration), str(difficulty),
+                                            str(category), str(description)))
+        self.n_topics = len(self.records)
+
+        prereq_pairs = []
+        seen = set()
+        for name, prereqs, *_ in topics:
+            tid = self.index[name]
+            if tid in seen:
+                continue
+            seen.add(tid)
+            for p in prereqs:
+                prereq_pairs.append((tid, self._intern(p)))
+        edge_list = [(self._intern(a), self._intern(b), int(w)) for a, b, w in edges]
+        for node, _ in heuristics:
+            self._intern(node)
+        n = self.n = len(self.names)
+
+        self.pre_off, self.pre_idx = _csr(n, prereq_pairs)
+        self.dep_off, self.dep_idx = _csr(n, [(p, t) for t, p in prereq_pairs])
+        self.adj_off, self.adj_to = _csr(n, [(a, b) for a, b, _ in edge_list])
+        _, self.adj_w = _csr(n, [(a, w) for a, _, w in edge_list])
+
+        self.heur = array('i', bytes(4 * n))
+        for node, value in heuristics:
+            self.heur[self.index[node]] = int(value)
+
+        self.goals = {str(g): array('i', (self._intern_existing(t) for t in ts)) for g, ts in goals}
+
+        self.prereq_mask = [0] * n
+        for t, p in prereq_pairs:
+            self.prereq_mask[t] |= 1 << p
+        self.topic_mask = (1 << self.n_topics) - 1
+
+    def _intern(self, name) -> int:
+        name = str(name)
+        tid = self.index.get(name)
+        if tid is None:
+            tid = self.index[name] = len(self.names)
+            self.names.append(name)
+        return tid
+
+    def _intern_existing(self, name) -> int:
+        tid = self.index.get(str(name))
+        if tid is None:
+            raise KeyError(f"goal refers to unknown topic {name!r}")
+        return tid
+
+    @classmethod
+    def from_file(cls, path: str) -> "TopicGraph":
+        with open(path, "rb") as fh:
+            raw = fh.read()
+        facts = read_facts(raw.decode("utf-8"), KB_FACTS)
+        return cls(facts["topic"], facts["edge"], facts["h"], facts["goal_topics"],
+                   version=hashlib.sha1(raw).hexdigest()[:12])
+
+    # -- lookups -----------------------------------------------------------
+
+    def id(self, name: str) -> int:
+        return self.index[name]
+
+    def ids(self, names) -> list:
+        """IDs for the names that exist; unknown names are dropped."""
+        index = self.index
+        return [index[n] for n in names if n in index]
+
+    def is_topic(self, tid: int) -> bool:
+        return tid < self.n_topics
+
+    def prereqs(self, tid: int):
+        return self.pre_idx[self.pre_off[tid]:self.pre_off[tid + 1]]
+
+    def dependents(self, tid: int):
+        return self.dep_idx[self.dep_off[tid]:self.dep_off[tid + 1]]
+
+    def neighbours(self, tid: int):
+        """(target, weight) pairs of edge/3 leaving `tid`."""
+        lo, hi = self.adj_off[tid], self.adj_off[tid + 1]
+        return zip(self.adj_to[lo:hi], self.adj_w[lo:hi])
+
+    def goal_ids(self, goal: str):
+        return self.goals.get(goal, array('i'))
+
+    # -- bitsets -----------------------------------------------------------
+
+    def mask(self, names) -> int:
+        m = 0
+        for tid in self.ids(names):
+            m |= 1 << tid
+        return m
+
+    @staticmethod
+    def bits(mask: int):
+        """Yield set bit positions in ascending order."""
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def names_of(self, mask: int) -> list:
+        names = self.names
+        return [names[i] for i in self.bits(mask)]
+
+    # -- transitive closure ------------------------------------------------
+
+    def topo_order(self) -> list:
+        """Node IDs with every prerequisite before its dependents; nodes on a cycle come last."""
+        indeg = [self.pre_off[i + 1] - self.pre_off[i] for i in range(self.n)]
+        order = [i for i in range(self.n) if indeg[i] == 0]
+        dep_off, dep_idx = self.dep_off, self.dep_idx
+        for v in order:
+            for j in range(dep_off[v], dep_off[v + 1]):
+                d = dep_idx[j]
+                indeg[d] -= 1
+                if indeg[d] == 0:
+                    order.append(d)
+        if len(order) < self.n:
+            placed = set(order)
+            order.extend(i for i in range(self.n) if i not in placed)
+        return order
+
+    @cached_property
+    def _ancestors(self) -> list:
+        order = self.topo_order()
+        anc = [0] * self.n
+        pm = self.prereq_mask
+        changed = True
+        # One pass in topological order is exact for a DAG; cycles need a few more.
+        while changed:
+            changed = False
+            for v in order:
+                m = pm[v]
+                for p in self.bits(pm[v]):
+                    m |= anc[p]
+                if m != anc[v]:
+                    anc[v] = m
+                    changed = True
+        return anc
+
+    @cached_property
+    def _descendants(self) -> list:
+        desc = [0] * self.n
+        for v, m in enumerate(self._ancestors):
+            bit = 1 << v
+            for a in self.bits(m):
+                desc[a] |= bit
+        return desc
+
+    def warm(self):
+        """Build the lazily computed closure and group indexes now rather than on first use."""
+        for attr in ("_ancestors", "_groups", "_by_duration"):
+            getattr(self, attr)
+
+    def ancestors(self, tid: int) -> int:
+        """Bitset of every direct and indirect prerequisite of `tid`."""
+        return self._ancestors[tid]
+
+    def descendants(self, tid: int) -> int:
+        """Bitset of every topic that needs `tid`, directly or indirectly."""
+        return self._descendants[tid]
+
+    def is_prereq(self, a: int, b: int) -> bool:
+        """True if `a` is a transitive prerequisite of `b`."""
+        return bool(self._ancestors[b] >> a & 1)
+
+    # -- batched queries ---------------------------------------------------
+
+    def info_many(self, ids) -> list:
+        records = self.records
+        return [records[i] for i in ids if i < self.n_topics]
+
+    def missing_prereqs(self, known: int) -> dict:
+        """topic id -> bitset of direct prerequisites not in `known` (topics with none missing are omitted)."""
+        out = {}
+        pm = self.prereq_mask
+        for tid in range(self.n_topics):
+            missing = pm[tid] & ~known
+            if missing:
+                out[tid] = missing
+        return out
+
+    def learnable(self, known: int) -> int:
+        """Bitset of topics whose direct prerequisites are all known (can_learn/1)."""
+        pm = self.prereq_mask
+        m = 0
+        for tid in range(self.n_topics):
+            if not pm[tid] & ~known:
+                m |= 1 << tid
+        return m
+
+    # -- group-by indexes --------------------------------------------------
+
+    @cached_property
+    def _groups(self) -> dict:
+        """field -> {value: array of topic IDs in file order}, for GROUP_FIELDS."""
+        out = {}
+        for field in GROUP_FIELDS:
+            groups = out[field] = {}
+            for rec in self.records:
+                groups.setdefault(getattr(rec, field), array('i')).append(rec.id)
+        return out
+
+    @cached_property
+    def _by_duration(self) -> tuple:
+        """(sorted durations, topic IDs in the same order) for threshold range queries."""
+        order = sorted(range(self.n_topics), key=lambda t: self.records[t].duration)
+        return array('i', (self.records[t].duration for t in order)), array('i', order)
+
+    def groups(self, field: str) -> dict:
+        """value -> topic IDs sharing it; `field` is duration, difficulty or category."""
+        return self._groups[field]
+
+    def group_mask(self, field: str, value) -> int:
+        m = 0
+        for tid in self._groups[field].get(value, ()):
+            m |= 1 << tid
+        return m
+
+    def duration_range(self, low: int = None, high: int = None) -> int:
+        """Bitset of topics with ``low < duration <= high`` (either bound may be None)."""
+        durations, order = self._by_duration
+        lo = 0 if low is None else bisect.bisect_right(durations, low)
+        hi = len(durations) if high is None else bisect.bisect_right(durations, high)
+        m = 0
+        for i in range(lo, hi):
+            m |= 1 << order[i]
+        return m
+
+    def same_value_pairs(self, field: str, ids=None, limit: int = None) -> list:
+        """Pairs (a, b) of topics sharing `field`, each pair once, `a` before `b` in `ids`.
+
+        Pairs come in the order a nested scan of `ids` finds them, but are
+        generated from the groups, so the cost is linear in the pairs returned
+        (plus one pass over `ids`) rather than quadratic in `ids`.
+        """
+        if ids is None:
+            ids, groups = range(self.n_topics), self._groups[field]
+        else:
+            groups = {}
+            for tid in ids:
+                groups.setdefault(getattr(self.records[tid], field), []).append(tid)
+        # Groups list their topics in `ids` order, so `a` is the next unvisited member of its group
+        visited = {}
+        out = []
+        for a in ids:
+            value = getattr(self.records[a], field)
+            i = visited[value] = visited.get(value, -1) + 1
+            group = groups[value]
+            for j in range(i + 1, len(group)):
+                out.append((a, group[j]))
+                if limit is not None and len(out) >= limit:
+                    return out
+        return out